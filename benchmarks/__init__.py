@@ -0,0 +1,10 @@
+# NcatBot 性能测试工具, 不随 ncatbot 包发布
+import os
+import sys
+
+# 始终测量当前仓库中的源码, 而不是环境中安装的 ncatbot
+_SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
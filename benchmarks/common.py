@@ -0,0 +1,150 @@
+# 性能测试共用的统计、环境信息与结果读写
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """线性插值的分位数, ``sorted_samples`` 需已排序, q 取 0~100"""
+    if not sorted_samples:
+        return math.nan
+    pos = (len(sorted_samples) - 1) * q / 100
+    low = math.floor(pos)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (
+        pos - low
+    )
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """样本的统计摘要: 数量、均值、标准差、最小/最大值与常用分位数"""
+    data = sorted(samples)
+    n = len(data)
+    if not n:
+        return {"n": 0}
+    mean = sum(data) / n
+    stdev = math.sqrt(sum((x - mean) ** 2 for x in data) / (n - 1)) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean": mean,
+        "stdev": stdev,
+        "min": data[0],
+        "p50": percentile(data, 50),
+        "p90": percentile(data, 90),
+        "p99": percentile(data, 99),
+        "max": data[-1],
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """记录在结果中的运行环境, 用于判断两份结果是否可以比较"""
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """当前进程的常驻内存, 只支持 Linux"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB, macOS 上为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def result_path(suite: str, directory: str = RESULTS_DIR) -> str:
+    """按套件名、提交和时间生成结果文件路径"""
+    commit = (git_commit() or "nogit")[:8]
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{suite}-{commit}-{stamp}.json")
+
+
+def write_results(path: str, suite: str, results: List[dict], **extra) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = dict(suite=suite, environment=environment(), results=results, **extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(
+    old: dict, new: dict, key_fields: Sequence[str], metrics: Dict[str, bool]
+) -> List[str]:
+    """
+    按 ``key_fields`` 对齐两份结果, 逐项列出指标变化
+
+    :param metrics: {指标名: 数值越大越好}
+    """
+
+    def key(result):
+        return tuple(result.get(field) for field in key_fields)
+
+    old_results = {key(r): r for r in old.get("results", [])}
+    lines = []
+    for result in new.get("results", []):
+        before = old_results.get(key(result))
+        if before is None:
+            continue
+        name = ", ".join(f"{f}={v}" for f, v in zip(key_fields, key(result)))
+        parts = []
+        for metric, higher_is_better in metrics.items():
+            a, b = _lookup(before, metric), _lookup(result, metric)
+            if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+                continue
+            change = (b - a) / a * 100 if a else math.nan
+            better = change >= 0 if higher_is_better else change <= 0
+            mark = "" if abs(change) < 5 else (" +" if better else " !")
+            parts.append(f"{metric} {a:.4g} -> {b:.4g} ({change:+.1f}%){mark}")
+        lines.append(f"[{name}] " + "; ".join(parts))
+    return lines
+
+
+def _lookup(result: dict, dotted: str):
+    value = result
+    for part in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
@@ -0,0 +1,398 @@
+"""
+事件处理全链路性能测试
+
+测量一条群消息从上报到回复的完整路径:
+    ``Websocket.on_message`` -> ``BotClient.handle_group_event`` -> ``EventBus.publish_async``
+    -> ``_func_activator`` -> 插件功能 -> ``BotAPI.post_group_msg``
+
+每个场景在独立的子进程中启动机器人 (避免全局状态和内存统计互相影响), 父进程运行
+``FakeOneBotServer`` 推送事件, 并用回复中的 reply 段与事件的 ``message_id`` 配对计算延迟。
+
+用法::
+
+    # 扫描插件数、功能数、用户数和消息速率, 结果保存到 benchmarks/results/
+    python -m benchmarks.e2e sweep --plugins 1,10,40 --funcs 1,10 --users 100 --rates 200,1000
+
+    # 比较两次结果
+    python -m benchmarks.e2e compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.common import (
+    ROOT_DIR,
+    compare_results,
+    load_results,
+    peak_rss_bytes,
+    result_path,
+    rss_bytes,
+    summarize,
+    write_results,
+)
+from benchmarks.fake_onebot import FakeOneBotServer, TrafficGenerator
+
+SCENARIO_FIELDS = ("plugins", "funcs", "users", "rate")
+COMPARE_METRICS = {
+    "events_per_second": True,
+    "latency_ms.p50": False,
+    "latency_ms.p99": False,
+    "bot.rss_peak_mb": False,
+}
+
+PLUGIN_TEMPLATE = """from ncatbot.plugin import BasePlugin
+
+
+class {name}(BasePlugin):
+    name = "{name}"
+    version = "1.0.0"
+
+    async def on_load(self):
+        for j in range({funcs}):
+            self.register_user_func(f"f{{j}}", self.answer, prefix=f"{prefix}{{j}} ")
+
+    async def answer(self, msg):
+        if hasattr(msg, "group_id"):
+            await msg.reply(text="ok")
+        else:
+            await msg.reply(text="ok", reply=msg.message_id)
+
+
+__all__ = ["{name}"]
+"""
+
+
+def _plugin_name(index: int) -> str:
+    return f"BenchPlugin{index}"
+
+
+def _command_prefix(index: int) -> str:
+    return f"/b{index}_"
+
+
+def command_texts(plugins: int, funcs: int) -> List[str]:
+    """每条消息恰好触发一个插件功能"""
+    return [f"{_command_prefix(i)}{j} hi" for i in range(plugins) for j in range(funcs)]
+
+
+# ---------------------
+# region 子进程: 机器人
+# ---------------------
+
+
+def write_plugins(directory: str, plugins: int, funcs: int):
+    for i in range(plugins):
+        name = _plugin_name(i)
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+        with open(os.path.join(directory, name, "__init__.py"), "w") as f:
+            f.write(
+                PLUGIN_TEMPLATE.format(
+                    name=name, funcs=funcs, prefix=_command_prefix(i)
+                )
+            )
+
+
+async def _bot_main(args) -> dict:
+    from ncatbot.core import BotAPI, BotClient
+    from ncatbot.plugin import EventBus, PluginLoader
+    from ncatbot.plugin.event.access_controller import get_global_access_controller
+
+    # 与 BotClient.run 相同的初始化, 但不启动 NapCat
+    client = BotClient()
+    client.plugin_sys = PluginLoader(None)
+    client.event_bus = EventBus(client.plugin_sys)
+    client.plugin_sys.event_bus = client.event_bus
+    client.api = BotAPI()
+
+    access = get_global_access_controller()
+    for user_id in TrafficGenerator(users=args.users).user_ids:
+        access.create_user(str(user_id))
+
+    connected = asyncio.Event()
+
+    async def on_startup():
+        connected.set()
+
+    client.add_startup_handler(on_startup)
+
+    max_tasks = 0
+
+    async def sample_tasks():
+        nonlocal max_tasks
+        while True:
+            max_tasks = max(max_tasks, len(asyncio.all_tasks()))
+            await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    asyncio.create_task(sample_tasks())
+    runner = asyncio.create_task(client._run_async())
+    await asyncio.wait_for(connected.wait(), args.startup_timeout)
+    startup_seconds = time.perf_counter() - started
+    await asyncio.sleep(args.seconds)
+
+    if runner.done() and runner.exception() is not None:
+        raise runner.exception()
+    return {
+        "startup_seconds": startup_seconds,
+        "plugin_load_seconds": dict(client.plugin_sys.load_times),
+        "rss_mb": (rss_bytes() or 0) / 2**20,
+        "rss_peak_mb": (peak_rss_bytes() or 0) / 2**20,
+        "tasks_max": max_tasks,
+        "tasks_end": len(asyncio.all_tasks()),
+    }
+
+
+def run_bot(args):
+    """子进程入口: 在当前目录生成插件并启动机器人, 运行指定秒数后写出报告"""
+    from ncatbot.utils import config
+
+    write_plugins("plugins", args.plugins, args.funcs)
+    config.set_ws_uri(args.uri)
+    for key, value in (args.config or {}).items():
+        setattr(config, key, value)
+    try:
+        report = asyncio.run(_bot_main(args))
+    except BaseException as e:
+        report = {"error": f"{type(e).__name__}: {e}"}
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    # 机器人的后台线程不会自行退出
+    os._exit(0)
+
+
+# endregion
+# ---------------------
+# region 父进程: 推送事件并统计
+# ---------------------
+
+
+async def run_scenario(
+    plugins: int,
+    funcs: int,
+    users: int,
+    rate: float,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    drain: float = 5.0,
+    config: Optional[Dict] = None,
+    startup_timeout: float = 120.0,
+    keep_workdir: bool = False,
+) -> dict:
+    """运行一个场景, 返回吞吐、延迟和机器人进程的资源占用"""
+    generator = TrafficGenerator(
+        users=users, texts=command_texts(plugins, funcs), seed=0
+    )
+    server = FakeOneBotServer(
+        port=0, rates={"group": rate}, duration=warmup + duration, generator=generator
+    )
+
+    sent_at: Dict[int, float] = {}
+    latencies: List[float] = []
+    window = {"start": None, "first_sent": None, "last_reply": None}
+    counters = {"sent": 0, "replied": 0, "unmatched": 0}
+
+    def on_event(event: dict, timestamp: float):
+        if event.get("post_type") != "message":
+            return
+        if window["start"] is None:
+            window["start"] = timestamp
+        if timestamp - window["start"] < warmup:
+            return
+        if window["first_sent"] is None:
+            window["first_sent"] = timestamp
+        sent_at[event["message_id"]] = timestamp
+        counters["sent"] += 1
+
+    def on_api(action: str, params: dict, timestamp: float):
+        if action not in ("send_group_msg", "send_private_msg"):
+            return
+        for segment in params.get("message") or []:
+            if segment.get("type") == "reply":
+                sent = sent_at.pop(int(segment["data"]["id"]), None)
+                if sent is not None:
+                    latencies.append((timestamp - sent) * 1000)
+                    counters["replied"] += 1
+                    window["last_reply"] = timestamp
+                return
+        counters["unmatched"] += 1
+
+    server.on_event.append(on_event)
+    server.on_api.append(on_api)
+
+    workdir = tempfile.mkdtemp(prefix="ncatbot-bench-")
+    report_path = os.path.join(workdir, "report.json")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [ROOT_DIR, os.path.join(ROOT_DIR, "src"), env.get("PYTHONPATH")])
+    )
+    try:
+        async with server:
+            cmd = [
+                sys.executable,
+                "-m",
+                "benchmarks.e2e",
+                "bot",
+                "--uri",
+                server.uri,
+                "--plugins",
+                str(plugins),
+                "--funcs",
+                str(funcs),
+                "--users",
+                str(users),
+                "--seconds",
+                str(warmup + duration + drain),
+                "--startup-timeout",
+                str(startup_timeout),
+                "--report",
+                report_path,
+                "--config",
+                json.dumps(config or {}),
+            ]
+            with open(os.path.join(workdir, "bot.log"), "wb") as log:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=workdir, env=env, stdout=log, stderr=log
+                )
+                timeout = startup_timeout + warmup + duration + drain + 30
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    raise RuntimeError(f"机器人进程超时, 日志见 {workdir}/bot.log")
+        bot = {}
+        if os.path.exists(report_path):
+            with open(report_path, "r", encoding="utf-8") as f:
+                bot = json.load(f)
+    finally:
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = (
+        window["last_reply"] - window["first_sent"]
+        if window["last_reply"] is not None
+        else None
+    )
+    return {
+        "plugins": plugins,
+        "funcs": funcs,
+        "users": users,
+        "rate": rate,
+        "duration": duration,
+        "config": config or {},
+        "events_sent": counters["sent"],
+        "replies": counters["replied"],
+        "lost": len(sent_at),
+        "unmatched_replies": counters["unmatched"],
+        "events_per_second": counters["replied"] / elapsed if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+        "server": server.get_stats(),
+        "bot": bot,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def sweep(args):
+    scenarios = list(
+        itertools.product(args.plugins, args.funcs, args.users, args.rates)
+    )
+    results = []
+    for index, (plugins, funcs, users, rate) in enumerate(scenarios, 1):
+        print(
+            f"[{index}/{len(scenarios)}] plugins={plugins} funcs={funcs} "
+            f"users={users} rate={rate}",
+            flush=True,
+        )
+        result = asyncio.run(
+            run_scenario(
+                plugins,
+                funcs,
+                users,
+                rate,
+                duration=args.duration,
+                warmup=args.warmup,
+                drain=args.drain,
+                config=args.config,
+                keep_workdir=args.keep_workdir,
+            )
+        )
+        latency = result["latency_ms"]
+        print(
+            f"    {result['events_per_second']:.1f} events/s, "
+            f"p50 {latency.get('p50', float('nan')):.2f} ms, "
+            f"p99 {latency.get('p99', float('nan')):.2f} ms, "
+            f"lost {result['lost']}, "
+            f"rss {result['bot'].get('rss_peak_mb', 0):.1f} MB"
+            + (
+                f", error: {result['bot']['error']}" if "error" in result["bot"] else ""
+            ),
+            flush=True,
+        )
+        results.append(result)
+    path = write_results(args.output or result_path("e2e"), "e2e", results)
+    print(f"结果已保存到 {path}")
+
+
+def compare(args):
+    old, new = load_results(args.old), load_results(args.new)
+    for line in compare_results(old, new, SCENARIO_FIELDS, COMPARE_METRICS):
+        print(line)
+
+
+# endregion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NcatBot 事件处理全链路性能测试")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sweep", help="运行场景矩阵并保存结果")
+    p.add_argument("--plugins", type=_int_list, default=[1, 10])
+    p.add_argument("--funcs", type=_int_list, default=[1, 10])
+    p.add_argument("--users", type=_int_list, default=[100])
+    p.add_argument("--rates", type=_float_list, default=[200.0])
+    p.add_argument("--duration", type=float, default=10.0, help="每个场景的测量秒数")
+    p.add_argument("--warmup", type=float, default=2.0, help="不计入统计的预热秒数")
+    p.add_argument("--drain", type=float, default=5.0, help="推送结束后等待回复的秒数")
+    p.add_argument("--config", type=json.loads, default=None, help="覆盖的配置 (JSON)")
+    p.add_argument("--output", default=None, help="结果文件路径")
+    p.add_argument("--keep-workdir", action="store_true", help="保留机器人工作目录")
+    p.set_defaults(func=sweep)
+
+    p = sub.add_parser("compare", help="比较两次结果")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.set_defaults(func=compare)
+
+    # 内部使用: 场景的机器人子进程
+    p = sub.add_parser("bot")
+    p.add_argument("--uri", required=True)
+    p.add_argument("--plugins", type=int, required=True)
+    p.add_argument("--funcs", type=int, required=True)
+    p.add_argument("--users", type=int, required=True)
+    p.add_argument("--seconds", type=float, required=True)
+    p.add_argument("--startup-timeout", type=float, default=120.0)
+    p.add_argument("--report", required=True)
+    p.add_argument("--config", type=json.loads, default=None)
+    p.set_defaults(func=run_bot)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+"""
+本地 OneBot v11 替身服务器, 用于在没有 QQ 账号和 NapCat 的环境下压测 NcatBot
+
+与 NapCat 一样提供三个 websocket 端点:
+    - ``/event``: 连接后先推送 lifecycle 事件, 之后按设定的速率推送合成的群聊、私聊、通知和请求事件
+    - ``/api``: 接收 ``{"action", "params", "echo"}`` 请求, 返回预设或录制的响应
+    - ``/``: universal 端点, 同时推送事件和响应请求
+
+用法::
+
+    python -m benchmarks.fake_onebot --port 3001 --group-rate 200 --duration 60
+
+或在代码中::
+
+    async with FakeOneBotServer(port=0, rates={"group": 100}) as server:
+        config.set_ws_uri(server.uri)
+        ...
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import websockets
+
+EVENT_KINDS = ("group", "private", "notice", "request")
+DEFAULT_SELF_ID = 123456
+DEFAULT_TEXTS = ["你好", "/help", "今天天气怎么样", "[测试消息]", "hello world"]
+
+
+def _request_path(ws) -> str:
+    """连接请求的路径, 兼容新旧版 websockets"""
+    request = getattr(ws, "request", None)
+    path = request.path if request is not None else ws.path
+    return path.split("?", 1)[0].rstrip("/") or "/"
+
+
+def _request_headers(ws):
+    request = getattr(ws, "request", None)
+    return request.headers if request is not None else ws.request_headers
+
+
+class TrafficGenerator:
+    """
+    合成 OneBot v11 上报事件
+
+    所有随机内容都来自固定种子的 ``random.Random``, 相同参数下生成的事件序列完全一致。
+    每个消息事件的 ``message_id`` 全局递增, 可以用来关联事件与机器人的回复。
+    """
+
+    def __init__(
+        self,
+        self_id: int = DEFAULT_SELF_ID,
+        groups: int = 10,
+        users: int = 100,
+        texts: Optional[List[str]] = None,
+        seed: int = 0,
+    ):
+        self.self_id = self_id
+        self.group_ids = [100000 + i for i in range(max(1, groups))]
+        self.user_ids = [200000 + i for i in range(max(1, users))]
+        self.texts = texts or DEFAULT_TEXTS
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+
+    def _base(self, post_type: str) -> dict:
+        return {
+            "time": int(time.time()),
+            "self_id": self.self_id,
+            "post_type": post_type,
+        }
+
+    def _sender(self, user_id: int) -> dict:
+        return {
+            "user_id": user_id,
+            "nickname": f"user{user_id}",
+            "card": "",
+            "role": "member",
+        }
+
+    def _message(self, message_type: str, user_id: int) -> dict:
+        text = self._random.choice(self.texts)
+        message_id = next(self._ids)
+        return dict(
+            self._base("message"),
+            message_type=message_type,
+            sub_type="normal" if message_type == "group" else "friend",
+            message_id=message_id,
+            message_seq=message_id,
+            real_id=message_id,
+            user_id=user_id,
+            message=[{"type": "text", "data": {"text": text}}],
+            raw_message=text,
+            font=14,
+            sender=self._sender(user_id),
+            message_format="array",
+        )
+
+    def lifecycle(self) -> dict:
+        return dict(
+            self._base("meta_event"), meta_event_type="lifecycle", sub_type="connect"
+        )
+
+    def heartbeat(self, interval: float) -> dict:
+        return dict(
+            self._base("meta_event"),
+            meta_event_type="heartbeat",
+            status={"online": True, "good": True},
+            interval=int(interval * 1000),
+        )
+
+    def group(self) -> dict:
+        event = self._message("group", self._random.choice(self.user_ids))
+        event["group_id"] = self._random.choice(self.group_ids)
+        return event
+
+    def private(self) -> dict:
+        event = self._message("private", self._random.choice(self.user_ids))
+        event["target_id"] = self.self_id
+        return event
+
+    def notice(self) -> dict:
+        notice_type = self._random.choice(["group_increase", "group_decrease"])
+        return dict(
+            self._base("notice"),
+            notice_type=notice_type,
+            sub_type="approve" if notice_type == "group_increase" else "leave",
+            group_id=self._random.choice(self.group_ids),
+            user_id=self._random.choice(self.user_ids),
+            operator_id=0,
+        )
+
+    def request(self) -> dict:
+        return dict(
+            self._base("request"),
+            request_type="friend",
+            user_id=self._random.choice(self.user_ids),
+            comment="加个好友",
+            flag=str(next(self._ids)),
+        )
+
+    def make(self, kind: str) -> dict:
+        return getattr(self, kind)()
+
+
+class FakeOneBotServer:
+    """
+    OneBot v11 替身服务器
+
+    Args:
+        rates: 各类事件每秒推送的数量, 键为 ``group``/``private``/``notice``/``request``
+        max_events: 推送的事件总数上限, None 表示不限
+        duration: 推送事件的秒数, None 表示不限
+        autostart: 第一个事件连接建立时自动开始推送, 否则需要调用 ``start_traffic``
+        responses: API 响应表, 值可以是 ``data`` 本身、完整的响应帧 (含 ``retcode``),
+            或接受 ``params`` 返回 ``data`` 的函数
+        api_delay: 每个 API 请求模拟的处理耗时 (秒)
+        heartbeat_interval: 心跳事件间隔 (秒), None 表示不发送
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 3001,
+        token: str = "",
+        rates: Optional[Dict[str, float]] = None,
+        max_events: Optional[int] = None,
+        duration: Optional[float] = None,
+        autostart: bool = True,
+        responses: Optional[Dict[str, Any]] = None,
+        api_delay: float = 0.0,
+        heartbeat_interval: Optional[float] = None,
+        generator: Optional[TrafficGenerator] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.rates = {kind: 0.0 for kind in EVENT_KINDS}
+        self.rates.update(rates or {"group": 10.0})
+        self.max_events = max_events
+        self.duration = duration
+        self.autostart = autostart
+        self.api_delay = api_delay
+        self.heartbeat_interval = heartbeat_interval
+        self.generator = generator or TrafficGenerator()
+        self.responses: Dict[str, Any] = self._default_responses()
+        self.responses.update(responses or {})
+
+        # 回调: on_event(event, 发送时刻), on_api(action, params, 收到时刻)
+        self.on_event: List[Callable[[dict, float], None]] = []
+        self.on_api: List[Callable[[str, dict, float], None]] = []
+
+        self.events_sent: Dict[str, int] = {kind: 0 for kind in EVENT_KINDS}
+        self.api_calls: Dict[str, int] = {}
+        self._event_clients: Set[Any] = set()
+        self._message_ids = itertools.count(1_000_000)
+        self._server = None
+        self._traffic: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        # 事件推送结束时置位, 需要在事件循环中创建, 见 start
+        self.traffic_done: Optional[asyncio.Event] = None
+
+    # ---------------------
+    # region 生命周期
+    # ---------------------
+
+    @property
+    def uri(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> "FakeOneBotServer":
+        self.traffic_done = asyncio.Event()
+        self._server = await websockets.serve(
+            self._handler, self.host, self.port, max_size=2**32
+        )
+        if not self.port:
+            # 端口为 0 时由系统分配
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+        if self.heartbeat_interval:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+        return self
+
+    async def stop(self):
+        for task in (self._traffic, self._heartbeat):
+            if task is not None:
+                task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeOneBotServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def start_traffic(self):
+        """开始按设定速率推送事件, 已在推送时什么也不做"""
+        if self._traffic is None or self._traffic.done():
+            self.traffic_done.clear()
+            self._traffic = asyncio.create_task(self._traffic_loop())
+
+    # endregion
+    # ---------------------
+    # region 连接处理
+    # ---------------------
+
+    def _authorized(self, ws) -> bool:
+        if not self.token:
+            return True
+        return _request_headers(ws).get("Authorization") == f"Bearer {self.token}"
+
+    async def _handler(self, ws):
+        if not self._authorized(ws):
+            await ws.close(code=1008, reason="token 错误")
+            return
+        path = _request_path(ws)
+        if path not in ("/", "/event", "/api"):
+            await ws.close(code=1008, reason=f"未知的端点: {path}")
+            return
+        if path in ("/", "/event"):
+            self._event_clients.add(ws)
+            await ws.send(json.dumps(self.generator.lifecycle()))
+            if self.autostart:
+                self.start_traffic()
+        try:
+            async for raw in ws:
+                if path in ("/", "/api"):
+                    asyncio.create_task(self._answer(ws, raw))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._event_clients.discard(ws)
+
+    async def _answer(self, ws, raw):
+        received_at = time.perf_counter()
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            return
+        action = str(request.get("action", "")).strip("/")
+        params = request.get("params") or {}
+        self.api_calls[action] = self.api_calls.get(action, 0) + 1
+        for callback in self.on_api:
+            callback(action, params, received_at)
+        if self.api_delay:
+            await asyncio.sleep(self.api_delay)
+        response = self.respond(action, params)
+        if "echo" in request:
+            response["echo"] = request["echo"]
+        try:
+            await ws.send(json.dumps(response, ensure_ascii=False))
+        except websockets.ConnectionClosed:
+            pass
+
+    # endregion
+    # ---------------------
+    # region API 响应
+    # ---------------------
+
+    def _default_responses(self) -> Dict[str, Any]:
+        def message_sent(params):
+            return {"message_id": next(self._message_ids)}
+
+        return {
+            "send_group_msg": message_sent,
+            "send_private_msg": message_sent,
+            "send_msg": message_sent,
+            "get_login_info": {
+                "user_id": self.generator.self_id,
+                "nickname": "FakeOneBot",
+            },
+            "get_status": {"online": True, "good": True},
+            "get_version_info": {
+                "app_name": "FakeOneBot",
+                "protocol_version": "v11",
+                "app_version": "0.0.0",
+            },
+        }
+
+    def load_responses(self, path: str):
+        """从 JSON 文件读取录制的响应表 ``{action: data 或完整响应}``"""
+        with open(path, "r", encoding="utf-8") as f:
+            self.responses.update(json.load(f))
+
+    def respond(self, action: str, params: dict) -> dict:
+        """按响应表生成 ``action`` 的响应帧, 表中没有的动作返回成功和空数据"""
+        entry = self.responses.get(action)
+        if callable(entry):
+            entry = entry(params)
+        if isinstance(entry, dict) and "retcode" in entry and "data" in entry:
+            return dict(entry)
+        return {
+            "status": "ok",
+            "retcode": 0,
+            "data": entry,
+            "message": "",
+            "wording": "",
+        }
+
+    # endregion
+    # ---------------------
+    # region 事件推送
+    # ---------------------
+
+    async def broadcast(self, event: dict):
+        """向所有事件连接推送一个事件"""
+        raw = json.dumps(event, ensure_ascii=False)
+        sent_at = time.perf_counter()
+        for callback in self.on_event:
+            callback(event, sent_at)
+        for ws in list(self._event_clients):
+            try:
+                await ws.send(raw)
+            except websockets.ConnectionClosed:
+                self._event_clients.discard(ws)
+
+    def _budget_left(self) -> Optional[int]:
+        if self.max_events is None:
+            return None
+        return self.max_events - sum(self.events_sent.values())
+
+    async def _traffic_loop(self):
+        """
+        按速率推送事件。每次醒来时补发到期的全部事件, 因此高速率下不受 sleep 精度限制
+        """
+        kinds = [kind for kind in EVENT_KINDS if self.rates.get(kind, 0) > 0]
+        emitted = {kind: 0 for kind in kinds}
+        start = time.perf_counter()
+        try:
+            while kinds:
+                elapsed = time.perf_counter() - start
+                if self.duration is not None and elapsed >= self.duration:
+                    break
+                for kind in kinds:
+                    due = int(self.rates[kind] * elapsed) + 1 - emitted[kind]
+                    for _ in range(due):
+                        left = self._budget_left()
+                        if left is not None and left <= 0:
+                            return
+                        await self.broadcast(self.generator.make(kind))
+                        emitted[kind] += 1
+                        self.events_sent[kind] += 1
+                next_due = min(emitted[kind] / self.rates[kind] for kind in kinds)
+                await asyncio.sleep(
+                    max(next_due - (time.perf_counter() - start), 0.0005)
+                )
+        finally:
+            self.traffic_done.set()
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self.broadcast(self.generator.heartbeat(self.heartbeat_interval))
+
+    # endregion
+
+    def get_stats(self) -> dict:
+        return {
+            "events_sent": dict(self.events_sent),
+            "api_calls": dict(self.api_calls),
+            "event_clients": len(self._event_clients),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 OneBot v11 替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--token", default="")
+    for kind in EVENT_KINDS:
+        parser.add_argument(
+            f"--{kind}-rate",
+            type=float,
+            default=10.0 if kind == "group" else 0.0,
+            help=f"每秒推送的{kind}事件数",
+        )
+    parser.add_argument("--max-events", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=None, help="推送事件的秒数")
+    parser.add_argument("--responses", default=None, help="录制的 API 响应表 (JSON)")
+    parser.add_argument("--api-delay", type=float, default=0.0)
+    parser.add_argument("--heartbeat", type=float, default=None, help="心跳间隔 (秒)")
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    async def run():
+        server = FakeOneBotServer(
+            host=args.host,
+            port=args.port,
+            token=args.token,
+            rates={kind: getattr(args, f"{kind}_rate") for kind in EVENT_KINDS},
+            max_events=args.max_events,
+            duration=args.duration,
+            api_delay=args.api_delay,
+            heartbeat_interval=args.heartbeat,
+            generator=TrafficGenerator(
+                groups=args.groups, users=args.users, seed=args.seed
+            ),
+        )
+        if args.responses:
+            server.load_responses(args.responses)
+        async with server:
+            print(f"FakeOneBot 已启动: {server.uri}", flush=True)
+            try:
+                while True:
+                    await asyncio.sleep(5)
+                    print(
+                        json.dumps(server.get_stats(), ensure_ascii=False), flush=True
+                    )
+            except asyncio.CancelledError:
+                pass
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+热点路径的微基准测试: 权限判定、权限树、权限路径匹配、过滤器链、消息链与文件读写
+
+每个用例在固定种子下生成数据, 先自动确定循环次数 (使单次测量不少于 ``--min-time`` 秒),
+再重复测量 ``--repeat`` 次, 报告每次操作耗时的统计摘要。测量期间关闭 gc。
+哈希随机化会影响 dict/set 的布局, 需要严格复现时请固定 ``PYTHONHASHSEED``。
+
+用法::
+
+    python -m benchmarks.micro list
+    python -m benchmarks.micro run -k rbac --repeat 9
+    python -m benchmarks.micro compare old.json new.json
+"""
+
+import argparse
+import gc
+import itertools
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.common import (
+    compare_results,
+    load_results,
+    result_path,
+    summarize,
+    write_results,
+)
+
+
+class Context:
+    """用例的运行环境: 固定种子的随机数与临时目录"""
+
+    def __init__(self, seed: int, tmpdir: str):
+        self.rng = random.Random(seed)
+        self.tmpdir = tmpdir
+
+
+class Benchmark:
+    def __init__(self, name: str, setup: Callable[..., Callable[[], Any]], params):
+        self.name = name
+        self.setup = setup  # setup(ctx, **params) -> 被测函数
+        self.params: Dict[str, List[Any]] = params
+
+    def cases(self) -> List[Tuple[str, Dict[str, Any]]]:
+        keys = list(self.params)
+        cases = []
+        for values in itertools.product(*(self.params[k] for k in keys)):
+            params = dict(zip(keys, values))
+            label = ",".join(f"{k}={v}" for k, v in params.items())
+            cases.append((f"{self.name}[{label}]" if label else self.name, params))
+        return cases
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, **params: List[Any]):
+    """注册一个用例, ``params`` 的每种组合各测量一次"""
+
+    def decorator(setup):
+        BENCHMARKS.append(Benchmark(name, setup, params))
+        return setup
+
+    return decorator
+
+
+# ---------------------
+# region 测量
+# ---------------------
+
+
+def _timed(func: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> dict:
+    """测量每次调用的耗时 (微秒), 正式测量前先以相同次数预热一轮"""
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            elapsed = _timed(func, number)
+            if elapsed >= min_time:
+                break
+            # 按已测耗时估算所需次数, 但每轮最多扩大 10 倍
+            guess = (
+                int(number * min_time / elapsed * 1.2) if elapsed > 0 else number * 10
+            )
+            number = max(number + 1, min(guess, number * 10))
+        _timed(func, number)  # 预热, 结果丢弃
+        samples = [_timed(func, number) / number * 1e6 for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+    summary = summarize(samples)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "us_per_op": summary,
+        "ops_per_second": 1e6 / summary["p50"] if summary["p50"] else None,
+    }
+
+
+# endregion
+# ---------------------
+# region 用例: 权限
+# ---------------------
+
+
+def _permission_paths(rng: random.Random, count: int) -> List[str]:
+    """生成 ``count`` 条形如 ``plugin3.group7.func12`` 的权限路径"""
+    plugins = max(1, count // 20)
+    paths = set()
+    while len(paths) < count:
+        paths.add(
+            f"plugin{rng.randrange(plugins)}.group{rng.randrange(8)}.func{rng.randrange(64)}"
+        )
+    return sorted(paths)
+
+
+def _wildcard_patterns(rng: random.Random, paths: List[str], count: int) -> List[str]:
+    patterns = []
+    for _ in range(count):
+        parts = rng.choice(paths).split(".")
+        kind = rng.randrange(4)
+        if kind == 0:
+            patterns.append(f"{parts[0]}.**")
+        elif kind == 1:
+            patterns.append(f"{parts[0]}.*.{parts[2]}")
+        elif kind == 2:
+            patterns.append(f"{parts[0]}.{parts[1]}.*")
+        else:
+            patterns.append(".".join(parts))
+    return patterns
+
+
+def _rbac(rng: random.Random, rules: int, users: int, **cache_sizes):
+    from ncatbot.plugin.RBACManager import RBACManager
+
+    manager = RBACManager(case_sensitive=False, **cache_sizes)
+    paths = _permission_paths(rng, rules)
+    for path in paths:
+        manager.add_permissions(path)
+    patterns = _wildcard_patterns(rng, paths, max(1, rules // 4))
+    for pattern in patterns:
+        manager.add_permissions(pattern)
+    roles = [f"role{i}" for i in range(8)]
+    for role in roles:
+        manager.add_role(role)
+    for index, pattern in enumerate(patterns):
+        mode = "black" if index % 5 == 0 else "white"
+        manager.assign_permissions_to_role(roles[index % len(roles)], pattern, mode)
+    for i in range(1, len(roles)):
+        if rng.random() < 0.5:
+            manager.set_role_inheritance(roles[i], roles[rng.randrange(i)])
+    names = [f"user{i}" for i in range(users)]
+    for name in names:
+        manager.add_user(name)
+        manager.assign_role_to_user(rng.choice(roles), name)
+        if rng.random() < 0.2:
+            manager.assign_permissions_to_user(name, rng.choice(paths), "white")
+    queries = [(rng.choice(names), rng.choice(paths)) for _ in range(1024)]
+    return manager, queries
+
+
+@benchmark("rbac.check_permission", rules=[10, 100, 1000, 10000])
+def bench_rbac_check_permission(ctx: Context, rules: int):
+    """缓存命中为主: 1024 个查询在 100 个用户上循环, 测量前先全部执行一遍"""
+    manager, queries = _rbac(ctx.rng, rules, users=100)
+    for query in queries:
+        manager.check_permission(*query)
+    cycle = itertools.cycle(queries)
+    return lambda: manager.check_permission(*next(cycle))
+
+
+@benchmark("rbac.check_permission.uncached", rules=[10, 100, 1000])
+def bench_rbac_check_permission_uncached(ctx: Context, rules: int):
+    """缓存只容纳一个用户, 每次查询都重新计算用户的权限集合"""
+    manager, queries = _rbac(
+        ctx.rng, rules, users=100, decision_cache_size=1, permission_cache_size=1
+    )
+    cycle = itertools.cycle(queries)
+    return lambda: manager.check_permission(*next(cycle))
+
+
+@benchmark("trie.check_path", paths=[100, 1000, 10000], wildcard=[False, True])
+def bench_trie_check_path(ctx: Context, paths: int, wildcard: bool):
+    from ncatbot.plugin.RBACManager import Trie
+
+    trie = Trie(case_sensitive=False)
+    existing = _permission_paths(ctx.rng, paths)
+    for path in existing:
+        trie.add_path(path)
+    if wildcard:
+        queries = _wildcard_patterns(ctx.rng, existing, 1024)
+    else:
+        # 一半存在, 一半不存在
+        queries = [ctx.rng.choice(existing) for _ in range(512)]
+        queries += [f"missing{i}.group0.func0" for i in range(512)]
+        ctx.rng.shuffle(queries)
+    cycle = itertools.cycle(queries)
+    return lambda: trie.check_path(next(cycle))
+
+
+@benchmark("permission_path.matching_path", depth=[3, 8], pattern=["exact", "*", "**"])
+def bench_permission_path_matching(ctx: Context, depth: int, pattern: str):
+    from ncatbot.plugin.RBACManager import PermissionPath
+
+    targets = [
+        ".".join(f"n{ctx.rng.randrange(4)}" for _ in range(depth)) for _ in range(256)
+    ]
+    base = targets[0].split(".")
+    if pattern == "exact":
+        permission = PermissionPath(targets[0])
+    elif pattern == "*":
+        permission = PermissionPath(".".join(base[:1] + ["*"] * (depth - 1)))
+    else:
+        permission = PermissionPath(f"{base[0]}.**")
+    cycle = itertools.cycle(targets)
+    return lambda: permission.matching_path(next(cycle))
+
+
+# endregion
+# ---------------------
+# region 用例: 过滤器与消息
+# ---------------------
+
+
+def _group_message(text: str):
+    from ncatbot.core import GroupMessage
+
+    return GroupMessage(
+        {
+            "post_type": "message",
+            "message_type": "group",
+            "group_id": 100000,
+            "user_id": 200000,
+            "message_id": 1,
+            "raw_message": text,
+            "message": [{"type": "text", "data": {"text": text}}],
+            "sender": {"user_id": 200000, "nickname": "user"},
+        }
+    )
+
+
+@benchmark("filter.create", kind=["prefix", "regex", "chain"])
+def bench_filter_create(ctx: Context, kind: str):
+    from ncatbot.plugin.event.filter import create_filter
+
+    kwargs = {
+        "prefix": {"prefix": "/help"},
+        "regex": {"regex": r"^/(help|h)\b"},
+        "chain": {
+            "prefix": "/help",
+            "regex": r"^/(help|h)\b",
+            "custom_filter": lambda msg: False,
+        },
+    }[kind]
+    return lambda: create_filter(**kwargs)
+
+
+@benchmark("filter.check", kind=["prefix", "regex", "chain"], hit=[True, False])
+def bench_filter_check(ctx: Context, kind: str, hit: bool):
+    from ncatbot.plugin.event.event import Event, EventSource
+    from ncatbot.plugin.event.filter import create_filter
+
+    kwargs = {
+        "prefix": {"prefix": "/help"},
+        "regex": {"regex": r"^/(help|h)\b"},
+        "chain": {
+            "prefix": "/help",
+            "regex": r"^/(help|h)\b",
+            "custom_filter": lambda msg: False,
+        },
+    }[kind]
+    chain = create_filter(**kwargs)
+    text = "/help me" if hit else "今天天气怎么样"
+    event = Event(
+        "ncatbot.group_message_event", _group_message(text), EventSource(1, 1)
+    )
+    return lambda: chain.check(event)
+
+
+@benchmark("message_chain.construct", elements=[1, 10, 100])
+def bench_message_chain(ctx: Context, elements: int):
+    from ncatbot.core.element import At, Face, MessageChain, Text
+
+    makers = [
+        lambda i: Text(f"text{i}"),
+        lambda i: At(200000 + i),
+        lambda i: Face(i % 200),
+        lambda i: f"plain{i}",
+        lambda i: {"type": "text", "data": {"text": f"dict{i}"}},
+    ]
+    items = [ctx.rng.choice(makers)(i) for i in range(elements)]
+    return lambda: MessageChain(items)
+
+
+# endregion
+# ---------------------
+# region 用例: 文件读写
+# ---------------------
+
+
+def _nested_data(rng: random.Random, breadth: int, depth: int):
+    if depth == 0:
+        choice = rng.randrange(4)
+        if choice == 0:
+            return rng.randrange(1 << 30)
+        if choice == 1:
+            return rng.random()
+        if choice == 2:
+            return f"value{rng.randrange(1 << 20)}"
+        return [rng.randrange(100) for _ in range(4)]
+    return {f"key{i}": _nested_data(rng, breadth, depth - 1) for i in range(breadth)}
+
+
+def _loader(ctx: Context, file_type: str, breadth: int, depth: int):
+    from ncatbot.utils.file_io import UniversalLoader
+
+    if file_type == "msgpack":
+        try:
+            import msgpack  # noqa: F401
+        except ImportError:
+            return None
+    path = os.path.join(ctx.tmpdir, f"data_{breadth}_{depth}.{file_type}")
+    loader = UniversalLoader(path)
+    loader.update(_nested_data(ctx.rng, breadth, depth))
+    loader.save()
+    return loader
+
+
+@benchmark(
+    "universal_loader.save",
+    file_type=["json", "yaml", "msgpack"],
+    size=["10x3", "10x4"],
+)
+def bench_loader_save(ctx: Context, file_type: str, size: str):
+    breadth, depth = map(int, size.split("x"))
+    loader = _loader(ctx, file_type, breadth, depth)
+    return loader.save if loader is not None else None
+
+
+@benchmark(
+    "universal_loader.load",
+    file_type=["json", "yaml", "msgpack"],
+    size=["10x3", "10x4"],
+)
+def bench_loader_load(ctx: Context, file_type: str, size: str):
+    breadth, depth = map(int, size.split("x"))
+    loader = _loader(ctx, file_type, breadth, depth)
+    return loader.load if loader is not None else None
+
+
+# endregion
+
+
+def run(args):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ncatbot-micro-") as tmpdir:
+        for bench in BENCHMARKS:
+            for case, params in bench.cases():
+                if args.k and args.k not in case:
+                    continue
+                func = bench.setup(Context(args.seed, tmpdir), **params)
+                if func is None:
+                    print(f"{case:<60} 跳过 (缺少可选依赖)", flush=True)
+                    continue
+                result = measure(func, args.repeat, args.min_time)
+                summary = result["us_per_op"]
+                print(
+                    f"{case:<60} {summary['p50']:>12.3f} us "
+                    f"± {summary['stdev']:.3f} (min {summary['min']:.3f})",
+                    flush=True,
+                )
+                results.append(
+                    dict(name=case, benchmark=bench.name, params=params, **result)
+                )
+    if not args.no_save:
+        path = write_results(
+            args.output or result_path("micro"),
+            "micro",
+            results,
+            seed=args.seed,
+            min_time=args.min_time,
+        )
+        print(f"结果已保存到 {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NcatBot 热点路径微基准测试")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="运行用例并保存结果")
+    p.add_argument("-k", default=None, help="只运行名称中包含该字符串的用例")
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--min-time", type=float, default=0.1, help="单次测量的最短秒数")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", default=None, help="结果文件路径")
+    p.add_argument("--no-save", action="store_true", help="只打印, 不保存结果")
+    p.set_defaults(func=run)
+
+    p = sub.add_parser("list", help="列出全部用例")
+    p.set_defaults(
+        func=lambda args: print(
+            "\n".join(case for bench in BENCHMARKS for case, _ in bench.cases())
+        )
+    )
+
+    p = sub.add_parser("compare", help="比较两次结果")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.set_defaults(
+        func=lambda args: print(
+            "\n".join(
+                compare_results(
+                    load_results(args.old),
+                    load_results(args.new),
+                    ("name",),
+                    {"us_per_op.p50": False},
+                )
+            )
+        )
+    )
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
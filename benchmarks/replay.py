@@ -0,0 +1,273 @@
+"""
+事件回放
+
+把 ``config.event_capture`` 录制的真实事件重新送入 ``BotClient``, 用于在真实流量下分析插件的性能。
+事件按录制时的节奏、N 倍速或尽可能快地经 ``Websocket.on_message`` 进入正常的分发流程,
+对外的 API 调用全部由本地桩响应, 不会连接 NapCat。
+
+回放在机器人目录中进行 (读取其中的 config.yaml 和 plugins), 默认先把 config.yaml、
+plugins 和 data 复制到临时目录, 插件在回放中写入的数据不会影响原目录。
+
+用法::
+
+    # 按原速回放, 在机器人目录下执行
+    python -m benchmarks.replay logs/capture
+
+    # 10 倍速 / 尽可能快, 并用 cProfile 采样
+    python -m benchmarks.replay logs/capture --speed 10
+    python -m benchmarks.replay logs/capture --speed 0 --profile replay.prof
+"""
+
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from benchmarks.common import peak_rss_bytes, summarize, write_results
+from benchmarks.fake_onebot import FakeOneBotServer
+
+COPIED_PATHS = ("config.yaml", "plugins", "data")
+
+
+class StubApiConnection:
+    """
+    代替 API 长连接的桩, 绑定到连接池后所有请求都在本地得到响应。
+
+    响应内容沿用 ``FakeOneBotServer`` 的响应表, 可以用录制的响应表覆盖。
+    """
+
+    alive = True
+    inflight = 0
+
+    def __init__(self, server: FakeOneBotServer, delay: float = 0.0):
+        self.server = server
+        self.delay = delay
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._echo = 0
+
+    async def send(self, action: str, params: dict):
+        with self._lock:
+            self.calls[action] += 1
+            self._echo += 1
+            echo = str(self._echo)
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(dict(self.server.respond(action, params), echo=echo))
+        return echo, future
+
+    async def wait(self, echo: str, future: asyncio.Future, timeout=None) -> dict:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return await future
+
+    async def close(self):
+        pass
+
+
+def prepare_workdir(source: str) -> str:
+    """把机器人目录中回放需要的文件复制到临时目录"""
+    workdir = tempfile.mkdtemp(prefix="ncatbot-replay-")
+    for name in COPIED_PATHS:
+        path = os.path.join(source, name)
+        if os.path.isdir(path):
+            shutil.copytree(path, os.path.join(workdir, name))
+        elif os.path.isfile(path):
+            shutil.copy2(path, os.path.join(workdir, name))
+    return workdir
+
+
+async def _drain(ws, client):
+    """等待事件队列和会话车道中的事件全部处理完"""
+    if ws._queue is not None:
+        await ws._queue.join()
+    while client.dispatcher is not None:
+        stats = client.dispatcher.get_stats()
+        if not stats["lanes"] and not stats["active_lanes"]:
+            break
+        await asyncio.sleep(0.01)
+
+
+async def replay(
+    paths: List[str],
+    speed: float = 1.0,
+    stub: Optional[StubApiConnection] = None,
+    limit: Optional[int] = None,
+    load_plugins: bool = True,
+) -> dict:
+    """
+    回放录制文件, 返回吞吐、节奏偏差和 API 调用统计
+
+    :param speed: 回放倍速, 小于等于 0 时不等待, 尽可能快地送入事件
+    """
+    from ncatbot.adapter.net import Websocket, get_api_pool, read_capture
+    from ncatbot.adapter.net.wsroute import Route
+    from ncatbot.core import BotAPI, BotClient
+    from ncatbot.core.dispatcher import LaneDispatcher
+    from ncatbot.plugin import EventBus, PluginLoader
+    from ncatbot.utils import config
+    from ncatbot.utils.function_enhance import sync_bridge
+
+    stub = stub or StubApiConnection(FakeOneBotServer(autostart=False))
+    route = Route()
+
+    async def bind_stub():
+        get_api_pool(route.url, route.headers).bind(stub)
+
+    # 异步处理器和同步处理器 (经由后台事件循环) 的 API 调用都交给桩
+    await bind_stub()
+    sync_bridge.run(bind_stub())
+
+    # 与 BotClient.run 相同的初始化, 但不连接 NapCat
+    client = BotClient()
+    client.plugin_sys = PluginLoader(None)
+    client.event_bus = EventBus(client.plugin_sys)
+    client.plugin_sys.event_bus = client.event_bus
+    client.api = BotAPI()
+    if config.event_max_lanes > 0:
+        client.dispatcher = LaneDispatcher(
+            config.event_max_lanes, config.event_lane_max_pending
+        )
+    started = time.perf_counter()
+    if load_plugins:
+        await client.plugin_sys.load_plugins(api=client.api)
+    load_seconds = time.perf_counter() - started
+
+    ws = Websocket(client)
+    event_types: Counter = Counter()
+    lags: List[float] = []
+    first = last = None
+    started = time.perf_counter()
+    for offset, event in read_capture(paths):
+        if limit is not None and sum(event_types.values()) >= limit:
+            break
+        if first is None:
+            first = offset
+        if speed > 0:
+            delay = started + (offset - first) / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lags.append(max(0.0, -delay) * 1000)
+        event_types[ws._event_type(event)] += 1
+        await ws.on_message(event)
+        last = offset
+    fed_seconds = time.perf_counter() - started
+    await _drain(ws, client)
+    elapsed = time.perf_counter() - started
+
+    events = sum(event_types.values())
+    return {
+        "speed": speed,
+        "events": events,
+        "captured_seconds": (last - first) if first is not None else 0.0,
+        "plugin_load_seconds": load_seconds,
+        "feed_seconds": fed_seconds,
+        "elapsed_seconds": elapsed,
+        "events_per_second": events / elapsed if elapsed else 0.0,
+        "lag_ms": summarize(lags),
+        "event_types": dict(event_types.most_common()),
+        "api_calls": dict(stub.calls.most_common()),
+        "websocket": ws.get_stats(),
+        "rss_peak_mb": (peak_rss_bytes() or 0) / 2**20,
+    }
+
+
+def print_report(report: dict):
+    speed = f"{report['speed']}x" if report["speed"] > 0 else "最快"
+    print(
+        f"回放 {report['events']} 个事件 (录制时长 {report['captured_seconds']:.1f}s, "
+        f"{speed}): 用时 {report['elapsed_seconds']:.2f}s, "
+        f"{report['events_per_second']:.0f} 事件/s"
+    )
+    lag = report["lag_ms"]
+    if lag.get("n"):
+        print(
+            f"  送入延迟 ms: p50 {lag['p50']:.2f}  p99 {lag['p99']:.2f}  "
+            f"max {lag['max']:.2f}"
+        )
+    print(f"  事件类型: {report['event_types']}")
+    print(f"  API 调用: {report['api_calls']}")
+    print(f"  峰值内存: {report['rss_peak_mb']:.1f} MB")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", help="录制文件或录制目录")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="回放倍速, 0 表示尽可能快"
+    )
+    parser.add_argument("--limit", type=int, help="最多回放的事件数")
+    parser.add_argument(
+        "--workdir", default=".", help="机器人目录, 读取其中的配置和插件"
+    )
+    parser.add_argument(
+        "--in-place", action="store_true", help="直接在机器人目录中回放, 不复制"
+    )
+    parser.add_argument("--no-plugins", action="store_true", help="不加载插件")
+    parser.add_argument("--responses", help="API 响应表 JSON 文件 {action: data}")
+    parser.add_argument(
+        "--api-delay", type=float, default=0.0, help="模拟的 API 响应耗时 (秒)"
+    )
+    parser.add_argument("--config", type=json.loads, help="覆盖配置项的 JSON 对象")
+    parser.add_argument("--profile", help="用 cProfile 采样并把结果写入该文件")
+    parser.add_argument("--output", help="把报告写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    paths = [os.path.abspath(path) for path in args.paths]
+    output = os.path.abspath(args.output) if args.output else None
+    responses = os.path.abspath(args.responses) if args.responses else None
+    profile_path = os.path.abspath(args.profile) if args.profile else None
+    workdir = os.path.abspath(args.workdir)
+    if not args.in_place:
+        workdir = prepare_workdir(workdir)
+    # 配置在导入 ncatbot 时从当前目录的 config.yaml 读取, 因此先切换目录
+    os.chdir(workdir)
+
+    from ncatbot.utils import config
+
+    for key, value in (args.config or {}).items():
+        setattr(config, key, value)
+    # 回放的事件不再录制
+    config.event_capture = False
+
+    server = FakeOneBotServer(autostart=False)
+    if responses:
+        server.load_responses(responses)
+    stub = StubApiConnection(server, args.api_delay)
+
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        report = asyncio.run(
+            replay(paths, args.speed, stub, args.limit, not args.no_plugins)
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+
+    print_report(report)
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+        print(f"采样结果已保存到 {profile_path}")
+    if output:
+        write_results(output, "replay", [report], paths=paths)
+        print(f"报告已保存到 {output}")
+    sys.stdout.flush()
+    if not args.in_place:
+        shutil.rmtree(workdir, ignore_errors=True)
+    # 机器人的后台线程不会自行退出
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
 # NapCat 网络连接适配
 
+from ncatbot.adapter.net.capture import EventRecorder, read_capture
 from ncatbot.adapter.net.connect import Websocket
+from ncatbot.adapter.net.echo import EchoRouter
+from ncatbot.adapter.net.pool import ApiConnectionPool, get_api_pool
 from ncatbot.adapter.net.wsroute import Route, check_websocket
 
-__all__ = ["Websocket", "Route", "check_websocket"]
+__all__ = [
+    "Websocket",
+    "Route",
+    "check_websocket",
+    "ApiConnectionPool",
+    "EchoRouter",
+    "get_api_pool",
+    "EventRecorder",
+    "read_capture",
+]
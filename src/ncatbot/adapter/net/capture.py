@@ -0,0 +1,207 @@
+# 事件录制: 把收到的原始事件帧连同单调时钟时间戳写入压缩的滚动文件, 用于之后回放
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from ncatbot.utils import config, get_log
+
+_log = get_log()
+
+CAPTURE_FORMAT = "ncatbot-capture"
+CAPTURE_VERSION = 1
+CAPTURE_PATTERN = "capture-*.jsonl.gz"
+
+_STOP = object()
+
+
+class EventRecorder:
+    """
+    事件录制器。
+
+    ``record`` 只把帧和时间戳放进队列, 压缩和写盘在后台线程中完成, 不占用事件循环。
+    录制文件为 gzip 压缩的 JSON Lines, 首行是文件头, 之后每行一个 ``[秒数, 原始帧]``,
+    秒数为相对录制开始的单调时钟时间。文件超过 ``max_bytes`` 后换新文件,
+    只保留最新的 ``max_files`` 个。
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 0, max_files: int = 0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._queue = queue.SimpleQueue()
+        self._start = time.monotonic()
+        self._started_at = time.time()
+        self._raw = None
+        self._gz: Optional[gzip.GzipFile] = None
+        self._index = 0
+        self.recorded = 0  # 累计写入的帧数
+        self._thread = threading.Thread(
+            target=self._run, name="EventRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, frame: Union[str, dict]):
+        """录制一帧, ``frame`` 为收到的原始文本或已解析的事件"""
+        if not isinstance(frame, str):
+            # 事件之后会被处理器使用, 在这里序列化以免写盘时内容已被改动
+            frame = json.dumps(frame, ensure_ascii=False)
+        self._queue.put((time.monotonic() - self._start, frame))
+
+    def close(self):
+        """写完队列中剩余的帧并关闭文件"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            # 一次取完当前积压的帧, 再统一刷新到磁盘
+            while item is not _STOP:
+                try:
+                    self._write(*item)
+                except Exception as e:
+                    _log.error(f"写入事件录制文件失败: {e}")
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if self._gz is not None:
+                try:
+                    # 同步刷新, 进程意外退出时也只丢失最后一小段
+                    self._gz.flush(zlib.Z_SYNC_FLUSH)
+                except Exception as e:
+                    _log.error(f"写入事件录制文件失败: {e}")
+            if item is _STOP:
+                self._close_file()
+                return
+
+    def _write(self, offset: float, frame: str):
+        if self._gz is None:
+            self._open_file()
+        line = json.dumps([round(offset, 6), frame], ensure_ascii=False)
+        self._gz.write(line.encode("utf-8") + b"\n")
+        self.recorded += 1
+        if self.max_bytes and self._raw.tell() >= self.max_bytes:
+            self._close_file()
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._index += 1
+        name = "capture-{}-{}-{:04d}.jsonl.gz".format(
+            time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at)),
+            os.getpid(),
+            self._index,
+        )
+        path = os.path.join(self.directory, name)
+        self._raw = open(path, "wb")
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        header = {
+            "format": CAPTURE_FORMAT,
+            "version": CAPTURE_VERSION,
+            "started_at": self._started_at,
+            "part": self._index,
+        }
+        self._gz.write(json.dumps(header).encode("utf-8") + b"\n")
+        _log.debug(f"事件录制文件: {path}")
+        self._remove_old_files()
+
+    def _close_file(self):
+        if self._gz is not None:
+            self._gz.close()
+            self._raw.close()
+            self._gz = self._raw = None
+
+    def _remove_old_files(self):
+        if not self.max_files:
+            return
+        files = sorted(glob.glob(os.path.join(self.directory, CAPTURE_PATTERN)))
+        for path in files[: -self.max_files]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                _log.warning(f"删除旧的事件录制文件 {path} 失败: {e}")
+
+
+_recorder: Optional[EventRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_event_recorder() -> Optional[EventRecorder]:
+    """按配置获取进程内共享的录制器, 未开启录制时返回 None"""
+    global _recorder
+    if not config.event_capture:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = EventRecorder(
+                config.event_capture_dir,
+                config.event_capture_max_bytes,
+                config.event_capture_max_files,
+            )
+            atexit.register(_recorder.close)
+            _log.info(f"已开启事件录制, 录制文件保存在 {config.event_capture_dir}")
+        return _recorder
+
+
+def capture_files(paths: Union[str, Iterable[str]]) -> List[str]:
+    """把文件和目录展开为按时间排序的录制文件列表"""
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, CAPTURE_PATTERN))))
+        else:
+            files.append(path)
+    return files
+
+
+def read_capture(paths: Union[str, Iterable[str]]) -> Iterator[Tuple[float, dict]]:
+    """
+    依次读取录制文件, 生成 ``(秒数, 事件)``
+
+    多次运行录制的文件首尾相接, 秒数在整个序列中单调不减。
+    未正常关闭的文件读到损坏处为止。
+    """
+    base = 0.0  # 当前录制相对整个序列的起点
+    last = 0.0
+    started_at = None
+    for path in capture_files(paths):
+        with gzip.open(path, "rb") as f:
+            lines = _read_lines(f, path)
+            header = json.loads(next(lines, b"{}"))
+            if header.get("format") != CAPTURE_FORMAT:
+                _log.warning(f"{path} 不是事件录制文件, 已跳过")
+                continue
+            if header.get("started_at") != started_at:
+                # 新的一次录制, 时间戳从零开始, 接在上一次录制的末尾
+                started_at = header.get("started_at")
+                base = last
+            for line in lines:
+                try:
+                    offset, frame = json.loads(line)
+                    event = json.loads(frame)
+                except ValueError:
+                    _log.warning(f"{path} 中有无法解析的行, 已跳过")
+                    continue
+                last = max(last, base + offset)
+                yield last, event
+
+
+def _read_lines(f, path: str) -> Iterator[bytes]:
+    try:
+        for line in f:
+            if not line.endswith(b"\n"):
+                # 写到一半的行
+                return
+            yield line
+    except (EOFError, OSError, zlib.error) as e:
+        _log.warning(f"录制文件 {path} 不完整: {e}")
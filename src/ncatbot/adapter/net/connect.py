@@ -1,9 +1,17 @@
 import asyncio
 import json
+import traceback
 
 import websockets
 
 from ncatbot.utils import config, get_log
+from ncatbot.utils.metrics import (
+    EVENT_QUEUE_BACKLOG,
+    EVENTS_DROPPED,
+    EVENTS_RECEIVED,
+)
+
+from .capture import get_event_recorder
 
 _log = get_log()
 
@@ -49,36 +57,145 @@ class Websocket:
             if config.ws_token
             else {"Content-Type": "application/json"}
         )
+        # 事件队列与分发协程, 在首次连接时于当前事件循环中创建
+        self._queue: asyncio.Queue = None
+        self._workers: list[asyncio.Task] = []
+        self._queued = 0  # 累计入队事件数
+        self._dropped = 0  # 累计丢弃事件数
+        self._in_flight = 0  # 正在处理的事件数
+        self._recorder = get_event_recorder()  # 事件录制, 未开启时为 None
+
+    def get_stats(self) -> dict:
+        """
+        事件队列统计信息
+
+        ``in_flight`` 为正在执行的事件数。启用分道调度时分发协程只负责把事件交给车道,
+        ``in_flight`` 取车道中正在执行的事件数, 分发协程中等待入道的事件数见 ``handoff``,
+        已入道尚未执行的事件数见 ``lane_pending``。
+        """
+        stats = {
+            "queued": self._queued,
+            "dropped": self._dropped,
+            "in_flight": self._in_flight,
+            "backlog": self._queue.qsize() if self._queue else 0,
+            "workers": len(self._workers),
+        }
+        dispatcher = getattr(self.client, "dispatcher", None)
+        if dispatcher is not None:
+            lanes = dispatcher.get_stats()
+            stats["handoff"] = stats["in_flight"]
+            stats["in_flight"] = lanes["running"]
+            stats["lane_pending"] = lanes["pending"]
+        return stats
+
+    @staticmethod
+    def _event_type(message: dict) -> str:
+        """事件的细分类型, 如 ``message.group``, ``notice.group_increase``"""
+        post_type = message.get("post_type")
+        detail = (
+            message.get("message_type")
+            or message.get("notice_type")
+            or message.get("request_type")
+            or message.get("meta_event_type")
+        )
+        return f"{post_type}.{detail}" if detail else str(post_type)
+
+    def _is_droppable(self, message: dict) -> bool:
+        event_type = self._event_type(message)
+        drop_types = config.event_drop_types
+        return event_type in drop_types or event_type.split(".")[0] in drop_types
+
+    def _start_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=max(1, config.event_queue_max_size))
+            EVENT_QUEUE_BACKLOG.set_function(self._queue.qsize)
+        self._workers = [task for task in self._workers if not task.done()]
+        for _ in range(max(1, config.event_workers) - len(self._workers)):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            message = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._dispatch(message)
+            except Exception as e:
+                _log.error(f"处理事件时出错: {e}")
+                _log.debug(traceback.format_exc())
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def on_message(self, message: dict, block: bool = True):
+        """
+        事件入队, 队列满时按 ``config.event_overflow_policy`` 处理:
 
-    def on_message(self, message: dict):
+        - ``block``: 等待队列空出位置, 反压到连接读取
+        - ``drop_oldest``: 丢弃队列中最早的事件
+        - ``drop_by_type``: 丢弃 ``config.event_drop_types`` 中的事件, 其余事件等待
+
+        :param block: 为 False 时不允许等待, 需要等待的情况退化为 ``drop_oldest``
+        """
+        if self._queue is None:
+            self._start_workers()
+        EVENTS_RECEIVED.labels(self._event_type(message)).inc()
+        if self._queue.full():
+            policy = config.event_overflow_policy
+            if policy == "drop_by_type" and self._is_droppable(message):
+                self._dropped += 1
+                EVENTS_DROPPED.labels(self._event_type(message)).inc()
+                _log.debug(f"事件队列已满, 丢弃事件: {self._event_type(message)}")
+                return
+            if policy == "drop_oldest" or not block:
+                dropped = self._queue.get_nowait()
+                self._queue.task_done()
+                self._dropped += 1
+                EVENTS_DROPPED.labels(self._event_type(dropped)).inc()
+                _log.debug(f"事件队列已满, 丢弃事件: {self._event_type(dropped)}")
+        self._queued += 1
+        await self._queue.put(message)
+
+    async def _dispatch(self, message: dict):
         message_post_type = message.get("post_type")
         message_type = message.get("message_type")
         if message_post_type in {"message", "message_sent"}:
             if message_type == "group":
-                asyncio.create_task(self.client.handle_group_event(message))
+                await self.client.dispatch_event(
+                    message, self.client.handle_group_event, message
+                )
             elif message_type == "private":
-                asyncio.create_task(self.client.handle_private_event(message))
+                await self.client.dispatch_event(
+                    message, self.client.handle_private_event, message
+                )
             else:
                 _log.error(
                     "Unknown error: Unrecognized message type!Please check log info!"
                 ) and _log.debug(message)
         elif message_post_type == "notice":
-            asyncio.create_task(self.client.handle_notice_event(message))
+            await self.client.dispatch_event(
+                message, self.client.handle_notice_event, message
+            )
         elif message_post_type == "request":
-            asyncio.create_task(self.client.handle_request_event(message))
+            await self.client.dispatch_event(
+                message, self.client.handle_request_event, message
+            )
         elif message_post_type == "meta_event":
             if message["meta_event_type"] == "lifecycle":
-                asyncio.create_task(self.client.handle_startup_event())
                 _log.info(f"机器人 {message.get('self_id')} 成功启动")
+                await self.client.dispatch_event(
+                    message, self.client.handle_startup_event
+                )
             else:
                 _log.debug(message)
         else:
             _log.error(
                 "Unknown error: Unrecognized message type!Please check log info!"
             ) and _log.debug(message)
-        del message_post_type, message_type
 
     async def on_connect(self):
+        if config.ws_universal:
+            return await self._on_connect_universal()
+        self._start_workers()
         async with connect(
             uri=self._websocket_uri, extra_headers=self._header, ping_interval=None
         ) as ws:
@@ -86,9 +203,43 @@ class Websocket:
             while True:
                 try:
                     message = await ws.recv()
+                    if self._recorder is not None:
+                        self._recorder.record(message)
                     message = json.loads(message)
-                    self.on_message(message)
+                    await self.on_message(message)
                 # 这里的错误处理没有进行细分，我觉得没有很大的必要，报错的可能性不大，如果你对websocket了解很深，请完善此部分。
                 except Exception as e:
                     _log.error(f"Websocket error: {e}")
                     raise e
+
+    async def _on_connect_universal(self):
+        """
+        通过 universal 端点连接, 事件上报和 API 调用共用这一条连接。
+
+        连接建立后绑定到当前事件循环的 API 连接池, 此后 ``Route.post`` 的请求都经由该连接发送,
+        响应按 echo 分流, 其余帧按事件处理。
+        """
+        from ncatbot.adapter.net.pool import ApiConnection, get_api_pool
+
+        async def on_event(message: dict):
+            if self._recorder is not None:
+                self._recorder.record(message)
+            # API 响应与事件共用读取任务, 在这里等待会卡住响应, 导致处理器永远等不到结果
+            await self.on_message(message, block=False)
+
+        self._start_workers()
+        conn = ApiConnection(
+            config.ws_uri,
+            self._header,
+            on_event=on_event,
+            auto_reconnect=False,
+            ping_interval=None,
+        )
+        await conn.connect()
+        pool = get_api_pool(f"{config.ws_uri}/api", self._header)
+        pool.bind(conn)
+        try:
+            await conn.wait_closed()
+        finally:
+            pool.unbind(conn)
+        raise ConnectionError("universal 连接已断开")
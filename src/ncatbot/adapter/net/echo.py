@@ -0,0 +1,72 @@
+# echo 关联层: 为每个 API 请求分配唯一 echo, 并把响应帧交给对应的等待者
+import asyncio
+import itertools
+import uuid
+from typing import Dict, Optional, Tuple
+
+# 进程级前缀 + 自增序号, 不同连接、重连前后都不会产生相同的 echo
+_ECHO_PREFIX = uuid.uuid4().hex[:8]
+_echo_counter = itertools.count(1)
+
+
+def new_echo() -> str:
+    """生成进程内唯一的 echo"""
+    return f"{_ECHO_PREFIX}-{next(_echo_counter)}"
+
+
+class EchoRouter:
+    """
+    请求与响应的关联表。
+
+    发送方通过 ``register`` 取得 echo 和 Future, 连接的读取任务把收到的每一帧交给 ``resolve``,
+    由它唤醒对应的等待者。一条连接上因此可以同时挂起任意多个请求。
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def register(self) -> Tuple[str, asyncio.Future]:
+        echo = new_echo()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[echo] = future
+        return echo, future
+
+    def discard(self, echo: str):
+        self._pending.pop(echo, None)
+
+    def resolve(self, frame: dict) -> bool:
+        """
+        尝试把一帧交给等待者
+
+        :return: 该帧是已登记请求的响应时返回 True
+        """
+        echo = frame.get("echo")
+        if echo is None:
+            return False
+        future = self._pending.pop(str(echo), None)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_result(frame)
+        return True
+
+    def fail_all(self, exc: BaseException):
+        """连接断开时让所有等待者立即失败"""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def wait(
+        self, echo: str, future: asyncio.Future, timeout: Optional[float] = None
+    ) -> dict:
+        """等待响应, 超时后注销该请求并抛出 TimeoutError"""
+        try:
+            return await asyncio.wait_for(future, timeout or None)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"等待 API 响应超时 (echo={echo})") from None
+        finally:
+            self.discard(echo)
@@ -0,0 +1,195 @@
+# API 连接池: 复用 /api 长连接, 同一连接上按 echo 复用多个请求
+import asyncio
+import inspect
+import json
+import weakref
+from typing import Any, Callable, List, Optional, Tuple
+
+from ncatbot.utils import config, get_log
+
+from .connect import connect
+from .echo import EchoRouter
+
+_log = get_log()
+
+
+class ApiConnection:
+    """
+    一条 API 长连接。
+
+    后台读取任务持续接收响应, 按 ``echo`` 交给对应的等待者, 因此同一连接上可以同时挂起多个请求。
+    连接断开后, 下一次请求会自动重连。
+
+    连接到 universal 端点时, 同一条连接上还会收到上报事件, 这些帧会交给 ``on_event`` 处理。
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        headers: dict,
+        on_event: Callable[[dict], Any] = None,
+        auto_reconnect: bool = True,
+        **connect_kwargs,
+    ):
+        self.uri = uri
+        self.headers = headers
+        self._on_event = on_event
+        self._auto_reconnect = auto_reconnect
+        self._connect_kwargs = connect_kwargs
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+        self._router = EchoRouter()
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._reader is not None and not self._reader.done()
+
+    @property
+    def inflight(self) -> int:
+        return len(self._router)
+
+    async def connect(self):
+        """建立连接并启动读取任务, 已连接时什么也不做"""
+        if self.alive:
+            return
+        async with self._connect_lock:
+            if self.alive:
+                return
+            # 开大限制到 16MB
+            self._ws = await connect(
+                self.uri,
+                extra_headers=self.headers,
+                max_size=2**32,
+                **self._connect_kwargs,
+            )
+            self._reader = asyncio.create_task(self._read_loop())
+            _log.debug(f"API 连接 {self.uri} 已建立")
+
+    async def wait_closed(self):
+        """等待读取任务结束, 即连接断开"""
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._ws:
+                frame = json.loads(raw)
+                if self._router.resolve(frame):
+                    continue
+                if self._on_event is not None and "post_type" in frame:
+                    result = self._on_event(frame)
+                    if inspect.isawaitable(result):
+                        await result
+                else:
+                    _log.debug(f"收到无人等待的 API 响应: {frame}")
+        except Exception as e:
+            _log.warning(f"API 连接 {self.uri} 断开: {e}")
+        finally:
+            self._router.fail_all(ConnectionError("API 连接已断开"))
+
+    async def send(self, action: str, params: dict) -> Tuple[str, asyncio.Future]:
+        """发送请求, 返回 echo 和等待响应的 Future"""
+        if not self.alive and not self._auto_reconnect:
+            raise ConnectionError(f"连接 {self.uri} 已断开")
+        await self.connect()
+        echo, future = self._router.register()
+        try:
+            await self._ws.send(
+                json.dumps({"action": action, "params": params, "echo": echo})
+            )
+        except Exception:
+            self._router.discard(echo)
+            raise
+        return echo, future
+
+    async def wait(
+        self, echo: str, future: asyncio.Future, timeout: Optional[float] = None
+    ) -> dict:
+        return await self._router.wait(echo, future, timeout)
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        await self.wait_closed()
+
+
+class ApiConnectionPool:
+    """
+    /api 连接池, 限制同时挂起的请求数, 并把请求分摊到少量长连接上。
+    """
+
+    def __init__(self, uri: str, headers: dict, size: int, max_inflight: int):
+        self.uri = uri
+        self._connections: List[ApiConnection] = [
+            ApiConnection(uri, headers) for _ in range(max(1, size))
+        ]
+        self._semaphore = asyncio.Semaphore(max(1, max_inflight))
+        self._bound: Optional[ApiConnection] = None
+
+    def bind(self, conn: ApiConnection):
+        """
+        绑定一条外部连接 (例如 universal 连接), 绑定期间所有请求都走这条连接,
+        它断开后自动回落到池内的 /api 连接
+        """
+        self._bound = conn
+
+    def unbind(self, conn: ApiConnection):
+        if self._bound is conn:
+            self._bound = None
+
+    def _pick(self) -> ApiConnection:
+        """优先使用空闲的活动连接, 其次唤醒未连接的槽位, 最后选择负载最小的连接"""
+        if self._bound is not None and self._bound.alive:
+            return self._bound
+        alive = [conn for conn in self._connections if conn.alive]
+        idle = [conn for conn in alive if conn.inflight == 0]
+        if idle:
+            return idle[0]
+        dead = [conn for conn in self._connections if not conn.alive]
+        if dead:
+            return dead[0]
+        return min(alive, key=lambda conn: conn.inflight)
+
+    async def request(
+        self, action: str, params: dict, timeout: Optional[float] = None
+    ) -> dict:
+        """
+        发送一个 API 请求并等待响应
+
+        :param timeout: 等待响应的秒数, 为 None 时使用 ``config.api_timeout``
+        """
+        async with self._semaphore:
+            for attempt in range(2):
+                conn = self._pick()
+                try:
+                    echo, future = await conn.send(action, params)
+                    break
+                except Exception as e:
+                    # 请求尚未发出, 可以安全地换一条连接重试一次
+                    if attempt:
+                        raise
+                    _log.warning(f"API 请求 {action} 发送失败, 正在重试: {e}")
+            if timeout is None:
+                timeout = config.api_timeout
+            return await conn.wait(echo, future, timeout)
+
+    async def close(self):
+        await asyncio.gather(
+            *(conn.close() for conn in self._connections), return_exceptions=True
+        )
+
+
+# 连接绑定在事件循环上, 因此每个事件循环各自持有一组连接池
+_pools = weakref.WeakKeyDictionary()  # {loop: {uri: ApiConnectionPool}}
+
+
+def get_api_pool(uri: str, headers: dict) -> ApiConnectionPool:
+    """获取当前事件循环下指定 uri 的共享连接池"""
+    loop = asyncio.get_running_loop()
+    pools = _pools.setdefault(loop, {})
+    if uri not in pools:
+        pools[uri] = ApiConnectionPool(
+            uri, headers, config.api_pool_size, config.api_max_inflight
+        )
+    return pools[uri]
@@ -1,9 +1,11 @@
-import datetime
-import json as j
+import asyncio
+import time
 
-from ncatbot.utils import config, get_log
+from ncatbot.utils import REQUEST_SUCCESS, config, get_log
+from ncatbot.utils.metrics import API_REQUESTS, API_SECONDS
 
 from .connect import connect
+from .pool import get_api_pool
 
 _log = get_log()
 
@@ -49,27 +51,28 @@ class Route:
             else {"Content-Type": "application/json"}
         )
 
-    async def post(self, path, params=None, json=None):
-        # 开大限制到 16MB
-        async with connect(self.url, extra_headers=self.headers, max_size=2**32) as ws:
-            if params:
-                await ws.send(
-                    j.dumps(
-                        {
-                            "action": path.replace("/", ""),
-                            "params": params,
-                            "echo": int(datetime.datetime.now().timestamp()),
-                        }
-                    )
-                )
-            elif json:
-                await ws.send(
-                    j.dumps(
-                        {
-                            "action": path.replace("/", ""),
-                            "params": json,
-                            "echo": int(datetime.datetime.now().timestamp()),
-                        }
-                    )
-                )
-            return j.loads(await ws.recv())
+    async def post(self, path, params=None, json=None, timeout=None):
+        action = path.replace("/", "")
+        started = time.perf_counter()
+        result = "error"
+        try:
+            # 所有 Route 实例共享同一事件循环下的连接池
+            response = await get_api_pool(self.url, self.headers).request(
+                action, params or json or {}, timeout
+            )
+            result = (
+                "ok"
+                if isinstance(response, dict)
+                and response.get("status") == REQUEST_SUCCESS
+                else "failed"
+            )
+            return response
+        except TimeoutError:
+            result = "timeout"
+            raise
+        except asyncio.CancelledError:
+            result = "cancelled"
+            raise
+        finally:
+            API_SECONDS.labels(action).observe(time.perf_counter() - started)
+            API_REQUESTS.labels(action, result).inc()
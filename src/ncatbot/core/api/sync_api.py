@@ -1,8 +1,7 @@
-import asyncio
 from typing import Union
 
 from ncatbot.core.element import MessageChain
-from ncatbot.utils import config
+from ncatbot.utils import config, run_func_sync
 
 
 class SYNC_API_MIXIN:
@@ -17,10 +16,7 @@ class SYNC_API_MIXIN:
         :param sex: 性别
         :return: 设置账号信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_qq_profile(nickname, personal_note, sex))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_qq_profile, nickname, personal_note, sex)
 
     # 用户接口
     def get_user_card_sync(self, user_id: int, phone_number: str):
@@ -29,10 +25,7 @@ class SYNC_API_MIXIN:
         :param phone_number: 手机号
         :return: 获取用户名片
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_user_card(user_id, phone_number))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_user_card, user_id, phone_number)
 
     def get_group_card_sync(self, group_id: int, phone_number: str):
         """
@@ -40,49 +33,34 @@ class SYNC_API_MIXIN:
         :param phone_number: 手机号
         :return: 获取群名片
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_card(group_id, phone_number))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_card, group_id, phone_number)
 
     def get_share_group_card_sync(self, group_id: str):
         """
         :param group_id: 群号
         :return: 获取群共享名片
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_share_group_card(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_share_group_card, group_id)
 
     def set_online_status_sync(self, status: str):
         """
         :param status: 在线状态
         :return: 设置在线状态
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_online_status(status))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_online_status, status)
 
     def get_friends_with_category_sync(self):
         """
         :return: 获取好友列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_friends_with_category())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_friends_with_category)
 
     def set_qq_avatar_sync(self, avatar: str):
         """
         :param avatar: 头像路径，支持本地路径和网络路径
         :return: 设置头像
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_qq_avatar(avatar))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_qq_avatar, avatar)
 
     def send_like_sync(self, user_id: str, times: int):
         """
@@ -90,10 +68,7 @@ class SYNC_API_MIXIN:
         :param times: 次数
         :return: 发送赞
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_like(user_id, times))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_like, user_id, times)
 
     def create_collection_sync(self, rawdata: str, brief: str):
         """
@@ -101,10 +76,7 @@ class SYNC_API_MIXIN:
         :param brief: 标题
         :return: 创建收藏
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.create_collection(rawdata, brief))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.create_collection, rawdata, brief)
 
     def set_friend_add_request_sync(self, flag: str, approve: bool, remark: str):
         """
@@ -113,59 +85,41 @@ class SYNC_API_MIXIN:
         :param remark: 备注
         :return: 设置好友请求
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_friend_add_request(flag, approve, remark))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_friend_add_request, flag, approve, remark)
 
     def set_self_long_nick_sync(self, longnick: str):
         """
         :param longnick: 个性签名内容
         :return: 设置个性签名
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_self_long_nick(longnick))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_self_long_nick, longnick)
 
     def get_stranger_info_sync(self, user_id: Union[int, str]):
         """
         :param user_id: QQ号
         :return: 获取陌生人信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_stranger_info(user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_stranger_info, user_id)
 
     def get_friend_list_sync(self, cache: bool):
         """
         :param cache: 是否使用缓存
         :return: 获取好友列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_friend_list(cache))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_friend_list, cache)
 
     def get_profile_like_sync(self):
         """
         :return: 获取个人资料卡点赞数
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_profile_like())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_profile_like)
 
     def fetch_custom_face_sync(self, count: int):
         """
         :param count: 数量
         :return: 获取收藏表情
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.fetch_custom_face(count))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.fetch_custom_face, count)
 
     def upload_private_file_sync(self, user_id: Union[int, str], file: str, name: str):
         """
@@ -174,10 +128,7 @@ class SYNC_API_MIXIN:
         :param name: 文件名
         :return: 上传私聊文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.upload_private_file(user_id, file, name))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.upload_private_file, user_id, file, name)
 
     def delete_friend_sync(
         self,
@@ -193,32 +144,23 @@ class SYNC_API_MIXIN:
         :param temp_both_del: 双向删除
         :return: 删除好友
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.delete_friend(user_id, friend_id, temp_block, temp_both_del)
+        return run_func_sync(
+            self.delete_friend, user_id, friend_id, temp_block, temp_both_del
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def nc_get_user_status_sync(self, user_id: Union[int, str]):
         """
         :param user_id: QQ号
         :return: 获取用户状态
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.nc_get_user_status(user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.nc_get_user_status, user_id)
 
     def get_mini_app_ark_sync(self, app_json: dict):
         """
         :param app_json: 小程序JSON
         :return: 获取小程序ARK
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_mini_app_ark(app_json))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_mini_app_ark, app_json)
 
     # 消息接口
     def mark_msg_as_read_sync(
@@ -229,69 +171,48 @@ class SYNC_API_MIXIN:
         :param user_id: QQ号,二选一
         :return: 设置消息已读
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.mark_msg_as_read(group_id, user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.mark_msg_as_read, group_id, user_id)
 
     def mark_group_msg_as_read_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 设置群聊已读
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.mark_group_msg_as_read(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.mark_group_msg_as_read, group_id)
 
     def mark_private_msg_as_read_sync(self, user_id: Union[int, str]):
         """
         :param user_id: QQ号
         :return: 设置私聊已读
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.mark_private_msg_as_read(user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.mark_private_msg_as_read, user_id)
 
     def mark_all_as_read_sync(self):
         """
         :return: 设置所有消息已读
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.mark_all_as_read())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.mark_all_as_read)
 
     def delete_msg_sync(self, message_id: Union[int, str]):
         """
         :param message_id: 消息ID
         :return: 删除消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.delete_msg(message_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.delete_msg, message_id)
 
     def get_msg_sync(self, message_id: Union[int, str]):
         """
         :param message_id: 消息ID
         :return: 获取消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_msg(message_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_msg, message_id)
 
     def get_image_sync(self, image_id: str):
         """
         :param image_id: 图片ID
         :return: 获取图片消息详情
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_image(image_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_image, image_id)
 
     def get_record_sync(self, record_id: str, output_type: str = "mp3"):
         """
@@ -299,20 +220,14 @@ class SYNC_API_MIXIN:
         :param output_type: 输出类型，枚举值:mp3 amr wma m4a spx ogg wav flac,默认为mp3
         :return: 获取语音消息详情
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_record(record_id, output_type))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_record, record_id, output_type)
 
     def get_file_sync(self, file_id: str):
         """
         :param file_id: 文件ID
         :return: 获取文件消息详情
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_file(file_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_file, file_id)
 
     def get_group_msg_history_sync(
         self,
@@ -328,12 +243,9 @@ class SYNC_API_MIXIN:
         :param reverse_order: 是否倒序
         :return: 获取群消息历史记录
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.get_group_msg_history(group_id, message_seq, count, reverse_order)
+        return run_func_sync(
+            self.get_group_msg_history, group_id, message_seq, count, reverse_order
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def set_msg_emoji_like_sync(
         self, message_id: Union[int, str], emoji_id: int, emoji_set: bool
@@ -344,12 +256,7 @@ class SYNC_API_MIXIN:
         :param emoji_set: 设置
         :return: 设置消息表情点赞
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.set_msg_emoji_like(message_id, emoji_id, emoji_set)
-        )
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_msg_emoji_like, message_id, emoji_id, emoji_set)
 
     def get_friend_msg_history_sync(
         self,
@@ -365,12 +272,9 @@ class SYNC_API_MIXIN:
         :param reverse_order: 是否倒序
         :return: 获取好友消息历史记录
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.get_friend_msg_history(user_id, message_seq, count, reverse_order)
+        return run_func_sync(
+            self.get_friend_msg_history, user_id, message_seq, count, reverse_order
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def get_recent_contact_sync(self, count: int):
         """
@@ -378,10 +282,7 @@ class SYNC_API_MIXIN:
         :param count: 会话数量
         :return: 最近消息列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_recent_contact(count))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_recent_contact, count)
 
     def fetch_emoji_like_sync(
         self,
@@ -401,24 +302,22 @@ class SYNC_API_MIXIN:
         :param count: 数量,可选
         :return: 获取贴表情详情
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.fetch_emoji_like(
-                message_id, emoji_id, emoji_type, group_id, user_id, count
-            )
+        return run_func_sync(
+            self.fetch_emoji_like,
+            message_id,
+            emoji_id,
+            emoji_type,
+            group_id,
+            user_id,
+            count,
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def get_forward_msg_sync(self, message_id: str):
         """
         :param message_id: 消息ID
         :return: 获取合并转发消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_forward_msg(message_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_forward_msg, message_id)
 
     def send_poke_sync(
         self, user_id: Union[int, str], group_id: Union[int, str] = None
@@ -428,10 +327,7 @@ class SYNC_API_MIXIN:
         :param group_id: 群号,可选，不填则为私聊
         :return: 发送戳一戳
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_poke(user_id, group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_poke, user_id, group_id)
 
     def forward_friend_single_msg_sync(self, message_id: str, user_id: Union[int, str]):
         """
@@ -439,10 +335,7 @@ class SYNC_API_MIXIN:
         :param user_id: 发送对象QQ号
         :return: 转发好友消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.forward_friend_single_msg(message_id, user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.forward_friend_single_msg, message_id, user_id)
 
     def send_private_forward_msg_sync(
         self, user_id: Union[int, str], messages: list[str]
@@ -452,10 +345,7 @@ class SYNC_API_MIXIN:
         :param messages: 消息列表
         :return: 合并转发私聊消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_private_forward_msg(user_id, messages))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_private_forward_msg, user_id, messages)
 
     # 群组接口
     def set_group_kick_sync(
@@ -470,12 +360,7 @@ class SYNC_API_MIXIN:
         :param reject_add_request: 是否群拉黑
         :return: 踢出群成员
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.set_group_kick(group_id, user_id, reject_add_request)
-        )
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_kick, group_id, user_id, reject_add_request)
 
     def set_group_ban_sync(
         self, group_id: Union[int, str], user_id: Union[int, str], duration: int
@@ -486,30 +371,21 @@ class SYNC_API_MIXIN:
         :param duration: 禁言时长,单位秒,0为取消禁言
         :return: 群组禁言
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_ban(group_id, user_id, duration))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_ban, group_id, user_id, duration)
 
     def get_group_system_msg_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群系统消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_system_msg(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_system_msg, group_id)
 
     def get_essence_msg_list_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取精华消息列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_essence_msg_list(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_essence_msg_list, group_id)
 
     def set_group_whole_ban_sync(self, group_id: Union[int, str], enable: bool):
         """
@@ -517,10 +393,7 @@ class SYNC_API_MIXIN:
         :param enable: 是否禁言
         :return: 群组全员禁言
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_whole_ban(group_id, enable))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_whole_ban, group_id, enable)
 
     def set_group_portrait_sync(self, group_id: Union[int, str], file: str):
         """
@@ -528,10 +401,7 @@ class SYNC_API_MIXIN:
         :param file: 文件路径,支持网络路径和本地路径
         :return: 设置群头像
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_portrait(group_id, file))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_portrait, group_id, file)
 
     def set_group_admin_sync(
         self, group_id: Union[int, str], user_id: Union[int, str], enable: bool
@@ -542,20 +412,14 @@ class SYNC_API_MIXIN:
         :param enable: 是否设置为管理
         :return: 设置群管理员
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_admin(group_id, user_id, enable))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_admin, group_id, user_id, enable)
 
     def set_essence_msg_sync(self, message_id: Union[int, str]):
         """
         :param message_id: 消息ID
         :return: 设置精华消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_essence_msg(message_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_essence_msg, message_id)
 
     def set_group_card_sync(
         self, group_id: Union[int, str], user_id: Union[int, str], card: str
@@ -566,20 +430,14 @@ class SYNC_API_MIXIN:
         :param card: 群名片,为空则为取消群名片
         :return: 设置群名片
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_card(group_id, user_id, card))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_card, group_id, user_id, card)
 
     def delete_essence_msg_sync(self, message_id: Union[int, str]):
         """
         :param message_id: 消息ID
         :return: 删除精华消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.delete_essence_msg(message_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.delete_essence_msg, message_id)
 
     def set_group_name_sync(self, group_id: Union[int, str], group_name: str):
         """
@@ -587,20 +445,14 @@ class SYNC_API_MIXIN:
         :param group_name: 群名
         :return: 设置群名
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_name(group_id, group_name))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_name, group_id, group_name)
 
     def set_group_leave_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 退出群组
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_leave(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_leave, group_id)
 
     def send_group_notice_sync(
         self, group_id: Union[int, str], content: str, image: str = None
@@ -611,20 +463,14 @@ class SYNC_API_MIXIN:
         :param image: 图片路径，可选
         :return: 发送群公告
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_group_notice(group_id, content, image))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_group_notice, group_id, content, image)
 
     def get_group_notice_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群公告
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_notice(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_notice, group_id)
 
     def set_group_special_title_sync(
         self, group_id: Union[int, str], user_id: Union[int, str], special_title: str
@@ -635,12 +481,9 @@ class SYNC_API_MIXIN:
         :param special_title: 群头衔
         :return: 设置群头衔
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.set_group_special_title(group_id, user_id, special_title)
+        return run_func_sync(
+            self.set_group_special_title, group_id, user_id, special_title
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def upload_group_file_sync(
         self, group_id: Union[int, str], file: str, name: str, folder_id: str
@@ -652,10 +495,7 @@ class SYNC_API_MIXIN:
         :param folder_id: 文件夹ID
         :return: 上传群文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.upload_group_file(group_id, file, name, folder_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.upload_group_file, group_id, file, name, folder_id)
 
     def set_group_add_request_sync(self, flag: str, approve: bool, reason: str = None):
         """
@@ -664,30 +504,21 @@ class SYNC_API_MIXIN:
         :param reason: 拒绝理由
         :return: 处理加群请求
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_add_request(flag, approve, reason))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_add_request, flag, approve, reason)
 
     def get_group_info_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_info(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_info, group_id)
 
     def get_group_info_ex_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群信息(拓展)
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_info_ex(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_info_ex, group_id)
 
     def create_group_file_folder_sync(
         self, group_id: Union[int, str], folder_name: str
@@ -697,10 +528,7 @@ class SYNC_API_MIXIN:
         :param folder_name: 文件夹名
         :return: 创建群文件文件夹
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.create_group_file_folder(group_id, folder_name))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.create_group_file_folder, group_id, folder_name)
 
     def delete_group_file_sync(self, group_id: Union[int, str], file_id: str):
         """
@@ -708,10 +536,7 @@ class SYNC_API_MIXIN:
         :param file_id: 文件ID
         :return: 删除群文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.delete_group_file(group_id, file_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.delete_group_file, group_id, file_id)
 
     def delete_group_folder_sync(self, group_id: Union[int, str], folder_id: str):
         """
@@ -719,30 +544,21 @@ class SYNC_API_MIXIN:
         :param folder_id: 文件夹ID
         :return: 删除群文件文件夹
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.delete_group_folder(group_id, folder_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.delete_group_folder, group_id, folder_id)
 
     def get_group_file_system_info_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群文件系统信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_file_system_info(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_file_system_info, group_id)
 
     def get_group_root_files_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群根目录文件列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_root_files(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_root_files, group_id)
 
     def get_group_files_by_folder_sync(
         self, group_id: Union[int, str], folder_id: str, file_count: int
@@ -753,12 +569,9 @@ class SYNC_API_MIXIN:
         :param file_count: 文件数量
         :return: 获取群文件列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.get_group_files_by_folder(group_id, folder_id, file_count)
+        return run_func_sync(
+            self.get_group_files_by_folder, group_id, folder_id, file_count
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def get_group_file_url_sync(self, group_id: Union[int, str], file_id: str):
         """
@@ -766,20 +579,14 @@ class SYNC_API_MIXIN:
         :param file_id: 文件ID
         :return: 获取群文件URL
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_file_url(group_id, file_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_file_url, group_id, file_id)
 
     def get_group_list_sync(self, no_cache: bool = False):
         """
         :param no_cache: 不缓存，默认为false
         :return: 获取群列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_list(no_cache))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_list, no_cache)
 
     def get_group_member_info_sync(
         self, group_id: Union[int, str], user_id: Union[int, str], no_cache: bool
@@ -790,10 +597,7 @@ class SYNC_API_MIXIN:
         :param no_cache: 不缓存
         :return: 获取群成员信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_member_info(group_id, user_id, no_cache))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_member_info, group_id, user_id, no_cache)
 
     def get_group_member_list_sync(
         self, group_id: Union[int, str], no_cache: bool = False
@@ -803,60 +607,42 @@ class SYNC_API_MIXIN:
         :param no_cache: 不缓存
         :return: 获取群成员列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_member_list(group_id, no_cache))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_member_list, group_id, no_cache)
 
     def get_group_honor_info_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群荣誉信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_honor_info(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_honor_info, group_id)
 
     def get_group_at_all_remain_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群 @全体成员 剩余次数
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_at_all_remain(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_at_all_remain, group_id)
 
     def get_group_ignored_notifies_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群过滤系统消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_ignored_notifies(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_ignored_notifies, group_id)
 
     def set_group_sign_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 群打卡
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_group_sign(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_group_sign, group_id)
 
     def send_group_sign_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 群打卡
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_group_sign(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_group_sign, group_id)
 
     def get_ai_characters_sync(
         self, group_id: Union[int, str], chat_type: Union[int, str]
@@ -866,10 +652,7 @@ class SYNC_API_MIXIN:
         :param chat_type: 聊天类型
         :return: 获取AI语音人物
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_ai_characters(group_id, chat_type))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_ai_characters, group_id, chat_type)
 
     def send_group_ai_record_sync(
         self, group_id: Union[int, str], character: str, text: str
@@ -880,10 +663,7 @@ class SYNC_API_MIXIN:
         :param text: 文本
         :return: 发送群AI语音
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_group_ai_record(group_id, character, text))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_group_ai_record, group_id, character, text)
 
     def get_ai_record_sync(self, group_id: Union[int, str], character: str, text: str):
         """
@@ -892,10 +672,7 @@ class SYNC_API_MIXIN:
         :param text: 文本
         :return: 获取AI语音
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_ai_record(group_id, character, text))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_ai_record, group_id, character, text)
 
     def forward_group_single_msg_sync(self, message_id: str, group_id: Union[int, str]):
         """
@@ -903,10 +680,7 @@ class SYNC_API_MIXIN:
         :param group_id: 群号
         :return: 转发群聊消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.forward_group_single_msg(message_id, group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.forward_group_single_msg, message_id, group_id)
 
     def send_group_forward_msg_sync(
         self, group_id: Union[int, str], messages: list[str]
@@ -916,68 +690,47 @@ class SYNC_API_MIXIN:
         :param messages: 消息列表
         :return: 合并转发的群聊消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.send_group_forward_msg(group_id, messages))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.send_group_forward_msg, group_id, messages)
 
     # 系统接口
     def get_client_key_sync(self):
         """
         :return: 获取client_key
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_client_key())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_client_key)
 
     def get_robot_uin_range_sync(self):
         """
         :return: 获取机器人QQ号范围
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_robot_uin_range())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_robot_uin_range)
 
     def ocr_image_sync(self, image: str):
         """
         :param image: 图片路径，支持本地路径和网络路径
         :return: OCR 图片识别
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.ocr_image(image))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.ocr_image, image)
 
     def ocr_image_new_sync(self, image: str):
         """
         :param image: 图片路径，支持本地路径和网络路径
         :return: OCR 图片识别
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.ocr_image_new(image))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.ocr_image_new, image)
 
     def translate_en2zh_sync(self, words: list):
         """
         :param words: 待翻译的单词列表
         :return: 英文翻译为中文
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.translate_en2zh(words))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.translate_en2zh, words)
 
     def get_login_info_sync(self):
         """
         :return: 获取登录号信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_login_info())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_login_info)
 
     def set_input_status_sync(self, event_type: int, user_id: Union[int, str]):
         """
@@ -985,10 +738,7 @@ class SYNC_API_MIXIN:
         :param user_id: QQ号
         :return: 设置输入状态
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.set_input_status(event_type, user_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.set_input_status, event_type, user_id)
 
     def download_file_sync(
         self,
@@ -1006,22 +756,16 @@ class SYNC_API_MIXIN:
         :param name: 文件名
         :return: 下载文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.download_file(thread_count, headers, base64, url, name)
+        return run_func_sync(
+            self.download_file, thread_count, headers, base64, url, name
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def get_cookies_sync(self, domain: str):
         """
         :param domain: 域名
         :return: 获取cookies
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_cookies(domain))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_cookies, domain)
 
     def handle_quick_operation_sync(self, context: dict, operation: dict):
         """
@@ -1029,19 +773,13 @@ class SYNC_API_MIXIN:
         :param operation: 快速操作对象
         :return: 对事件执行快速操作
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.handle_quick_operation(context, operation))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.handle_quick_operation, context, operation)
 
     def get_csrf_token_sync(self):
         """
         :return: 获取 CSRF Token
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_csrf_token())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_csrf_token)
 
     def del_group_notice_sync(self, group_id: Union[int, str], notice_id: str):
         """
@@ -1049,94 +787,64 @@ class SYNC_API_MIXIN:
         :param notice_id: 通知ID
         :return: 删除群公告
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.del_group_notice(group_id, notice_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.del_group_notice, group_id, notice_id)
 
     def get_credentials_sync(self, domain: str):
         """
         :param domain: 域名
         :return: 获取 QQ 相关接口凭证
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_credentials(domain))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_credentials, domain)
 
     def get_model_show_sync(self, model: str):
         """
         :param model: 模型名
         :return: 获取模型显示
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_model_show(model))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_model_show, model)
 
     def can_send_image_sync(self):
         """
         :return: 检查是否可以发送图片
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.can_send_image())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.can_send_image)
 
     def nc_get_packet_status_sync(self):
         """
         :return: 获取packet状态
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.nc_get_packet_status())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.nc_get_packet_status)
 
     def can_send_record_sync(self):
         """
         :return: 检查是否可以发送语音
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.can_send_record())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.can_send_record)
 
     def get_status_sync(self):
         """
         :return: 获取状态
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_status())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_status)
 
     def nc_get_rkey_sync(self):
         """
         :return: 获取rkey
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.nc_get_rkey())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.nc_get_rkey)
 
     def get_version_info_sync(self):
         """
         :return: 获取版本信息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_version_info())
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_version_info)
 
     def get_group_shut_list_sync(self, group_id: Union[int, str]):
         """
         :param group_id: 群号
         :return: 获取群禁言列表
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(self.get_group_shut_list(group_id))
-        result = loop.run_until_complete(task)
-        return result
+        return run_func_sync(self.get_group_shut_list, group_id)
 
     # 消息发送接口
     def post_group_msg_sync(
@@ -1169,25 +877,21 @@ class SYNC_API_MIXIN:
         :param rtf: 富文本(消息链)
         :return: 发送群消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.post_group_msg(
-                group_id,
-                text,
-                face,
-                jsond,
-                markdown,
-                at,
-                reply,
-                music,
-                dice,
-                rps,
-                image,
-                rtf,
-            )
+        return run_func_sync(
+            self.post_group_msg,
+            group_id,
+            text,
+            face,
+            jsond,
+            markdown,
+            at,
+            reply,
+            music,
+            dice,
+            rps,
+            image,
+            rtf,
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def post_private_msg_sync(
         self,
@@ -1217,14 +921,20 @@ class SYNC_API_MIXIN:
         :param rtf: 富文本(消息链)
         :return: 发送私聊消息
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.post_private_msg(
-                user_id, text, face, json, markdown, reply, music, dice, rps, image, rtf
-            )
+        return run_func_sync(
+            self.post_private_msg,
+            user_id,
+            text,
+            face,
+            json,
+            markdown,
+            reply,
+            music,
+            dice,
+            rps,
+            image,
+            rtf,
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def post_group_file_sync(
         self,
@@ -1244,12 +954,9 @@ class SYNC_API_MIXIN:
         :param markdown: Markdown
         :return: 发送群文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.post_group_file(group_id, image, record, video, file, markdown)
+        return run_func_sync(
+            self.post_group_file, group_id, image, record, video, file, markdown
         )
-        result = loop.run_until_complete(task)
-        return result
 
     def post_private_file_sync(
         self,
@@ -1269,12 +976,9 @@ class SYNC_API_MIXIN:
         :param markdown: Markdown
         :return: 发送私聊文件
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.post_private_file(user_id, image, record, video, file, markdown)
+        return run_func_sync(
+            self.post_private_file, user_id, image, record, video, file, markdown
         )
-        result = loop.run_until_complete(task)
-        return result
 
     # ncatbot扩展接口
     def send_qqmail_text_sync(
@@ -1293,9 +997,6 @@ class SYNC_API_MIXIN:
         :param content: 邮件内容
         :return: 发送结果
         """
-        loop = asyncio.new_event_loop()
-        task = loop.create_task(
-            self.send_qqmail_text(receiver, token, subject, content, sender)
+        return run_func_sync(
+            self.send_qqmail_text, receiver, token, subject, content, sender
         )
-        result = loop.run_until_complete(task)
-        return result
@@ -5,6 +5,7 @@ from threading import Lock, Thread
 
 from ncatbot.adapter import Websocket, check_websocket, launch_napcat_service
 from ncatbot.core.api import BotAPI
+from ncatbot.core.dispatcher import LaneDispatcher
 from ncatbot.core.message import GroupMessage, PrivateMessage
 from ncatbot.core.request import Request
 from ncatbot.utils import (
@@ -19,6 +20,7 @@ from ncatbot.utils import (
     get_log,
     run_func_async,
 )
+from ncatbot.utils.function_enhance import sync_executor
 
 _log = get_log()
 
@@ -54,6 +56,7 @@ class BotClient:
 
         self.plugin_sys: PluginLoader = None
         self.event_bus: EventBus = None
+        self.dispatcher: LaneDispatcher = None
 
     def group_event(self, types=None):
         self._subscribe_group_message_types = types
@@ -150,6 +153,8 @@ class BotClient:
             _log.error(traceback.format_exc())
         _log.info("插件卸载中...")
         self.plugin_sys.unload_all()
+        _log.info("等待同步处理函数结束...")
+        sync_executor.shutdown(wait=True)
         _log.info("清理回调函数...")
         self._group_event_handlers.clear()
         self._private_event_handlers.clear()
@@ -160,6 +165,16 @@ class BotClient:
         self._heartbeat_event_handlers.clear()
         _log.info("清理工作结束, NcatBot 已经正常退出")
 
+    async def dispatch_event(self, message: dict, handler, *args):
+        """
+        把事件交给对应会话的车道处理, 同一群聊或私聊内的事件按到达顺序串行执行
+
+        未启用分道调度 (``config.event_max_lanes`` 为 0) 时直接执行
+        """
+        if self.dispatcher is None:
+            return await handler(*args)
+        await self.dispatcher.submit(self.dispatcher.lane_key(message), handler, *args)
+
     async def handle_group_event(self, msg: dict):
         msg: GroupMessage = GroupMessage(msg)
         _log.debug(msg)
@@ -259,12 +274,31 @@ class BotClient:
                 await asyncio.sleep(1)
                 await self.handle_heartbeat_event()
 
+        async def access_flush_heartbeat():
+            from ncatbot.plugin.event.access_controller import (
+                get_global_access_controller,
+            )
+
+            while True:
+                await asyncio.sleep(config.access_flush_interval)
+                await get_global_access_controller().flush_access_async()
+
         info_subscribe_message_types()
+        if config.event_max_lanes > 0:
+            self.dispatcher = LaneDispatcher(
+                config.event_max_lanes, config.event_lane_max_pending
+            )
         websocket_server = Websocket(self)
         if not config.skip_plugin_load:
             await self.plugin_sys.load_plugins(api=self.api)
         else:
             _log.warning("插件加载被跳过")
+        if config.access_flush_interval > 0:
+            asyncio.create_task(access_flush_heartbeat())
+        if config.metrics_port:
+            from ncatbot.utils.metrics import start_metrics_server
+
+            await start_metrics_server(config.metrics_host, config.metrics_port)
         while True:
             try:
                 asyncio.create_task(time_schedule_heartbeat())
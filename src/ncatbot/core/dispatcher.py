@@ -0,0 +1,110 @@
+# 按会话分道的事件调度器
+import asyncio
+import traceback
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from ncatbot.utils import get_log
+
+_log = get_log()
+
+
+class LaneDispatcher:
+    """
+    按会话分道的事件调度器。
+
+    同一会话 (群号或 QQ 号) 的事件进入同一条车道, 按到达顺序逐个处理;
+    不同车道之间并发执行, 同时运行的车道数不超过 ``max_lanes``, 其余车道排队等待。
+    每处理完一个事件, 若有车道在等待, 当前车道会让出位置, 保证热门会话不会饿死其他会话。
+    """
+
+    def __init__(self, max_lanes: int = 64, max_pending: int = 1024):
+        self.max_lanes = max(1, max_lanes)
+        self.max_pending = max(1, max_pending)
+        self._lanes: Dict[Hashable, Deque[Tuple[Callable, tuple]]] = {}
+        self._waiting: Deque[Hashable] = deque()  # 等待运行位置的车道
+        self._active = 0
+        self._running = 0  # 正在执行的事件数
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = (
+            set()
+        )  # 保留运行中车道任务的引用, 避免被垃圾回收
+
+    @staticmethod
+    def lane_key(message: dict) -> Hashable:
+        """事件所属的车道, 群事件按群号, 其余按 QQ 号"""
+        if message.get("group_id"):
+            return ("group", message["group_id"])
+        if message.get("user_id"):
+            return ("user", message["user_id"])
+        return (message.get("post_type"), None)
+
+    def get_stats(self) -> dict:
+        return {
+            "lanes": len(self._lanes),
+            "active_lanes": self._active,
+            "running": self._running,
+            "waiting_lanes": len(self._waiting),
+            "pending": sum(len(lane) for lane in self._lanes.values()),
+        }
+
+    async def submit(
+        self, key: Hashable, handler: Callable[..., Awaitable[Any]], *args
+    ):
+        """
+        提交一个事件到对应车道, 在事件入道后立即返回。
+
+        积压事件总数达到 ``max_pending`` 时等待, 把压力传回上游。
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        await self._slots.acquire()
+        lane = self._lanes.get(key)
+        if lane is not None:
+            # 车道正在运行或等待运行, 追加即可
+            lane.append((handler, args))
+            return
+        self._lanes[key] = deque([(handler, args)])
+        if self._active < self.max_lanes:
+            self._start(key)
+        else:
+            self._waiting.append(key)
+
+    def _start(self, key: Hashable):
+        self._active += 1
+        task = asyncio.create_task(self._run_lane(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_lane(self, key: Hashable):
+        lane = self._lanes[key]
+        yielded = False
+        try:
+            while lane:
+                handler, args = lane.popleft()
+                self._running += 1
+                try:
+                    await handler(*args)
+                except Exception as e:
+                    _log.error(f"处理车道 {key} 的事件时出错: {e}")
+                    _log.debug(traceback.format_exc())
+                finally:
+                    self._running -= 1
+                    self._slots.release()
+                if lane and self._waiting:
+                    # 让出运行位置, 排到等待队列末尾
+                    self._waiting.append(key)
+                    yielded = True
+                    return
+        finally:
+            if not yielded:
+                # 处理完毕或被取消时移除车道, 被取消时丢弃剩余事件并归还积压名额
+                del self._lanes[key]
+                if lane:
+                    _log.warning(f"车道 {key} 被中断, 丢弃 {len(lane)} 个未处理的事件")
+                    for _ in range(len(lane)):
+                        self._slots.release()
+                    lane.clear()
+            self._active -= 1
+            if self._waiting:
+                self._start(self._waiting.popleft())
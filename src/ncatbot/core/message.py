@@ -2,6 +2,7 @@ import asyncio
 from typing import Any
 
 from ncatbot.core.api import BotAPI
+from ncatbot.utils import run_func_sync
 
 
 class BaseMessage:
@@ -45,12 +46,10 @@ class BaseMessage:
         """同步回复, 文字信息特化"""
         # 检查是否有正在运行的事件循环
         try:
-            loop = asyncio.get_running_loop()
+            asyncio.get_running_loop()
         except RuntimeError:
-            # 如果没有运行的事件循环，创建一个新的事件循环并运行协程
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.reply(text=text, **kwargs))
+            # 如果没有运行的事件循环，交给后台事件循环执行并等待完成
+            run_func_sync(self.reply, text=text, **kwargs)
         else:
             # 如果有运行的事件循环，直接创建任务
             asyncio.create_task(self.reply(text=text, **kwargs))
@@ -61,11 +60,9 @@ class BaseMessage:
             kwargs["rtf"] = is_file
             is_file = False
         try:
-            loop = asyncio.get_running_loop()
+            asyncio.get_running_loop()
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.reply(is_file=is_file, **kwargs))
+            run_func_sync(self.reply, is_file=is_file, **kwargs)
         else:
             asyncio.create_task(self.reply(is_file=is_file, **kwargs))
 
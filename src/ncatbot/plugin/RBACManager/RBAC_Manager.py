@@ -6,21 +6,60 @@
 # @Description  : 喵喵喵, 我还没想好怎么介绍文件喵
 # @Copyright (c) 2025 by Fish-LP, Fcatbot使用许可协议
 # -------------------------
-from functools import lru_cache
-from typing import Dict, Literal, Set
+from collections import OrderedDict, namedtuple
+from typing import Dict, Literal, Optional, Set, Tuple
 
+from ncatbot.plugin.RBACManager.permission_matcher import PermissionMatcher
 from ncatbot.plugin.RBACManager.permission_path import PermissionPath
 from ncatbot.plugin.RBACManager.permission_trie import Trie
 
 
+class _UserDecisions:
+    """单个用户的编译后权限集合与判定结果缓存"""
+
+    __slots__ = ("permissions", "black", "white", "decisions")
+
+    def __init__(self, permissions: Dict[str, Set[str]], format_path):
+        self.permissions = permissions
+        self.black = PermissionMatcher(permissions["black"], format_path)
+        self.white = PermissionMatcher(permissions["white"], format_path)
+        self.decisions: Dict[Tuple[str, bool], bool] = {}
+
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
 class RBACManager:
-    def __init__(self, case_sensitive: bool = True, default_role: str = None):
+    def __init__(
+        self,
+        case_sensitive: bool = True,
+        default_role: str = None,
+        decision_cache_size: int = 4096,
+        permission_cache_size: int = 4096,
+    ):
         self.case_sensitive = case_sensitive
         self.roles: Dict = {}
         self.users: Dict = {}
         self.permissions_trie: Trie = Trie(self.case_sensitive)
         self.default_role = default_role
         self.role_inheritance = {}  # 存储角色继承关系 {role: [inherited_roles]}
+        # 权限判定缓存 {user_name: _UserDecisions}, 按最近使用淘汰
+        self.decision_cache_size = decision_cache_size
+        self._decision_cache: "OrderedDict[str, _UserDecisions]" = OrderedDict()
+        # 用户最终权限集合缓存 {user_name: {"white": set, "black": set}}, 按最近使用淘汰
+        self.permission_cache_size = permission_cache_size
+        self._permission_cache: "OrderedDict[str, Dict[str, Set[str]]]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._role_users: Dict[str, Set[str]] = {}  # 角色 -> 直接拥有该角色的用户
+        # 自上次 pop_changes 以来变化过的数据, 供增量持久化使用
+        self._changed_users: Set[str] = set()
+        self._changed_roles: Set[str] = set()
+        self._trie_changed = False
+        self._all_changed = False
 
     def __str__(self):
         return self.permissions_trie.__str__()
@@ -30,23 +69,130 @@ class RBACManager:
         刷新权限缓存（当权限数据变化时调用）
         策略: 清除相关用户或角色的缓存计算结果
         """
+        self._mark_changed(user_name, role_name)
         if user_name:  # 清除指定用户的缓存
-            self._get_user_permissions.cache_clear()
-        elif role_name:  # 清除所有关联该角色的用户的缓存
-            for user in self.users.values():
-                if role_name in user["role_list"]:
-                    self._get_user_permissions.cache_clear()
-                    break
+            self._forget_user(user_name)
+        elif role_name:  # 清除所有关联该角色 (含继承该角色) 的用户的缓存
+            for role in self._roles_inheriting(role_name):
+                for user in self._role_users.get(role, ()):
+                    self._forget_user(user)
+            self._forget_user(None)  # 虚拟的默认用户
         else:  # 全局刷新
-            self._get_user_permissions.cache_clear()
+            self._permission_cache.clear()
+            self._decision_cache.clear()
+
+    def _mark_changed(self, user_name: str = None, role_name: str = None):
+        # 数据变化时都会调用 refresh_cache, 在这里顺带记录变化
+        if user_name:
+            self._changed_users.add(user_name)
+        if role_name:
+            self._changed_roles.add(role_name)
+        if not user_name and not role_name:
+            self._all_changed = True
+
+    def pop_changes(self) -> Optional[dict]:
+        """
+        取出自上次调用以来变化过的记录, 没有变化时返回 None
+
+        返回结构: {"all": 是否需要整体保存, "users": {用户名: 用户数据或 None},
+        "roles": {角色名: 角色数据 (含继承关系) 或 None}, "trie": 权限树或 None}
+        记录直接引用内部数据, 调用方需要在修改发生前完成序列化
+        """
+        if not (
+            self._all_changed
+            or self._changed_users
+            or self._changed_roles
+            or self._trie_changed
+        ):
+            return None
+        changes = {
+            "all": self._all_changed,
+            "users": {name: self.users.get(name) for name in self._changed_users},
+            "roles": {
+                name: (
+                    dict(
+                        self.roles[name],
+                        inherits=self.role_inheritance.get(name),
+                    )
+                    if name in self.roles
+                    else None
+                )
+                for name in self._changed_roles
+            },
+            "trie": self.permissions_trie.trie if self._trie_changed else None,
+        }
+        self._changed_users = set()
+        self._changed_roles = set()
+        self._trie_changed = False
+        self._all_changed = False
+        return changes
+
+    def _forget_user(self, user_name: str):
+        self._permission_cache.pop(user_name, None)
+        self._decision_cache.pop(user_name, None)
+
+    def cache_info(self) -> CacheInfo:
+        """用户权限集合缓存的命中统计"""
+        return CacheInfo(
+            self._cache_hits,
+            self._cache_misses,
+            self._cache_evictions,
+            self.permission_cache_size,
+            len(self._permission_cache),
+        )
+
+    def _index_user_roles(self, user_name: str, role_names, add: bool = True):
+        """维护 角色 -> 用户 反向索引"""
+        for role_name in role_names:
+            if add:
+                self._role_users.setdefault(role_name, set()).add(user_name)
+            else:
+                users = self._role_users.get(role_name)
+                if users is not None:
+                    users.discard(user_name)
+                    if not users:
+                        del self._role_users[role_name]
+
+    def _roles_inheriting(self, role_name: str) -> Set[str]:
+        """该角色以及直接或间接继承了它的所有角色"""
+        result = {role_name}
+        changed = True
+        while changed:
+            changed = False
+            for role, inherited_roles in self.role_inheritance.items():
+                if role not in result and not result.isdisjoint(inherited_roles):
+                    result.add(role)
+                    changed = True
+        return result
 
-    @lru_cache(maxsize=128)
     def _get_user_permissions(self, user_name: str) -> Dict[str, Set[str]]:
         """
         获取用户的最终权限集合（带缓存）,并自动清理无效权限
         返回结构: {"white": {所有白名单权限路径}, "black": {所有黑名单权限路径}}
         """
-        user = self.users[user_name]
+        permissions = self._permission_cache.get(user_name)
+        if permissions is not None:
+            self._cache_hits += 1
+            self._permission_cache.move_to_end(user_name)
+            return permissions
+        self._cache_misses += 1
+        permissions = self._compute_user_permissions(user_name)
+        self._permission_cache[user_name] = permissions
+        if len(self._permission_cache) > self.permission_cache_size:
+            self._permission_cache.popitem(last=False)
+            self._cache_evictions += 1
+        return permissions
+
+    def _compute_user_permissions(self, user_name: str) -> Dict[str, Set[str]]:
+        if user_name is None:
+            # 虚拟的默认用户: 只拥有默认角色, 没有单独配置的权限
+            user = {
+                "white_permissions_list": [],
+                "black_permissions_list": [],
+                "role_list": [self.default_role] if self.default_role else [],
+            }
+        else:
+            user = self.users[user_name]
         white = set()
         black = set()
 
@@ -121,8 +267,33 @@ class RBACManager:
         """
         if not self.check_availability(user_name=user_name):
             raise ValueError(f"用户 {user_name} 不存在")
+        return self._check_cached(user_name, path, strict)
+
+    def check_default_permission(self, path: str, strict: bool = False) -> bool:
+        """检查只拥有默认角色 (没有单独记录) 的用户是否拥有某路径的权限"""
+        return self._check_cached(None, path, strict)
+
+    def _check_cached(self, user_name: Optional[str], path: str, strict: bool) -> bool:
+        entry = self._decision_cache.get(user_name)
+        if entry is not None:
+            self._decision_cache.move_to_end(user_name)
+            result = entry.decisions.get((path, strict))
+            if result is not None:
+                return result
 
         permissions = self._get_user_permissions(user_name)
+        if entry is None or entry.permissions is not permissions:
+            entry = _UserDecisions(permissions, self.permissions_trie.format_path)
+            self._decision_cache[user_name] = entry
+            if len(self._decision_cache) > self.decision_cache_size:
+                self._decision_cache.popitem(last=False)
+
+        result = self._decide(entry, path, strict)
+        entry.decisions[(path, strict)] = result
+        return result
+
+    def _decide(self, entry: _UserDecisions, path: str, strict: bool) -> bool:
+        permissions = entry.permissions
         formatted_path = self.permissions_trie.format_path(path)
 
         # 快速路径: 精确匹配黑名单
@@ -137,13 +308,11 @@ class RBACManager:
             return False
 
         # 通配符匹配
-        for black_path in permissions["black"]:
-            if self._is_path_covered(black_path, formatted_path):
-                return False
+        if entry.black.match(formatted_path):
+            return False
 
-        for white_path in permissions["white"]:
-            if self._is_path_covered(white_path, formatted_path):
-                return True
+        if entry.white.match(formatted_path):
+            return True
 
         return False
 
@@ -165,8 +334,7 @@ class RBACManager:
         if role_name:
             result.append(role_name in self.roles)
         if permissions_path:
-            if not self.case_sensitive:
-                permissions_path = permissions_path.lower()
+            # 大小写由 format_path 处理, 原样传入以命中查询缓存
             result.append(
                 self.permissions_trie.check_path(permissions_path, complete=True)
             )
@@ -176,6 +344,9 @@ class RBACManager:
         """添加权限路径到 Trie 树"""
         if not self.check_availability(permissions_path=permissions_path):
             self.permissions_trie.add_path(permissions_path)
+            self._trie_changed = True
+            # 新路径可能使已有的叶子路径失效, 已缓存的判定需要重新计算
+            self._decision_cache.clear()
 
     def del_permissions(self, permissions_path: str):
         self.permissions_trie.del_path(permissions_path)
@@ -194,11 +365,16 @@ class RBACManager:
         if not force and self.check_availability(user_name=user_name):
             raise IndexError(f"用户 {user_name} 已经存在")
         self.refresh_cache(user_name=user_name)
+        if user_name in self.users:
+            self._index_user_roles(
+                user_name, self.users[user_name]["role_list"], add=False
+            )
         self.users[user_name] = {
             "white_permissions_list": [],
             "black_permissions_list": [],
             "role_list": [self.default_role] if self.default_role else [],
         }
+        self._index_user_roles(user_name, self.users[user_name]["role_list"])
 
     def del_role(self, role_name: str):
         """删除角色时同时清理继承关系"""
@@ -214,6 +390,7 @@ class RBACManager:
 
     def del_user(self, user_name: str):
         self.refresh_cache(user_name=user_name)
+        self._index_user_roles(user_name, self.users[user_name]["role_list"], add=False)
         del self.users[user_name]
 
     def assign_permissions_to_role(
@@ -252,6 +429,7 @@ class RBACManager:
         self.refresh_cache(role_name=role_name, user_name=user_name)
         if role_name not in self.users[user_name]["role_list"]:
             self.users[user_name]["role_list"].append(role_name)
+            self._index_user_roles(user_name, [role_name])
 
     def unassign_permissions_to_role(
         self, role_name: str, permissions_path: str, mode: Literal["white", "black"]
@@ -275,6 +453,8 @@ class RBACManager:
             raise IndexError(f"角色 {role_name} 或用户 {user_name} 不存在")
         self.refresh_cache(role_name=role_name, user_name=user_name)
         self.users[user_name]["role_list"].remove(role_name)
+        if role_name not in self.users[user_name]["role_list"]:
+            self._index_user_roles(user_name, [role_name], add=False)
 
     def _check_circular_inheritance(
         self, role: str, inherited_role: str, visited: set = None
@@ -402,6 +582,11 @@ class RBACManager:
                 ],
             }
 
+        # 重建 角色 -> 用户 反向索引
+        instance._role_users = {}
+        for user_name, user_data in instance.users.items():
+            instance._index_user_roles(user_name, user_data["role_list"])
+
         # 强制刷新所有缓存
         instance.refresh_cache()
         return instance
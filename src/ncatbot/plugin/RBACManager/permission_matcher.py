@@ -0,0 +1,72 @@
+from typing import Callable, Iterable, List
+
+from ncatbot.plugin.RBACManager.permission_path import PermissionPath
+
+
+class PermissionMatcher:
+    """
+    把一组权限模式编译成通配符前缀树, 判断目标路径是否被其中任一模式覆盖。
+
+    结果与逐个调用 ``PermissionPath.matching_path`` 一致, 但只需沿目标路径走一遍,
+    耗时与路径深度相关而与模式数量无关。
+
+    - ``*`` 匹配任意单个节点, ``**`` 匹配其后的全部节点
+    - 目标路径比模式短时, 只要已有的节点都能对上即视为覆盖 (与 ``matching_path`` 相同)
+    - 含空节点或在节点中间使用 ``*`` 的模式, 以及本身带通配符的目标路径, 退回逐个匹配
+    """
+
+    def __init__(
+        self, patterns: Iterable[str], format_path: Callable[[str], PermissionPath]
+    ):
+        self._root: dict = {}
+        self._patterns: List[PermissionPath] = []  # 全部模式, 供退回逐个匹配时使用
+        self._slow: List[PermissionPath] = []  # 无法编译的模式
+        for pattern in patterns:
+            path = format_path(pattern)
+            self._patterns.append(path)
+            if self._compilable(path):
+                self._insert(path)
+            else:
+                self._slow.append(path)
+
+    @staticmethod
+    def _compilable(path: PermissionPath) -> bool:
+        return all(node and ("*" not in node or node in ("*", "**")) for node in path)
+
+    @staticmethod
+    def _plain_target(path: PermissionPath) -> bool:
+        return "*" not in path.row_path and all(path)
+
+    def _insert(self, path: PermissionPath):
+        node = self._root
+        for part in path:
+            node = node.setdefault(part, {})
+            if part == "**":
+                # ** 之后的节点不会参与匹配
+                return
+
+    def _match_compiled(self, target: PermissionPath) -> bool:
+        nodes = [self._root]
+        for part in target:
+            next_nodes = []
+            for node in nodes:
+                if "**" in node:
+                    return True
+                child = node.get(part)
+                if child is not None:
+                    next_nodes.append(child)
+                child = node.get("*")
+                if child is not None:
+                    next_nodes.append(child)
+            if not next_nodes:
+                return False
+            nodes = next_nodes
+        return True
+
+    def match(self, target: PermissionPath) -> bool:
+        """目标路径是否被任一模式覆盖"""
+        if not self._plain_target(target):
+            return any(p.matching_path(target.row_path) for p in self._patterns)
+        if self._match_compiled(target):
+            return True
+        return any(p.matching_path(target.row_path) for p in self._slow)
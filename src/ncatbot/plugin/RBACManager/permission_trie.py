@@ -6,23 +6,105 @@
 # @Description  : 喵喵喵, 我还没想好怎么介绍文件喵
 # @Copyright (c) 2025 by Fish-LP, Fcatbot使用许可协议
 # -------------------------
+from typing import Dict, List, Tuple
+
 from ncatbot.plugin.RBACManager.permission_path import PermissionPath
 from ncatbot.utils import Color, visualize_tree
 
+PATH_CACHE_MAX_SIZE = 4096  # 缓存的路径解析结果数, 超出后整体清空
+CHECK_CACHE_MAX_SIZE = 4096  # 缓存的 check_path 结果数, 超出后整体清空
+
+
+class _CompiledTrie:
+    """
+    Trie 的只读编译形式: 节点按编号存放在列表中, 路径节点名映射为整数编号
+
+    - ``children[i]``: 节点 i 的 {节点名编号: 子节点编号}
+    - ``child_nodes[i]``: 节点 i 的全部子节点编号, 供 ``*`` 遍历
+    """
+
+    __slots__ = ("segment_ids", "children", "child_nodes")
+
+    def __init__(self, trie: dict):
+        self.segment_ids: Dict[str, int] = {}
+        self.children: List[Dict[int, int]] = [{}]
+        stack = [(trie, 0)]
+        while stack:
+            node, index = stack.pop()
+            mapping = self.children[index]
+            for key, child in node.items():
+                segment = self.segment_ids.setdefault(key, len(self.segment_ids))
+                mapping[segment] = len(self.children)
+                stack.append((child, len(self.children)))
+                self.children.append({})
+        self.child_nodes: List[Tuple[int, ...]] = [
+            tuple(mapping.values()) for mapping in self.children
+        ]
+
+    def match(self, path: PermissionPath, complete: bool) -> bool:
+        children, child_nodes = self.children, self.child_nodes
+        frontier = [0]
+        last = len(path) - 1
+        for i, part in enumerate(path):
+            if part == "**":
+                # 当 complete 为 True 时,** 必须是路径的最后一个节点
+                return not complete or i == last
+            if part == "*":
+                frontier = [child for node in frontier for child in child_nodes[node]]
+            else:
+                segment = self.segment_ids.get(part)
+                if segment is None:
+                    return False
+                frontier = [
+                    children[node][segment]
+                    for node in frontier
+                    if segment in children[node]
+                ]
+            if not frontier:
+                return False
+        # complete 模式下必须停在叶子节点
+        return not complete or any(not child_nodes[node] for node in frontier)
+
 
 class Trie:
+    """
+    权限路径树。``trie`` 是可序列化的嵌套字典, 查询时使用按需编译的 ``_CompiledTrie``,
+    路径解析和查询结果都有缓存, 通过本类方法或给 ``trie`` 赋值修改时自动失效。
+    """
+
     def __init__(self, case_sensitive: bool = True):
-        self.trie = {}
+        self._trie = {}
         self.case_sensitive = case_sensitive  # 设置是否区分大小写
+        self._compiled: _CompiledTrie = None
+        self._path_cache: Dict[str, PermissionPath] = {}
+        self._check_cache: Dict[Tuple[str, bool], bool] = {}
+
+    @property
+    def trie(self) -> dict:
+        return self._trie
+
+    @trie.setter
+    def trie(self, value: dict):
+        self._trie = value
+        self._invalidate()
+
+    def _invalidate(self):
+        self._compiled = None
+        self._check_cache.clear()
 
     def __str__(self):
         return "\n".join([f"{Color.RED}*{Color.RESET}"] + visualize_tree(self.trie))
 
     def format_path(self, path: str) -> PermissionPath:
-        if self.case_sensitive:
-            return PermissionPath(path)
-        else:
-            return PermissionPath(path.lower())
+        if not isinstance(path, str):
+            return PermissionPath(path if self.case_sensitive else path.lower())
+        formatted = self._path_cache.get(path)
+        if formatted is None:
+            formatted = PermissionPath(path if self.case_sensitive else path.lower())
+            if len(self._path_cache) >= PATH_CACHE_MAX_SIZE:
+                self._path_cache.clear()
+            self._path_cache[path] = formatted
+        return formatted
 
     def add_path(self, path: str):
         path = self.format_path(path)
@@ -36,6 +118,7 @@ class Trie:
             else:
                 current_node[node] = {}  # 创建新节点
                 current_node = current_node[node]  # 移动到新节点
+                self._invalidate()
 
     def del_path(self, path, max_mod: bool = True):
         self.check_path(path, True)
@@ -117,34 +200,21 @@ class Trie:
 
         # 从根节点开始递归处理,初始父节点链为空
         helper(self.trie, formatted_path, [])
-
-    @classmethod
-    def _check_path_in_trie(
-        cls, trie: dict, path: PermissionPath, complete: bool = False
-    ):
-        current_node = trie
-
-        for i, node in enumerate(path):
-            if node == "**":
-                # 当 complete 为 True 时,** 必须是路径的最后一个节点
-                if complete and i != len(path) - 1:
-                    return False
-                return True
-            elif node == "*":
-                # 递归检查所有子节点,传递 complete 参数
-                return any(
-                    cls._check_path_in_trie(
-                        current_node[child], path[i + 1 :], complete
-                    )
-                    for child in current_node
-                )
-            elif node not in current_node:
-                return False
-            current_node = current_node[node]
-
-        # 检查是否到达路径尽头（如果是 complete 模式,当前节点必须无子节点）
-        return not complete or not current_node
+        self._invalidate()
 
     def check_path(self, path: str, complete: bool = False):
-        formatted_path = self.format_path(path)
-        return self._check_path_in_trie(self.trie, formatted_path, complete)
+        if not isinstance(path, str):
+            return self._match(self.format_path(path), complete)
+        key = (path, complete)
+        result = self._check_cache.get(key)
+        if result is None:
+            result = self._match(self.format_path(path), complete)
+            if len(self._check_cache) >= CHECK_CACHE_MAX_SIZE:
+                self._check_cache.clear()
+            self._check_cache[key] = result
+        return result
+
+    def _match(self, path: PermissionPath, complete: bool) -> bool:
+        if self._compiled is None:
+            self._compiled = _CompiledTrie(self.trie)
+        return self._compiled.match(path, complete)
@@ -9,7 +9,7 @@
 import asyncio
 import inspect
 from pathlib import Path
-from typing import final
+from typing import Union, final
 
 from ncatbot.core import BotAPI
 from ncatbot.plugin.base_plugin.builtin_function import BuiltinFuncMixin
@@ -21,6 +21,7 @@ from ncatbot.utils import (
     ChangeDir,
     Color,
     PluginLoadError,
+    SqliteKVStore,
     TimeTaskScheduler,
     UniversalLoader,
     get_log,
@@ -86,9 +87,10 @@ class BasePlugin(EventHandlerMixin, SchedulerMixin, BuiltinFuncMixin):
     - `this_file_path (Path)`: 插件主文件路径
     - `meta_data (dict)`: 插件元数据字典
     - `data (UniversalLoader)`: 插件数据管理器实例
-    - `save_type`(str): `data` 数据保存类型 (默认 'json')
+    - `save_type`(str): `data` 数据保存类型 (默认 'json'，'sqlite' 时使用按键读写的 `SqliteKVStore`)
     - `file_encoding`(str): `data` 文件编码（默认 'utf-8'）
     - `realtime_save`(bool): `data` 行为，实时保存（默认 False）
+    - `write_behind`(bool): `data` 行为，实时保存时合并修改并在后台写入（默认 False）
     - `realtime_load`(bool): `data` 行为，实时读取，需要`watchdog`（默认 False）
 
     ## 目录管理
@@ -120,6 +122,7 @@ class BasePlugin(EventHandlerMixin, SchedulerMixin, BuiltinFuncMixin):
     save_type: str = 'json'
     file_encoding: str = 'utf-8'
     realtime_save: bool = False
+    write_behind: bool = False
     realtime_load: bool = False
 
     self_path: Path
@@ -193,26 +196,41 @@ class BasePlugin(EventHandlerMixin, SchedulerMixin, BuiltinFuncMixin):
         if not self._work_path.is_dir():
             raise PluginLoadError(self.name, f"{self._work_path} 不是目录文件夹")
 
-        self._data = UniversalLoader(
-            file_path=self._data_path,
-            file_encoding=self.file_encoding,
-            file_type=self.save_type,
-            realtime_save=self.realtime_save,
-            realtime_load=self.realtime_load
-        )
-        self.data["config"] = {}
+        if self.save_type == "sqlite":
+            # 按键读写, 已保存的配置不能被覆盖
+            try:
+                self._data = SqliteKVStore(file_path=self._data_path)
+            except LoadError:
+                if self.debug:
+                    raise
+                backup = SqliteKVStore.move_aside(self._data_path)
+                LOG.warning(
+                    f"插件 {self.name} 的数据库无法读取, 已移动到 {backup} 并重新创建"
+                )
+                self._data = SqliteKVStore(file_path=self._data_path)
+            self.data.setdefault("config", {})
+        else:
+            self._data = UniversalLoader(
+                file_path=self._data_path,
+                file_encoding=self.file_encoding,
+                file_type=self.save_type,
+                realtime_save=self.realtime_save,
+                realtime_load=self.realtime_load,
+                write_behind=self.write_behind,
+            )
+            self.data["config"] = {}
         self.work_space = ChangeDir(self._work_path)
         self.self_space = ChangeDir(self.self_path)
 
     @property
-    def data(self) -> UniversalLoader:
+    def data(self) -> Union[UniversalLoader, SqliteKVStore]:
         return self._data
 
     @data.setter
-    def data_settrt(self, value: UniversalLoader):
+    def data_settrt(self, value: Union[UniversalLoader, SqliteKVStore]):
         """设置数据加载器"""
-        if not isinstance(value, UniversalLoader):
-            raise TypeError("data 必须是 UniversalLoader 实例")
+        if not isinstance(value, (UniversalLoader, SqliteKVStore)):
+            raise TypeError("data 必须是 UniversalLoader 或 SqliteKVStore 实例")
         self._data = value
 
     @property
@@ -248,6 +266,10 @@ class BasePlugin(EventHandlerMixin, SchedulerMixin, BuiltinFuncMixin):
                 self.data.save()
         except (FileTypeUnknownError, SaveError, FileNotFoundError) as e:
             raise RuntimeError(self.name, f"保存持久化数据时出错: {e}")
+        finally:
+            if isinstance(self.data, SqliteKVStore):
+                # 释放数据库连接, 否则每次重载都会多占用一个句柄 (Windows 上还会锁住文件)
+                self.data.close(save=False)
 
     @final
     async def __onload__(self):
@@ -266,6 +288,13 @@ class BasePlugin(EventHandlerMixin, SchedulerMixin, BuiltinFuncMixin):
         except (FileTypeUnknownError, LoadError, FileNotFoundError):
             if self.debug:
                 pass
+            elif isinstance(self.data, SqliteKVStore):
+                # 不能直接清空正在使用的数据库文件, 先关闭连接再移到一旁
+                backup = self.data.recover()
+                LOG.warning(
+                    f"插件 {self.name} 的数据库无法读取, 已移动到 {backup} 并重新创建"
+                )
+                self.data.setdefault("config", {})
             else:
                 open(self._data_path, "w", encoding=self.file_encoding).write("")
                 self.data.save()
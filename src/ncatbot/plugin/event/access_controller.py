@@ -1,12 +1,15 @@
 # 对插件系统封装的权限管理器
 
-import json
-import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 
+from ncatbot.plugin.event.access_store import create_access_store
 from ncatbot.plugin.event.event import EventSource
 from ncatbot.plugin.RBACManager import RBACManager
 from ncatbot.utils import PermissionGroup, config, get_log
+from ncatbot.utils.metrics import PERMISSION_CHECK_SECONDS, PERMISSION_CHECKS
 
 LOG = get_log("AccessController")
 global_access_controller = None
@@ -15,7 +18,12 @@ global_access_controller = None
 class BaseRBACManager(RBACManager):
     # 做好 USER 和 GROUP 的分组包装
     def __init__(self, case_sensitive=False, is_group: bool = False):
-        super().__init__(case_sensitive)
+        super().__init__(
+            case_sensitive,
+            default_role=PermissionGroup.USER.value,
+            decision_cache_size=config.access_decision_cache_size,
+            permission_cache_size=config.access_permission_cache_size,
+        )
         self.user_prefix = "user-" if not is_group else "group-"
         self.is_group = is_group
 
@@ -34,8 +42,26 @@ class BaseRBACManager(RBACManager):
         self.assign_role_to_user(base_role, user_name)
 
     def check_permission(self, user_name, path):
+        if config.access_lazy_principals and not self.user_exist(user_name):
+            return self.check_default_permission(path)
         return super().check_permission(self.user_prefix + user_name, path)
 
+    def is_default_user(self, full_name: str) -> bool:
+        """该记录是否只有默认角色, 没有任何单独配置"""
+        user = self.users[full_name]
+        return (
+            user["role_list"] == [self.default_role]
+            and not user["white_permissions_list"]
+            and not user["black_permissions_list"]
+        )
+
+    def prune_default_users(self) -> int:
+        """删除只有默认角色的记录, 返回删除的数量"""
+        names = [name for name in self.users if self.is_default_user(name)]
+        for name in names:
+            self.del_user(name)
+        return len(names)
+
     def assign_role_to_user(self, role_name, user_name):
         if not self.user_has_role(user_name, role_name):
             return super().assign_role_to_user(role_name, self.user_prefix + user_name)
@@ -57,6 +83,8 @@ class BaseRBACManager(RBACManager):
             pass  # 允许删除不存在的权限
 
     def user_has_role(self, user_name, role_name):
+        if config.access_lazy_principals and not self.user_exist(user_name):
+            return role_name == self.default_role
         return role_name in self.users[self.user_prefix + user_name]["role_list"]
 
 
@@ -109,11 +137,11 @@ class RoleManagerMixin:
         )
 
     def user_has_role(self, user_id, role_name):
-        self._create_user_if_not_exist(user_id, True)
+        self._create_user_if_not_exist(user_id, True, virtual=True)
         return self.ur.user_has_role(user_id, role_name)
 
     def group_has_role(self, group_id, role_name):
-        self._create_group_if_not_exist(group_id, True)
+        self._create_group_if_not_exist(group_id, True, virtual=True)
         return self.gr.user_has_role(group_id, role_name)
 
     def role_exist(self, role_name):
@@ -163,36 +191,96 @@ class PluginAccessController(RoleManagerMixin):
     def __init__(self):
         self.ur = BaseRBACManager()
         self.gr = BaseRBACManager(is_group=True)
+        self._store = create_access_store(
+            config.access_store_backend,
+            **(
+                {"compact_threshold": config.access_journal_compact_threshold}
+                if config.access_store_backend == "journal"
+                else {}
+            ),
+        )
+        # 所有写盘操作都交给这个线程按顺序执行
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ncatbot-access"
+        )
         self._load_access()
         self._create_basic_roles()
         self._create_root_user()
         pass
 
+    def _managers(self):
+        return {"U": self.ur, "G": self.gr}
+
     def _load_access(self):
         LOG.debug("加载权限")
         try:
-            if os.path.exists("data/U_access.json"):
-                with open("data/U_access.json", "r", encoding="utf-8") as f:
-                    self.ur.from_dict(json.JSONDecoder().decode(f.read()))
-            else:
-                LOG.warning("权限文件不存在, 将创建新的权限文件")
-            if os.path.exists("data/G_access.json"):
-                with open("data/G_access.json", "r", encoding="utf-8") as f:
-                    self.gr.from_dict(json.JSONDecoder().decode(f.read()))
-            else:
-                LOG.warning("权限文件不存在, 将创建新的权限文件")
+            managers = self._managers()
+            loaded = self._store.load(
+                {name: manager.to_dict() for name, manager in managers.items()}
+            )
+            for name, data in loaded.items():
+                if data is None:
+                    LOG.warning("权限文件不存在, 将创建新的权限文件")
+                else:
+                    managers[name].from_dict(data)
         except Exception as e:
             LOG.error(f"加载权限时出错: {e}")
+        for manager in self._managers().values():
+            manager.pop_changes()  # 刚加载的数据无需再次写入
+            if config.access_lazy_principals:
+                # 清理之前自动创建的记录, 删除会作为变化保存
+                manager.prune_default_users()
+
+    def _collect_access_changes(self):
+        """
+        序列化自上次保存以来的变化
+
+        :return: (日志行, 是否需要整体保存)
+        """
+        lines = []
+        need_snapshot = False
+        for name, manager in self._managers().items():
+            changes = manager.pop_changes()
+            if changes is None:
+                continue
+            if changes["all"] or not self._store.journaled:
+                need_snapshot = True
+            lines.extend(self._store.journal_lines(name, changes))
+        return lines, need_snapshot
+
+    def _snapshot_access(self):
+        return {
+            name: self._store.snapshot(manager.to_dict())
+            for name, manager in self._managers().items()
+        }
+
+    async def flush_access_async(self):
+        """把变化写入存储, 序列化在当前线程完成, 写盘在后台线程进行"""
+        lines, need_snapshot = self._collect_access_changes()
+        if not lines and not need_snapshot:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            need_snapshot = (
+                await loop.run_in_executor(self._writer, self._store.append, lines)
+                or need_snapshot
+            )
+            if need_snapshot:
+                await loop.run_in_executor(
+                    self._writer, self._store.save_snapshot, self._snapshot_access()
+                )
+        except Exception as e:
+            LOG.error(f"保存权限时出错: {e}")
 
     def _save_access(self):
+        """整体保存权限数据, 并压缩增量日志"""
         LOG.debug("保存权限")
         try:
-            if not os.path.exists("data"):
-                os.mkdir("data")
-            with open("data/U_access.json", "w", encoding="utf-8") as f:
-                f.write(json.JSONEncoder().encode(self.ur.to_dict()))
-            with open("data/G_access.json", "w", encoding="utf-8") as f:
-                f.write(json.JSONEncoder().encode(self.gr.to_dict()))
+            for manager in self._managers().values():
+                manager.pop_changes()  # 快照已包含全部变化
+            self._writer.submit(
+                self._store.save_snapshot, self._snapshot_access()
+            ).result()
         except Exception as e:
             LOG.error(f"保存权限时出错: {e}")
 
@@ -205,21 +293,33 @@ class PluginAccessController(RoleManagerMixin):
             PermissionGroup.ROOT.value, PermissionGroup.ROOT.value
         )
 
-    def _create_id_if_not_exist(self, id, is_group, create: bool = True):
+    def _create_id_if_not_exist(
+        self, id, is_group, create: bool = True, virtual: bool = False
+    ):
+        """
+        :param virtual: 只读取权限时为 True, 开启 access_lazy_principals 后
+            只有默认角色的用户/群组不会创建记录, 按默认角色计算权限
+        """
         manager = self.gr if is_group else self.ur
         if not manager.user_exist(id):
+            if create and virtual and config.access_lazy_principals:
+                return
             if create:
                 manager.create_user(id)
             else:
                 raise ValueError(f"{'群组' if is_group else '用户'} {id} 不存在")
 
-    def _create_user_if_not_exist(self, user_id, create: bool = True):
+    def _create_user_if_not_exist(
+        self, user_id, create: bool = True, virtual: bool = False
+    ):
         """如果用户不存在, 根据配置创建或者报错"""
-        self._create_id_if_not_exist(user_id, False, create)
+        self._create_id_if_not_exist(user_id, False, create, virtual)
 
-    def _create_group_if_not_exist(self, group_id, create: bool = True):
+    def _create_group_if_not_exist(
+        self, group_id, create: bool = True, virtual: bool = False
+    ):
         """如果群聊不存在, 根据配置创建或者报错"""
-        self._create_id_if_not_exist(group_id, True, create)
+        self._create_id_if_not_exist(group_id, True, create, virtual)
 
     def _create_permission_path_if_not_exist(self, path, create: bool = False):
         """如果权限路径不存在, 根据配置创建或者报错"""
@@ -392,11 +492,11 @@ class PluginAccessController(RoleManagerMixin):
         )
 
     def with_user_permission(self, path, user_id, create_user: bool = True):
-        self._create_user_if_not_exist(user_id, create_user)
+        self._create_user_if_not_exist(user_id, create_user, virtual=True)
         return self.ur.check_permission(user_id, path)
 
     def with_group_permission(self, path, group_id, create_user: bool = True):
-        self._create_group_if_not_exist(group_id, create_user)
+        self._create_group_if_not_exist(group_id, create_user, virtual=True)
         return self.gr.check_permission(group_id, path)
 
     def with_permission(
@@ -407,10 +507,14 @@ class PluginAccessController(RoleManagerMixin):
         create_user: bool = True,
     ):
         """检查消息来源是否拥有对应权限"""
+        started = time.perf_counter()
         group_id = source.group_id if not permission_raise else "root"
-        return self.with_user_permission(
+        allowed = self.with_user_permission(
             path, source.user_id, create_user=create_user
         ) and self.with_group_permission(path, group_id, create_user=create_user)
+        PERMISSION_CHECK_SECONDS.observe(time.perf_counter() - started)
+        PERMISSION_CHECKS.labels("allowed" if allowed else "denied").inc()
+        return allowed
 
     def user_exist(self, user_id):
         return self.ur.user_exist(user_id)
@@ -0,0 +1,192 @@
+# 权限数据的持久化后端
+import json
+import os
+from typing import Dict, List, Optional
+
+from ncatbot.utils import get_log
+from ncatbot.utils.file_io import atomic_write
+
+LOG = get_log("AccessStore")
+
+
+class JsonAccessStore:
+    """
+    整体快照存储: 每个管理器对应一个 JSON 文件 (如 ``data/U_access.json``)
+
+    不记录增量, 有任何变化时都需要整体写入快照。
+
+    序列化 (``snapshot``, ``journal_lines``) 在修改数据的线程中进行,
+    写盘 (``append``, ``save_snapshot``) 可以交给其他线程, 但必须按提交顺序执行。
+    """
+
+    journaled = False  # 是否支持增量记录
+
+    def __init__(self, directory: str = "data"):
+        self.directory = directory
+
+    def _snapshot_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}_access.json")
+
+    def _load_snapshot(self, name: str) -> Optional[dict]:
+        path = self._snapshot_path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.loads(f.read())
+
+    def load(self, bases: Dict[str, dict]) -> Dict[str, Optional[dict]]:
+        """
+        读取各管理器的数据, 不存在的为 None
+
+        :param bases: {管理器名: 没有快照时作为起点的空数据}
+        """
+        return {name: self._load_snapshot(name) for name in bases}
+
+    def snapshot(self, data: dict) -> str:
+        """序列化一个管理器的完整数据"""
+        return json.dumps(data)
+
+    def journal_lines(self, name: str, changes: dict) -> List[str]:
+        """把 ``RBACManager.pop_changes`` 的结果序列化为增量记录"""
+        return []
+
+    def append(self, lines: List[str]) -> bool:
+        """写入增量记录, 返回是否需要压缩为快照"""
+        return False
+
+    def save_snapshot(self, snapshots: Dict[str, str]):
+        """
+        原子地写入快照
+
+        :param snapshots: {管理器名: ``snapshot`` 的结果}
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for name, content in snapshots.items():
+            atomic_write(self._snapshot_path(name), content)
+
+
+class JournalAccessStore(JsonAccessStore):
+    """
+    快照 + 追加日志存储。
+
+    每次变化只把变化的用户、角色或权限树作为一行记录追加到 ``data/access.journal``,
+    加载时在快照上按顺序重放。日志行数超过阈值后由调用方写入新快照, 随后清空日志。
+
+    每条记录带有递增序号, 快照记下它包含的最后一个序号 (``journal_seq``),
+    重放时跳过已包含在快照中的记录, 因此在写快照的任何阶段崩溃都不会用旧值覆盖新值。
+    """
+
+    journaled = True
+
+    def __init__(self, directory: str = "data", compact_threshold: int = 1000):
+        super().__init__(directory)
+        self.compact_threshold = compact_threshold
+        self._journal_path = os.path.join(directory, "access.journal")
+        self._journal_lines = 0
+        self._seq = 0
+
+    def load(self, bases: Dict[str, dict]) -> Dict[str, Optional[dict]]:
+        result = super().load(bases)
+        for data in result.values():
+            if data is not None:
+                self._seq = max(self._seq, data.get("journal_seq", 0))
+        records = self._read_journal()
+        self._journal_lines = len(records)
+        for record in records:
+            name, seq = record.get("m"), record.get("s", 0)
+            self._seq = max(self._seq, seq)
+            if name not in bases:
+                continue
+            if result[name] is None:
+                result[name] = bases[name]
+            elif seq <= result[name].get("journal_seq", 0):
+                continue
+            self._apply(result[name], record)
+        return result
+
+    def _read_journal(self) -> List[dict]:
+        if not os.path.exists(self._journal_path):
+            return []
+        records = []
+        with open(self._journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 最后一行可能在写入时被中断
+                    LOG.warning("权限日志中存在无法解析的记录, 已忽略")
+        return records
+
+    @staticmethod
+    def _apply(data: dict, record: dict):
+        kind, key, value = record.get("t"), record.get("k"), record.get("v")
+        if kind == "user":
+            users = data.setdefault("users", {})
+            if value is None:
+                users.pop(key, None)
+            else:
+                users[key] = value
+        elif kind == "role":
+            roles = data.setdefault("roles", {})
+            inheritance = data.setdefault("role_inheritance", {})
+            if value is None:
+                # 删除角色时其他角色对它的继承也一并移除
+                roles.pop(key, None)
+                inheritance.pop(key, None)
+                for inherited_roles in inheritance.values():
+                    if key in inherited_roles:
+                        inherited_roles.remove(key)
+            else:
+                inherits = value.pop("inherits", None)
+                roles[key] = value
+                if inherits is None:
+                    inheritance.pop(key, None)
+                else:
+                    inheritance[key] = inherits
+        elif kind == "trie":
+            data["permissions_trie_paths"] = value
+
+    def snapshot(self, data: dict) -> str:
+        return json.dumps(dict(data, journal_seq=self._seq))
+
+    def journal_lines(self, name: str, changes: dict) -> List[str]:
+        records = [("user", key, value) for key, value in changes["users"].items()]
+        records += [("role", key, value) for key, value in changes["roles"].items()]
+        if changes["trie"] is not None:
+            records.append(("trie", None, changes["trie"]))
+        lines = []
+        for kind, key, value in records:
+            self._seq += 1
+            lines.append(
+                json.dumps({"s": self._seq, "m": name, "t": kind, "k": key, "v": value})
+            )
+        return lines
+
+    def append(self, lines: List[str]) -> bool:
+        if lines:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{line}\n" for line in lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_lines += len(lines)
+        return self._journal_lines >= self.compact_threshold
+
+    def save_snapshot(self, snapshots: Dict[str, str]):
+        super().save_snapshot(snapshots)
+        # 快照已包含此前日志中的全部变化
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        self._journal_lines = 0
+
+
+def create_access_store(backend: str, directory: str = "data", **kwargs):
+    """按名称创建权限存储后端: ``json`` 或 ``journal``"""
+    if backend == "json":
+        return JsonAccessStore(directory)
+    if backend == "journal":
+        return JournalAccessStore(directory, **kwargs)
+    raise ValueError(f"未知的权限存储后端: {backend}")
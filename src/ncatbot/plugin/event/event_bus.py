@@ -2,23 +2,43 @@ import asyncio
 import copy
 import inspect
 import re
+import time
 import uuid
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Tuple
 
 from ncatbot.core import BaseMessage
 from ncatbot.plugin.event.access_controller import get_global_access_controller
 from ncatbot.plugin.event.event import Event
 from ncatbot.plugin.event.function import BUILT_IN_FUNCTIONS, Conf, Func
+from ncatbot.plugin.event.router import FuncRouter
 from ncatbot.utils import (
     OFFICIAL_GROUP_MESSAGE_EVENT,
     OFFICIAL_PRIVATE_MESSAGE_EVENT,
     PermissionGroup,
     get_log,
-    run_func_async,
+)
+from ncatbot.utils.function_enhance import call_func_async, log_func_error
+from ncatbot.utils.metrics import (
+    EVENT_HANDLER_SECONDS,
+    EVENT_PUBLISH_SECONDS,
+    FUNC_DENIED,
+    FUNC_ERRORS,
+    FUNC_SECONDS,
 )
 
 _log = get_log()
 
+DISPATCH_TABLE_MAX_SIZE = 1024  # 分发表缓存的事件类型数上限
+HandlerEntry = Tuple[Callable[[Event], Any], int, uuid.UUID]
+
+
+def _handler_label(handler: Callable) -> str:
+    """处理器在指标中的名称, 插件注册的处理器记为插件名"""
+    name = getattr(getattr(handler, "__self__", None), "name", None)
+    if isinstance(name, str):
+        return name
+    return getattr(handler, "__qualname__", type(handler).__name__)
+
 
 class EventBus:
     """
@@ -35,8 +55,11 @@ class EventBus:
 
         self._exact_handlers = {}
         self._regex_handlers = []
+        # 事件类型 -> 排好序的 (handler, priority, handler_id) 元组, 订阅变化时清空
+        self._dispatch_table: Dict[str, Tuple[HandlerEntry, ...]] = {}
         self.access_controller = get_global_access_controller()
         self.funcs: list[Func] = []
+        self._router: FuncRouter = None  # 功能路由表, 功能列表变化时重建
         self.configs: dict[str, Conf] = {}
         self.plugin_loader: PluginLoader = plugin_loader
         self.plugins: list[BasePlugin] = []
@@ -53,7 +76,7 @@ class EventBus:
     async def _func_activator(self, event: Event):
         activate_plugin_func = []  # 记录已经被激活功能的插件, 用于判断是否激活默认功能
         message: BaseMessage = event.data
-        for func in self.funcs:
+        for func in self._get_router().candidates(event):
             if func.is_activate(event):
                 if self.access_controller.with_permission(
                     path=f"{func.plugin_name}.{func.name}",
@@ -68,20 +91,47 @@ class EventBus:
                                 for n in (func.plugin_name, "ncatbot")
                             ]
                         ):
-                            await run_func_async(func.func, message)
+                            await self._run_func(func, message)
                             # await func.func(message)
                     else:
                         activate_plugin_func.append(func.plugin_name)
-                        await run_func_async(func.func, message)
-                elif func.reply:
-                    message.reply_text_sync("权限不足")
+                        await self._run_func(func, message)
+                else:
+                    FUNC_DENIED.labels(func.plugin_name, func.name).inc()
+                    if func.reply:
+                        message.reply_text_sync("权限不足")
+
+    @staticmethod
+    async def _run_func(func: Func, message: BaseMessage):
+        """执行功能并记录耗时和异常, 与 ``run_func_async`` 一样只记录异常, 不向上抛出"""
+        started = time.perf_counter()
+        try:
+            await call_func_async(func.func, message)
+        except Exception as e:
+            FUNC_ERRORS.labels(func.plugin_name, func.name).inc()
+            log_func_error(func.func, e)
+        finally:
+            FUNC_SECONDS.labels(func.plugin_name, func.name).observe(
+                time.perf_counter() - started
+            )
+
+    def _get_router(self) -> FuncRouter:
+        if self._router is None or len(self._router) != len(self.funcs):
+            self._router = FuncRouter(self.funcs)
+        return self._router
 
     def load_builtin_funcs(self):
         self.access_controller.create_permission_path(
             "ncatbot.cfg.main.placeholder", ignore_exist=True
         )  # 创建占位路径
         for func in BUILT_IN_FUNCTIONS:
-            if func.name in ["plg", "cfg", "help", "reload"]:  # 绑定 plg 的参数
+            if func.name in [
+                "plg",
+                "cfg",
+                "help",
+                "reload",
+                "metrics",
+            ]:  # 绑定 plg 的参数
                 temp = copy.copy(func.func)
 
                 async def async_func(message, event_bus=self, temp=temp):
@@ -90,6 +140,7 @@ class EventBus:
                 func.func = async_func
 
             self.funcs.append(func)
+            self._router = None
             self.access_controller.assign_permissions_to_role(
                 role_name=func.permission,
                 path=(
@@ -110,6 +161,7 @@ class EventBus:
                 if self.funcs[i].name == func.name:
                     self.funcs.pop(i)
                     break
+        self._router = None
         self.plugins.remove(plugin)
 
     def add_plugin(self, plugin):
@@ -156,6 +208,7 @@ class EventBus:
                     create_permission_path=False,
                 )
             self.funcs.append(func)
+        self._router = None
 
     def subscribe(
         self, event_type: str, handler: Callable[[Event], Any], priority: int = 0
@@ -183,6 +236,7 @@ class EventBus:
             self._exact_handlers.setdefault(event_type, []).append(
                 (pattern, priority, handler, handler_id)
             )
+        self._dispatch_table.clear()
         return handler_id
 
     def unsubscribe(self, handler_id: uuid.UUID) -> bool:
@@ -210,48 +264,68 @@ class EventBus:
             for (patt, pr, h, hid) in self._regex_handlers
             if hid != handler_id
         ]
+        self._dispatch_table.clear()
         return True
 
-    async def publish_async(self, event: Event) -> List[Any]:
-        """
-        异步发布事件
-
-        参数:
-            event: Event - 要发布的事件
-
-        返回值:
-            List[Any] - 所有处理器返回的结果的列表(通常是空列表)
-        """
+    def _resolve_handlers(self, event_type: str) -> Tuple[HandlerEntry, ...]:
+        """解析某个事件类型对应的处理器并按优先级排序, 结果缓存到分发表"""
         handlers = []
-        if event.type in self._exact_handlers:
+        if event_type in self._exact_handlers:
             # 处理精确匹配处理器
             for pattern, priority, handler, handler_id in self._exact_handlers[
-                event.type
+                event_type
             ]:
                 handlers.append((handler, priority, handler_id))
         else:
             # 处理正则匹配处理器
             for pattern, priority, handler, handler_id in self._regex_handlers:
-                if pattern and pattern.match(event.type):
+                if pattern and pattern.match(event_type):
                     handlers.append((handler, priority, handler_id))
 
         # 按优先级排序
-        sorted_handlers = sorted(handlers, key=lambda x: (-x[1], x[0].__name__))
+        sorted_handlers = tuple(sorted(handlers, key=lambda x: (-x[1], x[0].__name__)))
+        if len(self._dispatch_table) >= DISPATCH_TABLE_MAX_SIZE:
+            # 事件类型由插件自由发布, 防止分发表无限增长
+            self._dispatch_table.clear()
+        self._dispatch_table[event_type] = sorted_handlers
+        return sorted_handlers
+
+    async def publish_async(self, event: Event) -> List[Any]:
+        """
+        异步发布事件
+
+        参数:
+            event: Event - 要发布的事件
+
+        返回值:
+            List[Any] - 所有处理器返回的结果的列表(通常是空列表)
+        """
+        sorted_handlers = self._dispatch_table.get(event.type)
+        if sorted_handlers is None:
+            sorted_handlers = self._resolve_handlers(event.type)
 
         results = []
+        published = time.perf_counter()
         # 按优先级顺序调用处理器
         for handler, priority, handler_id in sorted_handlers:
             if event._propagation_stopped:
                 break
 
+            started = time.perf_counter()
             if inspect.iscoroutinefunction(handler):
                 await handler(event)
             else:
                 asyncio.create_task(handler(event))
+            EVENT_HANDLER_SECONDS.labels(event.type, _handler_label(handler)).observe(
+                time.perf_counter() - started
+            )
 
             # 收集结果
             results.extend(event._results)
 
+        EVENT_PUBLISH_SECONDS.labels(event.type).observe(
+            time.perf_counter() - published
+        )
         return results
 
     def publish_sync(self, event: Event) -> List[Any]:
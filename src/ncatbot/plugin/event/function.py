@@ -375,6 +375,77 @@ async def reload_plugin_command(message: BaseMessage, event_bus=None):
         )
 
 
+async def metrics_command(message: BaseMessage, event_bus=None):
+    # /metrics
+    from ncatbot.plugin.event.event_bus import EventBus
+    from ncatbot.utils.metrics import (
+        API_REQUESTS,
+        API_SECONDS,
+        EVENT_HANDLER_SECONDS,
+        EVENT_QUEUE_BACKLOG,
+        EVENTS_DROPPED,
+        EVENTS_RECEIVED,
+        FUNC_ERRORS,
+        FUNC_SECONDS,
+    )
+
+    event_bus: EventBus = event_bus
+    top = 10
+
+    received = sum(value.value for _, value in EVENTS_RECEIVED.series())
+    dropped = sum(value.value for _, value in EVENTS_DROPPED.series())
+    backlog = next(EVENT_QUEUE_BACKLOG.samples())[3]
+    lines = [
+        f"事件: 收到 {received:.0f} 个, 丢弃 {dropped:.0f} 个, 积压 {backlog:.0f} 个"
+    ]
+
+    # 按插件汇总功能和事件处理器的耗时: {插件名: [调用次数, 总耗时, 出错次数]}
+    plugin_names = {plugin.name for plugin in event_bus.plugins} | {"ncatbot"}
+    plugins: Dict[str, list] = {}
+    for (plugin_name, _), value in FUNC_SECONDS.series():
+        stats = plugins.setdefault(plugin_name, [0, 0.0, 0])
+        stats[0] += value.count
+        stats[1] += value.sum
+    for (_, handler), value in EVENT_HANDLER_SECONDS.series():
+        if handler in plugin_names:
+            stats = plugins.setdefault(handler, [0, 0.0, 0])
+            stats[0] += value.count
+            stats[1] += value.sum
+    for (plugin_name, _), value in FUNC_ERRORS.series():
+        plugins.setdefault(plugin_name, [0, 0.0, 0])[2] += value.value
+    if plugins:
+        lines.append(f"插件耗时 (前 {top}):")
+        for name, (count, total, errors) in sorted(
+            plugins.items(), key=lambda item: -item[1][1]
+        )[:top]:
+            average = total / count * 1000 if count else 0.0
+            lines.append(
+                f"  {name}: {count} 次, 总计 {total:.2f}s, "
+                f"平均 {average:.1f}ms, 出错 {errors:.0f} 次"
+            )
+
+    # API 调用次数与失败率: {action: [调用次数, 失败次数]}
+    actions: Dict[str, list] = {}
+    for (action, result), value in API_REQUESTS.series():
+        stats = actions.setdefault(action, [0, 0])
+        stats[0] += value.value
+        if result != "ok":
+            stats[1] += value.value
+    if actions:
+        latency = {action: value for (action,), value in API_SECONDS.series()}
+        lines.append(f"API (前 {top}):")
+        for action, (count, failed) in sorted(
+            actions.items(), key=lambda item: -item[1][0]
+        )[:top]:
+            value = latency.get(action)
+            average = value.sum / value.count * 1000 if value and value.count else 0.0
+            lines.append(
+                f"  {action}: {count:.0f} 次, 平均 {average:.1f}ms, "
+                f"失败 {failed:.0f} 次 ({failed / count:.1%})"
+            )
+    message.reply_text_sync("\n".join(lines))
+
+
 async def help_command(message: BaseMessage, event_bus=None):
     # /nchelp [<plugin_name>]
     from ncatbot.plugin.event.event_bus import EventBus
@@ -471,6 +542,18 @@ BUILT_IN_FUNCTIONS = [
         examples=["/reload example_plugin", "/reload -f example_plugin"],
         tags=["admin", "plugin", "reload"],
     ),
+    Func(
+        name="metrics",
+        plugin_name="ncatbot",
+        func=metrics_command,
+        prefix="/metrics",
+        permission_raise=True,
+        reply=False,
+        permission=PermissionGroup.ADMIN.value,
+        description="查看运行指标",
+        usage="/metrics",
+        tags=["admin", "metrics"],
+    ),
     Func(
         name="help",
         plugin_name="ncatbot",
@@ -0,0 +1,126 @@
+# 功能路由: 为功能过滤器建立索引, 每条消息只检查可能被激活的功能
+import re
+from typing import Dict, List, Sequence, Set
+
+from ncatbot.plugin.event.event import Event
+from ncatbot.plugin.event.filter import PrefixFilter, RegexFilter
+from ncatbot.plugin.event.function import Func
+
+try:
+    import re._constants as sre_constants
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+# 无法放进组合正则的写法: 反向引用、命名分组 (带标志的正则同样单独检查)
+_UNCOMBINABLE = re.compile(r"\\\d|\(\?P[<=]")
+_AT_BEGINNING = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+
+
+def _literal_prefix(pattern: re.Pattern) -> str:
+    """正则从开头起必须匹配的字面量前缀, 忽略大小写时返回空串"""
+    if pattern.flags & re.IGNORECASE:
+        return ""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return ""
+    prefix = []
+    for op, av in parsed:
+        if op is sre_constants.AT and not prefix and av in _AT_BEGINNING:
+            continue
+        if op is not sre_constants.LITERAL:
+            break
+        prefix.append(chr(av))
+    return "".join(prefix)
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[int] = []
+
+
+class FuncRouter:
+    """
+    功能路由表。
+
+    - 前缀过滤器, 以及带字面量前缀的正则过滤器, 按前缀放进字符前缀树
+    - 其余正则过滤器合并为一个多选正则做预筛, 一个都不匹配时整体跳过
+    - 带自定义过滤器或没有过滤器的功能总是作为候选
+
+    路由只负责缩小候选范围, 候选功能仍通过 ``Func.is_activate`` 确认, 且保持注册顺序。
+    """
+
+    def __init__(self, funcs: Sequence[Func]):
+        self.funcs = tuple(funcs)
+        self._root = _TrieNode()
+        self._always: List[int] = []
+        self._regex_ids: List[int] = []
+        self._regex_any: re.Pattern = None
+        regex_patterns = []
+        for index, func in enumerate(self.funcs):
+            filters = []
+            node = func.filter_chain
+            while node is not None:
+                filters.append(node)
+                node = node.next_filter
+            if not filters or any(
+                not isinstance(f, (PrefixFilter, RegexFilter)) for f in filters
+            ):
+                self._always.append(index)
+                continue
+            for f in filters:
+                if isinstance(f, PrefixFilter):
+                    self._add_prefix(f.prefix, index)
+                    continue
+                prefix = _literal_prefix(f.pattern)
+                if prefix:
+                    self._add_prefix(prefix, index)
+                elif f.pattern.flags & ~re.UNICODE or _UNCOMBINABLE.search(
+                    f.pattern.pattern
+                ):
+                    self._always.append(index)
+                else:
+                    self._regex_ids.append(index)
+                    regex_patterns.append(f.pattern)
+        if regex_patterns:
+            try:
+                self._regex_any = re.compile(
+                    "|".join(f"(?:{p.pattern})" for p in regex_patterns)
+                )
+            except re.error:
+                # 合并失败时退回逐个检查
+                self._always.extend(self._regex_ids)
+                self._regex_ids = []
+
+    def __len__(self):
+        return len(self.funcs)
+
+    def _add_prefix(self, prefix: str, index: int):
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.ids.append(index)
+
+    def _candidate_ids(self, message: str) -> Set[int]:
+        ids = set(self._always)
+        if not message:
+            return ids
+        node = self._root
+        for char in message:
+            node = node.children.get(char)
+            if node is None:
+                break
+            ids.update(node.ids)
+        if self._regex_any is not None and self._regex_any.match(message):
+            ids.update(self._regex_ids)
+        return ids
+
+    def candidates(self, event: Event) -> List[Func]:
+        """按注册顺序返回可能被该事件激活的功能"""
+        ids = self._candidate_ids(getattr(event.data, "raw_message", None))
+        return [self.funcs[i] for i in sorted(ids)]
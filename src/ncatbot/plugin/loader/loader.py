@@ -11,19 +11,26 @@ import importlib
 import os
 import re
 import sys
+import time
 import traceback
-from collections import defaultdict, deque
+from collections import defaultdict
 from pathlib import Path
 from types import MethodType, ModuleType
 from typing import Dict, List, Set, Type
 
 from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
 from packaging.version import parse as parse_version
 
 from ncatbot.plugin.base_plugin import BasePlugin
 from ncatbot.plugin.event import EventBus
 from ncatbot.plugin.loader.compatible import CompatibleEnrollment
 from ncatbot.plugin.loader.pip_tool import PipTool
+from ncatbot.plugin.loader.plugin_index import (
+    directory_fingerprint,
+    get_plugin_index,
+    requirements_hash,
+)
 from ncatbot.utils import (
     META_CONFIG_PATH,
     PLUGINS_DIR,
@@ -46,6 +53,13 @@ def install_plugin_dependencies(plugin_name, confirm=False, print_import_details
     if not os.path.exists(f"{directory_path}/requirements.txt"):
         return
 
+    # requirements.txt 未变化且上次检查时依赖已全部满足, 跳过检查
+    index = get_plugin_index()
+    req_hash = requirements_hash(directory_path)
+    if index and index.requirements_satisfied(directory_path, req_hash):
+        LOG.debug(f"插件 {plugin_name} 的依赖未变化, 跳过检查")
+        return
+
     original_sys_path = sys.path.copy()
     download_new = False
     try:
@@ -61,6 +75,7 @@ def install_plugin_dependencies(plugin_name, confirm=False, print_import_details
                 if not pack.strip().startswith("#")
             ]
             # 检查指定版本号的依赖是否需要安装
+            installed_versions = PM.installed_versions()
             for pack in list(requirements):
                 # 处理GitHub包（方法待实现）
                 if pack.startswith(("git+", "http://", "https://", "git://", "ssh://")):
@@ -71,9 +86,10 @@ def install_plugin_dependencies(plugin_name, confirm=False, print_import_details
                     operator = match.group(2)
                     version = match.group(3).strip()
 
-                    pack_info = PM.show_info(pack_name)
-                    if pack_info:
-                        installed_version = pack_info["version"]
+                    installed_version = installed_versions.get(
+                        canonicalize_name(pack_name)
+                    )
+                    if installed_version:
                         LOG.info(
                             f"检查依赖: {pack_name} 已安装版本: {installed_version}, 需求: {operator}{version}"
                         )
@@ -97,6 +113,8 @@ def install_plugin_dependencies(plugin_name, confirm=False, print_import_details
                     for pack in download:
                         LOG.info(f"开始安装库: {pack}")
                         PM.install(pack)
+            elif index:
+                index.mark_requirements(directory_path, req_hash)
 
             try:
                 importlib.import_module(plugin_name)
@@ -128,6 +146,7 @@ class PluginLoader:
         self._dependency_graph: Dict[str, Set[str]] = {}  # 插件依赖关系图
         self._version_constraints: Dict[str, Dict[str, str]] = {}  # 插件版本约束
         self._debug = False  # 调试模式标记
+        self.load_times: Dict[str, float] = {}  # 插件 __onload__ 耗时(秒)
         self.time_task_scheduler: TimeTaskScheduler = TimeTaskScheduler()
         if META_CONFIG_PATH:
             self.meta_data = UniversalLoader(META_CONFIG_PATH).load().data
@@ -190,9 +209,9 @@ class PluginLoader:
                         plugin_name, dep_name, constraint, installed_ver
                     )
 
-    def _resolve_load_order(self) -> List[str]:
+    def _resolve_load_levels(self) -> List[List[str]]:
         """
-        解析插件加载顺序,确保依赖关系正确
+        按依赖层级解析插件加载顺序, 同一层的插件互不依赖, 可以同时加载
         """
         in_degree = {k: 0 for k in self._dependency_graph}
         adj_list = defaultdict(list)
@@ -200,27 +219,50 @@ class PluginLoader:
         for dependent, dependencies in self._dependency_graph.items():
             for dep in dependencies:
                 adj_list[dep].append(dependent)
-                if dep not in self._dependency_graph.items():
+                if dep not in self._dependency_graph:
                     LOG.error(f"插件 {dependent} 的依赖项 {dep} 不存在")
                     raise PluginNotFoundError(dep)
                 in_degree[dependent] += 1
 
-        queue = deque([k for k, v in in_degree.items() if v == 0])
-        load_order = []
-
-        while queue:
-            node = queue.popleft()
-            load_order.append(node)
-            for neighbor in adj_list[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-
-        if len(load_order) != len(self._dependency_graph):
-            missing = set(self._dependency_graph.keys()) - set(load_order)
+        level = [k for k, v in in_degree.items() if v == 0]
+        levels = []
+        resolved = 0
+
+        while level:
+            levels.append(level)
+            resolved += len(level)
+            next_level = []
+            for node in level:
+                for neighbor in adj_list[node]:
+                    in_degree[neighbor] -= 1
+                    if in_degree[neighbor] == 0:
+                        next_level.append(neighbor)
+            level = next_level
+
+        if resolved != len(self._dependency_graph):
+            loaded = {name for level in levels for name in level}
+            missing = set(self._dependency_graph.keys()) - loaded
             raise PluginCircularDependencyError(missing)
 
-        return load_order
+        return levels
+
+    def _resolve_load_order(self) -> List[str]:
+        """
+        解析插件加载顺序,确保依赖关系正确
+        """
+        return [name for level in self._resolve_load_levels() for name in level]
+
+    async def _onload_plugin(
+        self, plugin: BasePlugin, semaphore: asyncio.Semaphore = None
+    ):
+        """执行插件的 __onload__ 并记录耗时, semaphore 用于限制同时加载的插件数"""
+        if semaphore is not None:
+            async with semaphore:
+                return await self._onload_plugin(plugin)
+        start = time.perf_counter()
+        await plugin.__onload__()
+        self.load_times[plugin.name] = time.perf_counter() - start
+        LOG.debug(f"插件 {plugin.name} 加载耗时 {self.load_times[plugin.name]:.3f}s")
 
     def get_plugin_info(self, plugin_path):
         """获取插件的元信息
@@ -242,6 +284,14 @@ class PluginLoader:
         """
         import logging
 
+        # 目录内容未变化时直接使用索引中的元信息, 不再导入和实例化插件
+        index = get_plugin_index()
+        if index and os.path.isdir(plugin_path):
+            fingerprint = directory_fingerprint(plugin_path)
+            info = index.get_info(plugin_path, fingerprint)
+            if info is not None:
+                return info
+
         original_sys_path = sys.path.copy()
         logging.getLogger().setLevel(logging.WARNING)
         try:
@@ -377,6 +427,8 @@ class PluginLoader:
             sys.path = original_sys_path
             logging.getLogger().setLevel(logging.DEBUG)
 
+        if index and name is not None and os.path.isdir(plugin_path):
+            index.set_info(plugin_path, fingerprint, (name, version, meta))
         return name, version, meta
 
     async def from_class_load_plugins(self, plugins: List[Type[BasePlugin]], **kwargs):
@@ -409,7 +461,8 @@ class PluginLoader:
 
             LOG.debug("正在构建插件依赖图")
             self._build_dependency_graph(valid_plugins)
-            load_order = self._resolve_load_order()
+            load_levels = self._resolve_load_levels()
+            load_order = [name for level in load_levels for name in level]
         except Exception as e:
             LOG.error(f"构造插件依赖图时出错: {e}")
             raise e
@@ -435,9 +488,27 @@ class PluginLoader:
         self.plugins = temp_plugins
         self._validate_dependencies()
 
-        for name in load_order:
-            await self.plugins[name].__onload__()
-            self.event_bus.add_plugin(self.plugins[name])
+        # 同一依赖层级的插件并发加载, 下一层在本层全部加载完成后开始
+        concurrency = config.plugin_load_concurrency
+        semaphore = asyncio.Semaphore(
+            concurrency if concurrency > 0 else max(len(load_order), 1)
+        )
+        start = time.perf_counter()
+        for level in load_levels:
+            names = [name for name in level if name in self.plugins]
+            results = await asyncio.gather(
+                *(self._onload_plugin(self.plugins[name], semaphore) for name in names),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            for name in names:
+                self.event_bus.add_plugin(self.plugins[name])
+        LOG.debug(
+            f"插件加载耗时 {time.perf_counter() - start:.3f}s, "
+            f"共 {len(load_levels)} 个依赖层级"
+        )
 
     async def load_plugins(self, plugins_path: str = PLUGINS_DIR, **kwargs):
         """
@@ -611,7 +682,7 @@ class PluginLoader:
 
                 # 加载插件
                 LOG.debug(f"加载插件: {plugin_name}")
-                await new_plugin.__onload__()
+                await self._onload_plugin(new_plugin)
 
                 # 添加到插件列表
                 self.plugins[plugin_name] = new_plugin
@@ -681,7 +752,7 @@ class PluginLoader:
 
                 # 加载插件
                 LOG.debug(f"加载插件: {plugin_name}")
-                await new_plugin.__onload__()
+                await self._onload_plugin(new_plugin)
 
                 # 添加到插件列表
                 self.plugins[plugin_name] = new_plugin
@@ -721,6 +792,10 @@ class PluginLoader:
                 module = importlib.import_module(filename)
                 modules[filename] = module
             except Exception as e:
+                # 可能是依赖被卸载, 下次启动时重新检查
+                index = get_plugin_index()
+                if index:
+                    index.forget(os.path.join(directory_path, filename))
                 LOG.error(f"加载插件 {filename} 时出错: {e}")
                 LOG.error(traceback.format_exc())
                 continue
@@ -16,6 +16,7 @@ from packaging import version
 from packaging.markers import UndefinedComparison
 from packaging.requirements import Requirement
 from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
 
 from ncatbot.utils import PYPI_URL
 
@@ -51,7 +52,7 @@ class PipTool:
         base_cmd (List[str]): 基础命令前缀
     """
 
-    installed_packages = None
+    installed_packages = None  # pip list 的结果, 进程内缓存, 安装/卸载后失效
 
     def __init__(self, python_path: str = sys.executable):
         """初始化包管理器
@@ -216,8 +217,8 @@ class PipTool:
             >>> pm.list_installed()
             [{'name': 'requests', 'version': '2.26.0'}, ...]
         """
-        if PipTool.installed_packages:
-            return PipTool.installed_packages
+        if PipTool.installed_packages is not None:
+            return self._format_output(PipTool.installed_packages, format)
         try:
             result = self._run_command(["list", "--format=columns"])
             packages = []
@@ -234,11 +235,21 @@ class PipTool:
                         "location": " ".join(parts[2:]) if len(parts) > 2 else "",
                     }
                 )
-            PipTool.installed_packages = self._format_output(packages, format)
-            return PipTool.installed_packages
+            PipTool.installed_packages = packages
+            return self._format_output(packages, format)
         except PipManagerException:
             return None
 
+    def installed_versions(self) -> Dict[str, str]:
+        """已安装包的版本, 键为规范化的包名 (小写, ``_``/``.`` 视为 ``-``)
+
+        与 ``list_installed`` 共用缓存, 查询任意多个包都只调用一次 pip
+        """
+        return {
+            canonicalize_name(pack["name"]): pack["version"]
+            for pack in self.list_installed() or []
+        }
+
     def show_info(self, package: str, format: str = "dict") -> Union[Dict, str, None]:
         """获取包的详细信息
 
@@ -0,0 +1,147 @@
+# 插件索引: 记录插件的依赖检查结果与元信息, 未变化的插件启动时不再重复检查
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Optional, Tuple
+
+from ncatbot.utils import PERSISTENT_DIR, get_log
+from ncatbot.utils.config import config
+from ncatbot.utils.file_io import atomic_write
+
+LOG = get_log("PluginIndex")
+
+PLUGIN_INDEX_VERSION = 1
+# 计算指纹时跳过的目录, 这些目录的变化不影响插件本身
+_IGNORED_DIRS = {"__pycache__", ".git", ".venv", "venv", "node_modules"}
+
+
+def requirements_hash(plugin_dir: str) -> Optional[str]:
+    """插件 requirements.txt 的哈希, 文件不存在时为 None"""
+    path = os.path.join(plugin_dir, "requirements.txt")
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def directory_fingerprint(plugin_dir: str) -> str:
+    """插件目录的指纹, 由各文件的相对路径、大小和修改时间计算, 不读取文件内容"""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(plugin_dir):
+        dirs[:] = sorted(
+            d for d in dirs if d not in _IGNORED_DIRS and not d.startswith(".")
+        )
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, plugin_dir).replace(os.sep, "/")
+            digest.update(f"{rel}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class PluginIndex:
+    """
+    持久化的插件索引, 以插件目录的绝对路径为键, 保存在 ``data/plugin_index.json``
+
+    - ``requirements``: 上次确认依赖全部满足时 requirements.txt 的哈希
+    - ``fingerprint`` / ``info``: 目录指纹与当时 ``get_plugin_info`` 的结果
+
+    索引与 Python 解释器绑定, 换用其他解释器 (如切换虚拟环境) 后整体失效。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            LOG.warning(f"插件索引损坏, 将重新建立: {e}")
+            return {}
+        if (
+            data.get("version") != PLUGIN_INDEX_VERSION
+            or data.get("python") != sys.executable
+        ):
+            return {}
+        return data.get("plugins", {})
+
+    def _save(self):
+        content = json.dumps(
+            {
+                "version": PLUGIN_INDEX_VERSION,
+                "python": sys.executable,
+                "plugins": self._entries,
+            },
+            ensure_ascii=False,
+        )
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            atomic_write(self.path, content)
+        except OSError as e:
+            LOG.warning(f"保存插件索引失败: {e}")
+
+    def _update(self, plugin_dir: str, **fields):
+        with self._lock:
+            entry = self._entries.setdefault(os.path.abspath(plugin_dir), {})
+            if all(entry.get(k) == v for k, v in fields.items()):
+                return
+            entry.update(fields)
+            self._save()
+
+    def requirements_satisfied(self, plugin_dir: str, req_hash: str) -> bool:
+        """依赖是否已在相同的 requirements.txt 下检查通过"""
+        entry = self._entries.get(os.path.abspath(plugin_dir), {})
+        return entry.get("requirements") == req_hash
+
+    def mark_requirements(self, plugin_dir: str, req_hash: str):
+        """记录依赖已全部满足"""
+        self._update(plugin_dir, requirements=req_hash)
+
+    def get_info(self, plugin_dir: str, fingerprint: str) -> Optional[Tuple]:
+        """指纹一致时返回缓存的 (name, version, meta)"""
+        entry = self._entries.get(os.path.abspath(plugin_dir), {})
+        if entry.get("fingerprint") != fingerprint or "info" not in entry:
+            return None
+        return tuple(entry["info"])
+
+    def set_info(self, plugin_dir: str, fingerprint: str, info: Tuple):
+        try:
+            # 只缓存能原样保存的元信息, 否则下次读取的结果会与探测结果不同
+            if json.loads(json.dumps(list(info))) != list(info):
+                return
+        except (TypeError, ValueError):
+            return
+        self._update(plugin_dir, fingerprint=fingerprint, info=list(info))
+
+    def forget(self, plugin_dir: str):
+        """丢弃插件的记录, 下次启动时重新检查"""
+        with self._lock:
+            if self._entries.pop(os.path.abspath(plugin_dir), None) is not None:
+                self._save()
+
+
+_plugin_index: Optional[PluginIndex] = None
+_plugin_index_lock = threading.Lock()
+
+
+def get_plugin_index() -> Optional[PluginIndex]:
+    """进程内共享的插件索引, 未启用 ``plugin_index`` 时为 None"""
+    global _plugin_index
+    if not config.plugin_index:
+        return None
+    with _plugin_index_lock:
+        if _plugin_index is None:
+            _plugin_index = PluginIndex(
+                os.path.join(PERSISTENT_DIR, "plugin_index.json")
+            )
+        return _plugin_index
@@ -49,13 +49,16 @@ from ncatbot.utils.file_io import (
 )
 from ncatbot.utils.function_enhance import (
     add_sync_methods,
+    get_sync_executor_stats,
     report,
     run_func_async,
     run_func_sync,
     to_async,
     to_sync,
 )
+from ncatbot.utils.kv_store import SqliteKVStore
 from ncatbot.utils.logger import get_log
+from ncatbot.utils.metrics import metrics
 from ncatbot.utils.network_io import download_file, get_proxy_url
 from ncatbot.utils.optional import (
     ChangeDir,
@@ -70,6 +73,7 @@ __all__ = [
     "get_proxy_url",
     "download_file",
     "UniversalLoader",
+    "SqliteKVStore",
     "read_file",
     "convert_uploadable_object",
     "unzip_file",
@@ -80,6 +84,8 @@ __all__ = [
     "run_func_sync",
     "run_func_async",
     "add_sync_methods",
+    "get_sync_executor_stats",
+    "metrics",
     # literals
     "NAPCAT_WEBUI_SALT",
     "WINDOWS_NAPCAT_DIR",
@@ -6,6 +6,7 @@ import urllib.parse
 
 import yaml
 
+from ncatbot.utils.assets.literals import EVENT_QUEUE_MAX_SIZE
 from ncatbot.utils.logger import get_log
 
 LOG = get_log()
@@ -38,6 +39,43 @@ class SetConfig:
         只使用 ws_uri 和 webui_uri 和 NapCat 进行交互, 不会配置启动 NapCat
         """
 
+        # 网络连接
+        self.api_pool_size = 2  # 每个事件循环中 /api 长连接的数量
+        self.api_max_inflight = 256  # 同时等待响应的 API 请求上限
+        self.api_timeout = 60  # 单个 API 请求等待响应的秒数, 0 表示不限制
+        self.ws_universal = False  # 是否通过 universal 端点在同一连接上收事件和调用 API
+
+        # 事件分发
+        self.event_queue_max_size = EVENT_QUEUE_MAX_SIZE  # 待处理事件队列长度
+        self.event_workers = 8  # 并发处理事件的协程数
+        # 队列满时的策略: block/drop_oldest/drop_by_type
+        self.event_overflow_policy = "block"
+        # drop_by_type 策略下可丢弃的事件类型
+        self.event_drop_types = ["notice", "message_sent"]
+        # 同时处理的会话数, 同一会话内事件按顺序处理, 0 表示不分道
+        self.event_max_lanes = 64
+        self.event_lane_max_pending = 1024  # 各会话车道中积压事件总数上限
+        self.sync_pool_size = 16  # 执行同步处理函数的线程数
+        self.sync_pool_queue_size = 256  # 排队的同步处理函数上限, 0 表示不限制
+        # 事件录制: 把收到的原始事件帧写入压缩的滚动文件, 供回放工具重放
+        self.event_capture = False  # 是否录制事件
+        self.event_capture_dir = "logs/capture"  # 录制文件目录
+        self.event_capture_max_bytes = 64 * 1024 * 1024  # 单个录制文件的大小上限
+        self.event_capture_max_files = 10  # 保留的录制文件数, 0 表示不限制
+
+        # 权限
+        self.access_decision_cache_size = 4096  # 缓存权限判定结果的用户/群组数
+        self.access_permission_cache_size = 4096  # 缓存最终权限集合的用户/群组数
+        self.access_store_backend = "journal"  # 权限存储: journal (快照+增量日志)/json
+        self.access_flush_interval = 5  # 增量保存权限变化的间隔秒数
+        self.access_journal_compact_threshold = 1000  # 日志超过该行数后写入新快照
+        # 只有默认角色的用户/群组不创建记录, 按默认角色计算权限
+        self.access_lazy_principals = False
+
+        # 运行指标
+        self.metrics_host = "localhost"  # 指标 HTTP 服务监听地址, 默认只监听本机
+        self.metrics_port = 0  # 指标 HTTP 服务端口 (Prometheus 格式), 0 表示不开启
+
         # 更新检查
         self.check_napcat_update = False  # 是否检查 napcat 更新
         self.check_ncatbot_update = True  # 是否检查 ncatbot 更新
@@ -50,7 +88,9 @@ class SetConfig:
         # 插件加载控制
         self.plugin_whitelist = []  # 插件白名单，为空表示不启用白名单
         self.plugin_blacklist = []  # 插件黑名单，为空表示不启用黑名单
+        self.plugin_load_concurrency = 8  # 同时加载的插件数上限, 0 表示不限制
         self.check_plugin_dependecies = False  # 加载时不检查插件 Python 第三方依赖
+        self.plugin_index = True  # 记录插件依赖检查结果与元信息, 未变化的插件跳过检查
 
         # 内置功能控制
         self.enable_help = False
@@ -1,15 +1,20 @@
 import ast
 import asyncio
 import base64
+import io
+import itertools
 import json
 import os
 import pickle
 import re
+import threading
 import urllib
 import warnings
+import weakref
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, Literal, Optional, Union
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 from urllib.parse import urljoin  # 导入urljoin函数
 
 from ncatbot.utils.logger import get_log
@@ -34,6 +39,20 @@ def read_file(file_path) -> any:
         return f.read()
 
 
+def atomic_write(path, content: Union[str, bytes], encoding: str = "utf-8"):
+    """先写临时文件再替换, 写入中途崩溃也不会留下损坏的文件"""
+    tmp_path = f"{path}.tmp"
+    if isinstance(content, bytes):
+        f = open(tmp_path, "wb")
+    else:
+        f = open(tmp_path, "w", encoding=encoding)
+    with f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 def convert_uploadable_object(i, message_type):
     """将可上传对象转换为标准格式"""
 
@@ -119,6 +138,9 @@ import functools
 # ! 需要根据实际情况调整
 FILE_DEBOUNCE_TIME = 0.1
 
+# 延迟写入(write_behind)的合并窗口(1s), 窗口内的修改只写一次文件
+FILE_SAVE_DELAY = 1.0
+
 # regionend
 
 # ---------------------
@@ -174,8 +196,23 @@ try:
 except ImportError:
     pass  # 回退到标准json模块
 
+# MessagePack 模块检测
+MSGPACK_AVAILABLE = False
+try:
+    import msgpack  # type: ignore
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    pass  # 非关键依赖,静默处理
+
 # endregion
 
+# MessagePack 文件格式: {"format": MSGPACK_FORMAT, "version": 版本, "data": 数据}
+# 基本类型原生存储, 集合与自定义类型以扩展类型 [类型名, 值] 存储
+MSGPACK_FORMAT = "ncatbot"
+MSGPACK_FORMAT_VERSION = 1
+MSGPACK_EXT_TYPE = 1
+
 # 格式支持类型
 JSON_TYPE = [bool, str, float, "None"]
 YAML_TYPE = [bool, str, int, float, "None"]
@@ -217,6 +254,33 @@ class ModuleNotInstalledError(UniversalLoaderError):
     pass
 
 
+# endregion
+
+# ---------------------
+# region 延迟写入
+# ---------------------
+
+_file_writer: Optional[ThreadPoolExecutor] = None
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_file_writer() -> ThreadPoolExecutor:
+    """所有延迟写入共用一个线程, 按提交顺序写盘"""
+    global _file_writer
+    if _file_writer is None:
+        _file_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ncatbot-file-writer"
+        )
+    return _file_writer
+
+
 # endregion
 
 # ---------------------
@@ -251,7 +315,18 @@ if WATCHDOG_AVAILABLE:
             """文件修改事件处理"""
             if event.is_directory or event.src_path != str(self.file_path):
                 return
+            self._changed()
+
+        def on_created(self, event):
+            self.on_modified(event)
+
+        def on_moved(self, event):
+            """原子写入 (先写临时文件再改名) 表现为移动事件"""
+            if event.is_directory or event.dest_path != str(self.file_path):
+                return
+            self._changed()
 
+        def _changed(self):
             current_mtime = self._get_current_mtime(self.file_path)
             if current_mtime > self.last_modified + FILE_DEBOUNCE_TIME:  # 防抖
                 self.last_modified = current_mtime
@@ -262,6 +337,87 @@ if WATCHDOG_AVAILABLE:
                     except Exception as e:
                         warnings.warn(f"执行文件修改回调时出错: {e}")
 
+    class _DirectoryDispatcher(FileSystemEventHandler):
+        """把一个目录中的事件分发给关注对应文件的处理器"""
+
+        def __init__(self):
+            super().__init__()
+            self.handlers: Dict[str, List[FileChangeHandler]] = {}
+
+        def dispatch(self, event):
+            if event.is_directory:
+                return
+            paths = {event.src_path, getattr(event, "dest_path", None)}
+            for path in paths:
+                for handler in tuple(self.handlers.get(path, ())):
+                    handler.dispatch(event)
+
+    class SharedObserver:
+        """进程内共用一个 watchdog Observer 线程, 同一目录只监听一次"""
+
+        def __init__(self):
+            self._lock = threading.Lock()
+            self._observer: Optional[Observer] = None
+            self._dirs: Dict[str, Tuple[Any, _DirectoryDispatcher]] = {}
+
+        def watch(self, handler: FileChangeHandler):
+            directory = str(handler.file_path.parent)
+            with self._lock:
+                if self._observer is None:
+                    self._observer = Observer()
+                    self._observer.start()
+                entry = self._dirs.get(directory)
+                if entry is None:
+                    dispatcher = _DirectoryDispatcher()
+                    watch = self._observer.schedule(
+                        dispatcher, directory, recursive=False
+                    )
+                    entry = self._dirs[directory] = (watch, dispatcher)
+                handlers = entry[1].handlers.setdefault(str(handler.file_path), [])
+                handlers.append(handler)
+
+        def unwatch(self, handler: FileChangeHandler):
+            directory = str(handler.file_path.parent)
+            with self._lock:
+                entry = self._dirs.get(directory)
+                if entry is None:
+                    return
+                watch, dispatcher = entry
+                handlers = dispatcher.handlers.get(str(handler.file_path), [])
+                if handler in handlers:
+                    handlers.remove(handler)
+                if not handlers:
+                    dispatcher.handlers.pop(str(handler.file_path), None)
+                if not dispatcher.handlers:
+                    del self._dirs[directory]
+                    try:
+                        self._observer.unschedule(watch)
+                    except Exception:
+                        pass  # 目录可能已被删除
+
+        def stop(self):
+            """停止监听线程"""
+            with self._lock:
+                if self._observer is not None:
+                    self._observer.stop()
+                    self._observer.join()
+                    self._observer = None
+                    self._dirs.clear()
+
+    shared_observer = SharedObserver()
+
+
+def _weak_method(method: Callable) -> Callable:
+    """不持有对象引用的方法回调, 对象被回收后调用无效果"""
+    ref = weakref.WeakMethod(method)
+
+    def call(*args, **kwargs):
+        bound = ref()
+        if bound is not None:
+            return bound(*args, **kwargs)
+
+    return call
+
 
 # endregion
 
@@ -278,6 +434,8 @@ class UniversalLoader(dict):
 
     Attributes:
         realtime_save (bool): 是否启用实时保存（数据变更时自动保存）。
+        write_behind (bool): 实时保存时延迟写入: 只标记修改, 合并窗口内的修改后
+            在后台线程原子写入文件, 不阻塞事件循环。
         realtime_load (bool): 是否启用实时读取（文件变更时自动重新加载）。
         file_path (str, Path): 文件路径。
         file_type (str): 手动指定文件类型（覆盖自动检测）。
@@ -304,10 +462,33 @@ class UniversalLoader(dict):
         "yaml": "yaml",
         "yml": "yaml",
         "pickle": "pickle",
+        "msgpack": "msgpack",
     }
 
     # 文件模式映射
-    _FILE_MODES = {"json": "text", "toml": "text", "yaml": "text", "pickle": "binary"}
+    _FILE_MODES = {
+        "json": "text",
+        "toml": "text",
+        "yaml": "text",
+        "pickle": "binary",
+        "msgpack": "binary",
+    }
+
+    # 自行处理类型的格式, 读写时不经过 _type_convert
+    _NATIVE_TYPED_FORMATS = {"msgpack"}
+
+    # _restore_item 支持的基础类型
+    _BASIC_TYPES = {
+        "int": int,
+        "float": float,
+        "str": str,
+        "bool": bool,
+        "NoneType": type(None),
+        "list": list,
+        "tuple": tuple,
+        "dict": dict,
+        "set": set,
+    }
 
     # 同步加载器映射
     _SYNC_LOADERS = {
@@ -315,6 +496,7 @@ class UniversalLoader(dict):
         "toml": lambda self, f: toml.load(f),
         "yaml": lambda self, f: yaml.safe_load(f) or {},
         "pickle": lambda self, f: pickle.load(f),
+        "msgpack": lambda self, f: self._msgpack_loads(f.read()),
     }
 
     # 同步保存器映射
@@ -329,6 +511,7 @@ class UniversalLoader(dict):
             data, f, allow_unicode=True, default_flow_style=False
         ),
         "pickle": lambda self, data, f: pickle.dump(data, f),
+        "msgpack": lambda self, data, f: f.write(self._msgpack_dumps(data)),
     }
 
     # 异步加载器映射
@@ -339,6 +522,7 @@ class UniversalLoader(dict):
         "toml": lambda self, content: toml.loads(content),
         "yaml": lambda self, content: yaml.safe_load(content) or {},
         "pickle": lambda self, content: pickle.loads(content),
+        "msgpack": lambda self, content: self._msgpack_loads(content),
     }
 
     # 异步保存器映射
@@ -351,6 +535,7 @@ class UniversalLoader(dict):
         "toml": lambda self, data: toml.dumps(data),
         "yaml": lambda self, data: yaml.dump(data, allow_unicode=True),
         "pickle": lambda self, data: pickle.dumps(data),
+        "msgpack": lambda self, data: self._msgpack_dumps(data),
     }
 
     def __init__(
@@ -361,6 +546,8 @@ class UniversalLoader(dict):
         realtime_load: bool = False,
         file_type: Optional[str] = None,
         default: dict = {},
+        write_behind: bool = False,
+        save_delay: float = FILE_SAVE_DELAY,
     ):
         """
         初始化通用加载器。
@@ -371,6 +558,8 @@ class UniversalLoader(dict):
             realtime_save: 是否启用实时保存
             realtime_load: 是否启用实时读取
             file_type: 手动指定文件类型
+            write_behind: 实时保存时是否延迟写入
+            save_delay: 延迟写入的合并窗口(秒)
         """
         super().__init__(default)
         self._file_path: Path = Path(file_path).resolve()
@@ -379,8 +568,20 @@ class UniversalLoader(dict):
             file_type.lower() if file_type else self._detect_file_type(self._file_path)
         )
         self._async_lock = asyncio.Lock()
-        self._observer = None
+        self._watch_handler = None
         self._realtime_save = realtime_save
+        self._write_behind = write_behind
+        self._save_delay = save_delay
+        self._dirty = False  # 是否有尚未写入的修改
+        # 延迟写入正在进行的次数和最近一次写入后文件的 (mtime, 大小), 用于忽略自身写入引起的重新加载
+        self._writing = 0
+        self._last_write: Optional[tuple] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        try:
+            # 延迟写入和文件重新加载都在创建时所在的事件循环中进行
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
         self._on_modified_callbacks = []
         # 检查模块可用性
         self._check_module_availability()
@@ -400,6 +601,8 @@ class UniversalLoader(dict):
             raise ValueError("请手动开启PICKLE支持")
         if self._file_type == "toml" and not TOML_AVAILABLE:
             raise ModuleNotInstalledError("请安装 toml 模块：pip install toml")
+        if self._file_type == "msgpack" and not MSGPACK_AVAILABLE:
+            raise ModuleNotInstalledError("请安装 msgpack 模块：pip install msgpack")
 
     @property
     def file_path(self) -> Path:
@@ -432,9 +635,65 @@ class UniversalLoader(dict):
     # 触发保存统一入口
     def _trigger_save(self) -> None:
         """触发保存操作"""
-        if self._realtime_save:
+        if not self._realtime_save:
+            return
+        if self._write_behind:
+            self._mark_dirty()
+        else:
             self.save()
 
+    def _mark_dirty(self) -> None:
+        """标记修改, 并在合并窗口结束时写入"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            if self._loop is not None and self._loop.is_running():
+                # 在其他线程中修改, 交给事件循环安排写入
+                self._loop.call_soon_threadsafe(self._mark_dirty)
+            else:
+                self.save()
+            return
+        self._loop = loop
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._save_delay, self._flush_behind)
+
+    def _flush_behind(self) -> None:
+        """在事件循环中序列化, 交给后台线程写入"""
+        self._flush_handle = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            content = self._serialize()
+        except Exception as e:
+            # 数据仍未保存, 保持修改标记, 避免被重新加载覆盖; 下次修改或 flush 时再写入
+            self._dirty = True
+            _log.error(f"保存 {self._file_path} 时出错: {e}")
+            return
+        future = _get_file_writer().submit(
+            self._write_content, self._file_path, content
+        )
+        future.add_done_callback(self._report_write_error)
+
+    def _report_write_error(self, future: Future) -> None:
+        """写入线程中的回调, 写入失败时恢复修改标记并在下个合并窗口重试"""
+        if future.exception() is None:
+            return
+        _log.error(f"保存 {self._file_path} 时出错, 稍后重试: {future.exception()}")
+        self._dirty = True
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._mark_dirty)
+
+    def flush(self) -> "UniversalLoader":
+        """立即写入延迟写入中尚未保存的修改"""
+        if self._dirty:
+            self.save()
+        return self
+
     def add_change_callback(self, callback: Callable):  # 也许应该改成内部的
         """添加数据变更回调函数"""
         if not WATCHDOG_AVAILABLE:
@@ -446,23 +705,59 @@ class UniversalLoader(dict):
     def _setup_realtime_features(self, realtime_load: bool):
         """设置实时功能"""
         if realtime_load and WATCHDOG_AVAILABLE:
-            self._observer = Observer()
-            handler = FileChangeHandler(
-                self.load, self._file_path, self._on_modified_callbacks
-            )
-            self._observer.schedule(
-                handler, str(self._file_path.parent), recursive=False
+            self._watch_handler = FileChangeHandler(
+                _weak_method(self._reload_from_file), self._file_path
             )
-            self._observer.start()
+            shared_observer.watch(self._watch_handler)
         elif realtime_load:
             warnings.warn(
                 "实时读取功能不可用，缺少watchdog模块。", ModuleNotInstalledError
             )
 
+    def _reload_from_file(self) -> None:
+        """文件变更时在监听线程中解析, 再到事件循环中替换内容"""
+        if self._writing or _file_signature(self._file_path) == self._last_write:
+            # 自身的延迟写入, 文件内容不比内存中的新
+            return
+        try:
+            data = self._load_data_sync()
+            self._validate_data_structure(data)
+        except Exception as e:
+            # 文件可能正在被写入, 写完后的修改事件会再次触发
+            _log.warning(f"重新加载 {self._file_path} 失败: {e}")
+            return
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._swap_data, data)
+        else:
+            self._swap_data(data)
+
+    def _swap_data(self, data: dict) -> None:
+        """
+        用新数据替换当前内容
+
+        只改动有变化的键, 过程中不会出现空字典; 使用 dict 的方法, 不会触发实时保存
+        """
+        if self._dirty:
+            # 还有尚未写入的修改, 替换会让这些修改丢失, 之后的写入会覆盖文件中的内容
+            _log.warning(
+                f"{self._file_path} 在外部被修改, 但内存中有尚未保存的修改, 已忽略"
+            )
+            return
+        for key in [k for k in dict.keys(self) if k not in data]:
+            dict.__delitem__(self, key)
+        for key, value in data.items():
+            if not dict.__contains__(self, key) or dict.__getitem__(self, key) != value:
+                dict.__setitem__(self, key, value)
+        for cb in self._on_modified_callbacks:
+            try:
+                cb()
+            except Exception as e:
+                warnings.warn(f"执行文件修改回调时出错: {e}")
+
     def __del__(self):
-        if getattr(self, "_observer", None):
-            self._observer.stop()
-            self._observer.join()
+        if getattr(self, "_watch_handler", None):
+            shared_observer.unwatch(self._watch_handler)
 
     def __enter__(self) -> "UniversalLoader":
         return self
@@ -470,7 +765,9 @@ class UniversalLoader(dict):
     def __exit__(self, exc_type, exc_value, traceback) -> None:
         if self._realtime_save:
             try:
-                if self._file_path and self._check_file_exists(self._file_path):
+                if self._file_path and self._check_file_exists(
+                    self._file_path, self._is_binary
+                ):
                     self.save()
             except SaveError as e:
                 warnings.warn(f"自动保存失败: {e}")
@@ -481,7 +778,9 @@ class UniversalLoader(dict):
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:
         if self._realtime_save:
             try:
-                if self._file_path and self._check_file_exists(self._file_path):
+                if self._file_path and self._check_file_exists(
+                    self._file_path, self._is_binary
+                ):
                     await self.asave()
             except SaveError as e:
                 warnings.warn(f"异步自动保存失败: {e}")
@@ -495,14 +794,20 @@ class UniversalLoader(dict):
             raise FileTypeUnknownError(f"无法识别的文件格式: {path}")
         return file_type
 
+    @property
+    def _is_binary(self) -> bool:
+        return self._FILE_MODES.get(self._file_type) == "binary"
+
     @staticmethod
-    def _check_file_exists(path: Path) -> None:
+    def _check_file_exists(path: Path, binary: bool = False) -> None:
         """文件检查逻辑"""
         if not path.exists():
             # 创建父目录
             path.parent.mkdir(parents=True, exist_ok=True)
             # 创建空文件
             path.touch()
+            if binary:
+                return
             with open(path, "w", encoding="utf-8") as f:
                 f.write(
                     """{
@@ -514,7 +819,9 @@ class UniversalLoader(dict):
 
     async def _async_check_file_exists(self) -> None:
         """异步检查文件是否存在"""
-        await asyncio.to_thread(self._check_file_exists, self._file_path)
+        await asyncio.to_thread(
+            self._check_file_exists, self._file_path, self._is_binary
+        )
 
     # ---------------------
     # region 核心数据操作方法
@@ -522,7 +829,7 @@ class UniversalLoader(dict):
 
     def load(self) -> "UniversalLoader":
         """同步加载文件数据"""
-        self._check_file_exists(self._file_path)
+        self._check_file_exists(self._file_path, self._is_binary)
         try:
             data = self._load_data_sync()
             self._validate_data_structure(data)
@@ -548,6 +855,18 @@ class UniversalLoader(dict):
     def save(self, save_path: Optional[Union[str, Path]] = None) -> "UniversalLoader":
         """同步保存数据到文件"""
         save_path = Path(save_path).resolve() if save_path else self._file_path
+        if self._write_behind:
+            # 与后台的延迟写入排队, 避免旧数据覆盖新数据
+            self._dirty = False
+            try:
+                content = self._serialize()
+                _get_file_writer().submit(
+                    self._write_content, save_path, content
+                ).result()
+            except Exception as e:
+                self._dirty = True
+                raise SaveError(f"保存失败: {e}") from e
+            return self
         try:
             # 确保目录存在
             save_path.parent.mkdir(parents=True, exist_ok=True)
@@ -561,6 +880,16 @@ class UniversalLoader(dict):
     ) -> "UniversalLoader":
         """异步保存数据到文件"""
         save_path = Path(save_path).resolve() if save_path else self._file_path
+        if self._write_behind:
+            self._dirty = False
+            try:
+                content = self._serialize()
+                await asyncio.wrap_future(
+                    _get_file_writer().submit(self._write_content, save_path, content)
+                )
+            except Exception as e:
+                raise SaveError(f"异步保存失败: {e}") from e
+            return self
         async with self._async_lock:
             try:
                 await self._save_data_async(save_path)
@@ -594,41 +923,130 @@ class UniversalLoader(dict):
         encode_keys: bool = True,
         encode_values: bool = True,
     ) -> Any:
-        """类型转换主方法"""
-        # 处理容器类型
-        if isinstance(data, dict):
-            return {
-                (
-                    self._type_convert(
-                        k, mode, exclude_types, encode_keys, encode_values
-                    )
-                    if encode_keys
-                    else k
-                ): (
-                    self._type_convert(
-                        v, mode, exclude_types, encode_keys, encode_values
-                    )
-                    if encode_values
-                    else v
-                )
-                for k, v in data.items()
-            }
-
-        if isinstance(data, (list, tuple, set)):
-            converted = [
-                self._type_convert(
-                    item, mode, exclude_types, encode_keys, encode_values
-                )
-                for item in data
-            ]
-            return type(data)(converted)
+        """
+        类型转换主方法
 
-        # 处理基本类型
+        不需要转换的子树 (容器中的值都无需转换) 原样返回, 不会复制
+        """
+        flag = self._flag
         if mode == "preserve":
-            if type(data) in exclude_types or str(data) in exclude_types:
+            native_types = {t for t in exclude_types if isinstance(t, type)}
+            native_names = {t for t in exclude_types if isinstance(t, str)}
+
+            def convert_item(item):
+                if str(item) in native_names:
+                    return item
+                return self._preserve_item(item)
+
+        else:
+            # 不含分隔符的字符串和非字符串标量都无需还原
+            native_types = {int, float, bool, type(None)}
+            convert_item = self._restore_item
+
+        def convert(data):
+            data_type = type(data)
+            if data_type in native_types:
+                return data
+            if data_type is str and mode != "preserve" and flag not in data:
                 return data
-            return self._preserve_item(data)
-        return self._restore_item(data)
+            if isinstance(data, dict):
+                items = None  # 出现第一个需要转换的项时才开始复制
+                for index, (k, v) in enumerate(data.items()):
+                    new_k = convert(k) if encode_keys else k
+                    new_v = convert(v) if encode_values else v
+                    if items is None:
+                        if new_k is k and new_v is v:
+                            continue
+                        items = list(itertools.islice(data.items(), index))
+                    items.append((new_k, new_v))
+                if items is None:
+                    # dict 的子类统一转为 dict
+                    return data if type(data) is dict else dict(data)
+                return dict(items)
+
+            if isinstance(data, (list, tuple, set)):
+                converted = None
+                for index, item in enumerate(data):
+                    new_item = convert(item)
+                    if converted is None:
+                        if new_item is item:
+                            continue
+                        converted = list(itertools.islice(data, index))
+                    converted.append(new_item)
+                if converted is None:
+                    return data
+                return type(data)(converted)
+
+            return convert_item(data)
+
+        result = convert(data)
+        convert = None  # 解除内部函数的自引用, 让加载器可以立即被回收
+        return result
+
+    def _to_file_data(self) -> Any:
+        """把当前数据转换为写入文件的结构"""
+        if self._file_type in self._NATIVE_TYPED_FORMATS:
+            return self.copy()
+        return self._type_convert(self.copy(), "preserve", self._get_exclude_types())
+
+    def _from_file_data(self, raw_data: Any) -> Any:
+        """把文件中读出的结构还原为数据"""
+        if self._file_type in self._NATIVE_TYPED_FORMATS:
+            return raw_data
+        return self._type_convert(raw_data, "restore")
+
+    def _msgpack_default(self, obj: Any) -> Any:
+        """msgpack 不支持的类型: 集合与自定义类型存为扩展类型"""
+        if isinstance(obj, (set, frozenset)):
+            value = [type(obj).__name__, list(obj)]
+        else:
+            type_name = type(obj).__name__
+            handler = self._custom_type_handlers.get(type_name)
+            if handler is None:
+                return str(obj)  # 与其他格式一致, 未知类型保存为字符串
+            value = [type_name, handler[0](obj)]
+        return msgpack.ExtType(
+            MSGPACK_EXT_TYPE,
+            msgpack.packb(value, default=self._msgpack_default, use_bin_type=True),
+        )
+
+    def _msgpack_ext_hook(self, code: int, data: bytes) -> Any:
+        if code != MSGPACK_EXT_TYPE:
+            return msgpack.ExtType(code, data)
+        type_name, value = msgpack.unpackb(
+            data, ext_hook=self._msgpack_ext_hook, raw=False, strict_map_key=False
+        )
+        if type_name == "set":
+            return set(value)
+        if type_name == "frozenset":
+            return frozenset(value)
+        handler = self._custom_type_handlers.get(type_name)
+        if handler is None:
+            return value
+        return handler[1](value)
+
+    def _msgpack_dumps(self, data: Any) -> bytes:
+        return msgpack.packb(
+            {
+                "format": MSGPACK_FORMAT,
+                "version": MSGPACK_FORMAT_VERSION,
+                "data": data,
+            },
+            default=self._msgpack_default,
+            use_bin_type=True,
+        )
+
+    def _msgpack_loads(self, content: bytes) -> Any:
+        if not content:
+            return {}
+        document = msgpack.unpackb(
+            content, ext_hook=self._msgpack_ext_hook, raw=False, strict_map_key=False
+        )
+        if not isinstance(document, dict) or document.get("format") != MSGPACK_FORMAT:
+            raise ValueError("不是有效的 msgpack 数据文件")
+        if document.get("version", 0) > MSGPACK_FORMAT_VERSION:
+            raise ValueError(f"不支持的 msgpack 文件版本: {document.get('version')}")
+        return document["data"]
 
     def _preserve_item(self, item: Any) -> str:
         """保留类型的信息转换"""
@@ -672,17 +1090,7 @@ class UniversalLoader(dict):
                 return item
 
         # 处理基础类型
-        basic_types = {
-            "int": int,
-            "float": float,
-            "str": str,
-            "bool": bool,
-            "NoneType": type(None),
-            "list": list,
-            "tuple": tuple,
-            "dict": dict,
-            "set": set,
-        }
+        basic_types = self._BASIC_TYPES
         if type_str in basic_types:
             try:
                 if type_str == "bool":
@@ -730,7 +1138,7 @@ class UniversalLoader(dict):
                 with self._file_path.open("rb") as f:
                     raw_data = loader(self, f)
 
-            return self._type_convert(raw_data, "restore")
+            return self._from_file_data(raw_data)
         except Exception as e:
             raise LoadError(f"加载文件时出错: {e}") from e
 
@@ -760,7 +1168,7 @@ class UniversalLoader(dict):
                         content = await f.read()
 
                 raw_data = loader(self, content)
-                return self._type_convert(raw_data, "restore")
+                return self._from_file_data(raw_data)
             else:
                 return self._load_data_sync()
         except Exception as e:
@@ -779,9 +1187,7 @@ class UniversalLoader(dict):
         if not saver:
             raise FileTypeUnknownError(f"不支持的文件类型: {self._file_type}")
 
-        converted_data = self._type_convert(
-            self.copy(), "preserve", self._get_exclude_types()
-        )
+        converted_data = self._to_file_data()
 
         try:
             if file_mode == "text":
@@ -801,9 +1207,7 @@ class UniversalLoader(dict):
         if not saver:
             raise FileTypeUnknownError(f"不支持的文件类型: {self._file_type}")
 
-        converted_data = self._type_convert(
-            self.copy(), "preserve", self._get_exclude_types()
-        )
+        converted_data = self._to_file_data()
 
         try:
             if AIOFILES_AVAILABLE:
@@ -822,6 +1226,31 @@ class UniversalLoader(dict):
         except Exception as e:
             raise SaveError(f"异步保存失败: {e}") from e
 
+    def _serialize(self) -> Union[str, bytes]:
+        """把当前数据序列化为文件内容, 格式与同步保存相同"""
+        saver = self._SYNC_SAVERS.get(self._file_type)
+        if not saver:
+            raise FileTypeUnknownError(f"不支持的文件类型: {self._file_type}")
+        converted_data = self._to_file_data()
+        if self._FILE_MODES[self._file_type] == "text":
+            buffer = io.StringIO()
+        else:  # b
+            buffer = io.BytesIO()
+        saver(self, converted_data, buffer)
+        return buffer.getvalue()
+
+    def _write_content(self, save_path: Path, content: Union[str, bytes]) -> None:
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        own_file = save_path == self._file_path
+        if own_file:
+            self._writing += 1
+        try:
+            atomic_write(save_path, content, self._file_encoding)
+        finally:
+            if own_file:
+                self._last_write = _file_signature(save_path)
+                self._writing -= 1
+
     def _get_exclude_types(self) -> list:
         """获取当前文件类型对应的排除类型"""
         type_map = {
@@ -1,7 +1,10 @@
 import asyncio
 import inspect
+import threading
 import traceback
-from functools import wraps
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial, wraps
 from typing import Type, TypeVar
 
 from ncatbot.utils.assets import REQUEST_SUCCESS
@@ -12,52 +15,183 @@ T = TypeVar("T")
 _log = get_log()
 
 
+class SyncExecutor:
+    """
+    执行同步处理函数的共享线程池。
+
+    线程数由 ``config.sync_pool_size`` 决定, 排队任务数超过 ``config.sync_pool_queue_size`` 时
+    提交方等待, 从而限制同步插件的并发, 而不是每次调用都新建线程。
+    """
+
+    def __init__(self):
+        self._executor: ThreadPoolExecutor = None
+        self._lock = threading.Lock()
+        # 排队限制按事件循环各自维护
+        self._limits = weakref.WeakKeyDictionary()  # {loop: asyncio.Semaphore}
+        self.submitted = 0  # 累计提交数
+        self.completed = 0  # 累计成功数
+        self.failed = 0  # 累计失败数
+        self.running = 0  # 正在执行数
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, config.sync_pool_size)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="ncatbot-sync",
+                    )
+        return self._executor
+
+    def _get_limit(self, loop) -> asyncio.Semaphore:
+        limit = self._limits.get(loop)
+        if limit is None:
+            queue_size = config.sync_pool_queue_size
+            if queue_size <= 0:
+                return None
+            limit = asyncio.Semaphore(self.max_workers + queue_size)
+            self._limits[loop] = limit
+        return limit
+
+    def _call(self, func, args, kwargs):
+        with self._lock:
+            self.running += 1
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """在线程池中执行同步函数并等待结果"""
+        loop = asyncio.get_running_loop()
+        limit = self._get_limit(loop)
+        if limit is not None:
+            await limit.acquire()
+        try:
+            with self._lock:
+                self.submitted += 1
+            return await loop.run_in_executor(
+                self._get_executor(), partial(self._call, func, args, kwargs)
+            )
+        finally:
+            if limit is not None:
+                limit.release()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "running": self.running,
+                "queued": self.submitted - finished - self.running,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """关闭线程池, 之后再提交会创建新的线程池; BotClient 退出时调用"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+sync_executor = SyncExecutor()
+
+
+def get_sync_executor_stats() -> dict:
+    """同步处理函数线程池的统计信息"""
+    return sync_executor.get_stats()
+
+
+async def call_func_async(func, *args, **kwargs):
+    """异步运行异步或者同步的函数, 异常由调用方处理"""
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    if config.__dict__.get("blocking_sync", False):
+        return func(*args, **kwargs)
+    return await sync_executor.run(func, *args, **kwargs)
+
+
+def log_func_error(func, e: Exception):
+    _log.error(f"函数 {getattr(func, '__name__', func)} 执行失败: {e}")
+    traceback.print_exc()
+
+
 async def run_func_async(func, *args, **kwargs):
     # 异步运行异步或者同步的函数
     try:
-        if inspect.iscoroutinefunction(func):
-            return await func(*args, **kwargs)
-        else:
-            if config.__dict__.get("blocking_sync", False):
-                return func(*args, **kwargs)
-            else:
-                import threading
-
-                threading.Thread(
-                    target=func, args=args, kwargs=kwargs, daemon=True
-                ).start()
+        return await call_func_async(func, *args, **kwargs)
     except Exception as e:
-        _log.error(f"函数 {func.__name__} 执行失败: {e}")
-        traceback.print_exc()
+        log_func_error(func, e)
 
 
-def run_func_sync(func, *args, **kwargs):
-    if inspect.iscoroutinefunction(func):
-        # 同步运行一个异步或者同步的函数
-        try:
-            from threading import Thread
+class SyncBridge:
+    """
+    同步调用异步函数的桥。
+
+    在一个常驻的后台线程中运行事件循环, 所有同步包装都把协程提交到这个循环执行,
+    不再为每次调用新建事件循环。所有同步调用共享该循环上的 API 连接池。
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+        self._lock = threading.Lock()
 
-            loop = asyncio.get_running_loop()
-            result = []
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="ncatbot-sync-bridge", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def in_bridge_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro):
+        """阻塞等待协程在后台循环中执行完毕并返回结果"""
+        if self.in_bridge_thread():
+            # 在后台循环中阻塞等待自身会死锁, 退回到独立线程执行
+            future = Future()
 
             def task():
-                result.append(asyncio.run(func(*args, **kwargs)))
-
-            t = Thread(target=task, daemon=True)
-            t.start()
-            t.join(timeout=300)
-            if len(result) == 0:
-                raise TimeoutError("异步函数执行超时")
-            else:
-                return result[0]
-        except RuntimeError:
-            pass
-        try:
-            loop = asyncio.new_event_loop()  # 创建一个新的事件循环
-            asyncio.set_event_loop(loop)  # 设置为当前线程的事件循环
-            return loop.run_until_complete(func(*args, **kwargs))
-        finally:
-            loop.close()  # 关闭事件循环
+                try:
+                    future.set_result(asyncio.run(coro))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            threading.Thread(target=task, daemon=True).start()
+            return future.result()
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+
+sync_bridge = SyncBridge()
+
+
+def run_func_sync(func, *args, **kwargs):
+    # 同步运行一个异步或者同步的函数
+    if inspect.iscoroutinefunction(func):
+        return sync_bridge.run(func(*args, **kwargs))
     else:
         return func(*args, **kwargs)
 
@@ -0,0 +1,329 @@
+"""
+基于 SQLite 的键值存储, 接口与 dict 相同
+
+与 UniversalLoader 一次读写整个文件不同, 这里按键读写:
+    1. 值在第一次访问时才从数据库读取
+    2. 赋值/删除立即写入对应的键
+    3. 读取过的可变值 (dict/list 等) 可能被原地修改, 在 save 时写回
+    4. 支持为键设置过期时间 (TTL), 过期的键视为不存在
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from ncatbot.utils.file_io import LoadError, SaveError, UniversalLoader
+
+# 需要写回的值类型: 读取后可能被原地修改
+_MUTABLE_TYPES = (dict, list, set)
+
+
+def _encode_default(obj: Any) -> Any:
+    """json 不支持的类型: 集合与注册到 UniversalLoader 的自定义类型"""
+    if isinstance(obj, (set, frozenset)):
+        return {"__type__": type(obj).__name__, "value": list(obj)}
+    type_name = type(obj).__name__
+    handler = UniversalLoader._custom_type_handlers.get(type_name)
+    if handler is None:
+        return str(obj)  # 与 UniversalLoader 一致, 未知类型保存为字符串
+    return {"__type__": type_name, "value": handler[0](obj)}
+
+
+def _decode_hook(obj: dict) -> Any:
+    type_name = obj.get("__type__")
+    if type_name is None or len(obj) != 2 or "value" not in obj:
+        return obj
+    value = obj["value"]
+    if type_name == "set":
+        return set(value)
+    if type_name == "frozenset":
+        return frozenset(value)
+    handler = UniversalLoader._custom_type_handlers.get(type_name)
+    if handler is None:
+        return obj
+    return handler[1](value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_encode_default)
+
+
+def _loads(text: str) -> Any:
+    return json.loads(text, object_hook=_decode_hook)
+
+
+class SqliteKVStore(MutableMapping):
+    """
+    SQLite 键值存储, 可作为插件的 ``data`` 使用 (``save_type = "sqlite"``)
+
+    内存占用和保存耗时只与访问过的键有关, 与数据总量无关。键必须是字符串。
+
+    Attributes:
+        file_path (Path): 数据库文件路径
+        default_ttl (float): 新写入的键默认的存活秒数, None 表示永不过期
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        default_ttl: Optional[float] = None,
+        default: dict = {},
+    ):
+        self._file_path: Path = Path(file_path).resolve()
+        self.default_ttl = default_ttl
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: Dict[str, Any] = {}  # 访问过的键 -> 值
+        self._expires: Dict[str, Optional[float]] = {}  # 缓存中键的过期时间
+        self.load()
+        for key, value in default.items():
+            if key not in self:
+                self[key] = value
+
+    @property
+    def file_path(self) -> Path:
+        """文件路径"""
+        return self._file_path
+
+    @property
+    def file_type(self) -> str:
+        """文件类型"""
+        return "sqlite"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._file_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._file_path), check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS kv ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+                )
+                conn.commit()
+            except sqlite3.Error:
+                # 文件不是有效的数据库, 关闭连接以便之后移走文件
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _check_key(key: Any):
+        if not isinstance(key, str):
+            raise TypeError(f"键必须是字符串: {key!r}")
+
+    @staticmethod
+    def _expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    # ---------------------
+    # region dict 接口
+    # ---------------------
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key in self._cache:
+                if not self._expired(self._expires.get(key)):
+                    return self._cache[key]
+                self._drop(key)
+                raise KeyError(key)
+            self._check_key(key)
+            row = (
+                self._connect()
+                .execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row is None:
+                raise KeyError(key)
+            if self._expired(row[1]):
+                self._drop(key)
+                raise KeyError(key)
+            value = _loads(row[0])
+            self._cache[key] = value
+            self._expires[key] = row[1]
+            return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            self._drop(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT key FROM kv WHERE expires_at IS NULL OR expires_at > ?",
+                    (time.time(),),
+                )
+                .fetchall()
+            )
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._connect()
+                .execute(
+                    "SELECT COUNT(*) FROM kv "
+                    "WHERE expires_at IS NULL OR expires_at > ?",
+                    (time.time(),),
+                )
+                .fetchone()[0]
+            )
+
+    def __repr__(self) -> str:
+        return f"SqliteKVStore({self._file_path}, {len(self)} keys)"
+
+    # endregion
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        写入一个键
+
+        Args:
+            ttl: 存活秒数, 默认使用 default_ttl
+        """
+        self._check_key(key)
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._write(key, value, expires_at)
+            self._cache[key] = value
+            self._expires[key] = expires_at
+
+    def _write(self, key: str, value: Any, expires_at: Optional[float]):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, _dumps(value), expires_at),
+        )
+        conn.commit()
+
+    def _drop(self, key: str):
+        self._cache.pop(key, None)
+        self._expires.pop(key, None)
+        conn = self._connect()
+        conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        """删除所有过期的键, 返回删除的数量"""
+        with self._lock:
+            now = time.time()
+            for key in [k for k, e in self._expires.items() if self._expired(e)]:
+                self._cache.pop(key, None)
+                self._expires.pop(key, None)
+            conn = self._connect()
+            count = conn.execute(
+                "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            ).rowcount
+            conn.commit()
+            return count
+
+    def load(self) -> "SqliteKVStore":
+        """丢弃缓存, 之后的访问重新从数据库读取"""
+        try:
+            with self._lock:
+                self._cache.clear()
+                self._expires.clear()
+                self.purge_expired()
+        except sqlite3.Error as e:
+            raise LoadError(f"加载数据库时出错: {e}") from e
+        return self
+
+    def save(self) -> "SqliteKVStore":
+        """写回访问过的可变值 (它们可能被原地修改)"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                for key, value in self._cache.items():
+                    if isinstance(value, _MUTABLE_TYPES):
+                        conn.execute(
+                            "UPDATE kv SET value = ? WHERE key = ?",
+                            (_dumps(value), key),
+                        )
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            raise SaveError(f"保存数据库时出错: {e}") from e
+        return self
+
+    async def aload(self) -> "SqliteKVStore":
+        return self.load()
+
+    async def asave(self) -> "SqliteKVStore":
+        return self.save()
+
+    def close(self, save: bool = True):
+        """关闭数据库连接并丢弃缓存, 之后再访问会重新连接并从数据库读取
+
+        Args:
+            save: 关闭前是否写回访问过的可变值, 为 False 时未写回的原地修改被丢弃
+        """
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    if save:
+                        self.save()
+                finally:
+                    self._conn.close()
+                    self._conn = None
+            self._cache.clear()
+            self._expires.clear()
+
+    def recover(self) -> Path:
+        """数据库损坏时使用: 关闭连接, 把数据库文件移到一旁, 再创建新的空数据库
+
+        Returns:
+            Path: 损坏的数据库被移动到的路径
+        """
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+            self._cache.clear()
+            self._expires.clear()
+            backup = self.move_aside(self._file_path)
+            self._connect()
+        return backup
+
+    @staticmethod
+    def move_aside(file_path: Union[str, Path]) -> Path:
+        """把 (损坏的) 数据库文件改名移到一旁, 返回新的路径"""
+        file_path = Path(file_path)
+        stem = f"{file_path.name}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        backup = file_path.with_name(stem)
+        index = 1
+        while backup.exists():
+            backup = file_path.with_name(f"{stem}-{index}")
+            index += 1
+        # WAL 模式下还有 -wal/-shm 文件, 一起移走
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{file_path}{suffix}")
+            if path.exists():
+                os.replace(path, f"{backup}{suffix}")
+        return backup
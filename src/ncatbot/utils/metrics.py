@@ -0,0 +1,392 @@
+# 运行指标: 计数器、仪表和直方图, 可以按 Prometheus 文本格式导出
+import asyncio
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ncatbot.utils.logger import get_log
+
+_log = get_log()
+
+# 延迟直方图的默认分桶 (秒)
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+MAX_SERIES = 1000  # 每个指标的标签组合上限, 超出后计入 OVERFLOW_LABEL
+OVERFLOW_LABEL = "other"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+class _CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "count", "sum", "_lock")
+
+    def __init__(self, lock: threading.Lock, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 各分桶 (不累计) 的计数, 最后一个为 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+
+class Metric:
+    """
+    指标族, 按标签值区分多条时间序列。
+
+    不带标签的指标可以直接调用 ``inc``/``set``/``observe``, 带标签时先用 ``labels`` 取出序列。
+    """
+
+    type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = MAX_SERIES,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Labels = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: Dict[Labels, object] = {}
+        self._default = None if self.labelnames else self.labels()
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """按标签值取出一条序列, 不存在时创建"""
+        value = self._series.get(values)
+        if value is None:
+            value = self._create(values)
+        return value
+
+    def _create(self, values: Labels):
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"指标 {self.name} 需要标签 {self.labelnames}, 实际传入 {values}"
+            )
+        with self._lock:
+            value = self._series.get(values)
+            if value is not None:
+                return value
+            if len(self._series) >= self.max_series:
+                # 标签值来自插件和事件, 防止序列数无限增长
+                values = (OVERFLOW_LABEL,) * len(values)
+                value = self._series.get(values)
+                if value is not None:
+                    return value
+            value = self._series[values] = self._new_value()
+            return value
+
+    def series(self) -> List[Tuple[Labels, object]]:
+        with self._lock:
+            return list(self._series.items())
+
+    def samples(self) -> Iterator[Tuple[str, Labels, Labels, float]]:
+        """生成 (名称后缀, 标签名, 标签值, 数值)"""
+        for values, value in self.series():
+            yield "", self.labelnames, values, value.value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+        if not self.labelnames:
+            self._default = self.labels()
+
+
+class Counter(Metric):
+    """只增不减的计数器"""
+
+    type = "counter"
+
+    def _new_value(self):
+        return _CounterValue(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    """可增可减的当前值, 也可以在采集时通过函数读取"""
+
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        self._function: Optional[Callable[[], float]] = None
+        super().__init__(*args, **kwargs)
+
+    def _new_value(self):
+        return _GaugeValue(self._lock)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """采集时调用 ``function`` 取值, 只用于不带标签的指标"""
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception as e:
+                _log.debug(f"读取指标 {self.name} 失败: {e}")
+                value = math.nan
+            yield "", (), (), value
+            return
+        yield from super().samples()
+
+
+class Histogram(Metric):
+    """按分桶统计分布的直方图, 用于延迟等数值"""
+
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def _new_value(self):
+        return _HistogramValue(self._lock, self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self):
+        for values, value in self.series():
+            names = self.labelnames + ("le",)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), value.counts):
+                cumulative += count
+                yield "_bucket", names, values + (_format_value(bound),), cumulative
+            yield "_count", self.labelnames, values, value.count
+            yield "_sum", self.labelnames, values, value.sum
+
+
+class MetricsRegistry:
+    """指标注册表, 同名指标只创建一次"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, documentation, labelnames, **kwargs
+                )
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"指标 {name} 已以不同的类型或标签注册")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def collect(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def clear(self):
+        """清空所有序列, 指标本身保留"""
+        for metric in self.collect():
+            metric.clear()
+
+    def render(self) -> str:
+        """按 Prometheus 文本格式 (0.0.4) 输出所有指标"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, names, values, value in metric.samples():
+                if names:
+                    labels = ",".join(
+                        f'{n}="{_escape_label(str(v))}"' for n, v in zip(names, values)
+                    )
+                    lines.append(
+                        f"{metric.name}{suffix}{{{labels}}} {_format_value(value)}"
+                    )
+                else:
+                    lines.append(f"{metric.name}{suffix} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+# NcatBot 内置指标
+EVENTS_RECEIVED = metrics.counter(
+    "ncatbot_events_received_total", "收到的上报事件数", ["type"]
+)
+EVENTS_DROPPED = metrics.counter(
+    "ncatbot_events_dropped_total", "事件队列已满时丢弃的事件数", ["type"]
+)
+EVENT_QUEUE_BACKLOG = metrics.gauge("ncatbot_event_queue_backlog", "等待处理的事件数")
+EVENT_PUBLISH_SECONDS = metrics.histogram(
+    "ncatbot_event_publish_seconds", "事件总线发布一个事件的耗时", ["event"]
+)
+EVENT_HANDLER_SECONDS = metrics.histogram(
+    "ncatbot_event_handler_seconds",
+    "事件处理器的耗时, 插件的处理器以插件名标记",
+    ["event", "handler"],
+)
+FUNC_SECONDS = metrics.histogram(
+    "ncatbot_func_seconds", "插件功能的执行耗时", ["plugin", "func"]
+)
+FUNC_ERRORS = metrics.counter(
+    "ncatbot_func_errors_total", "插件功能抛出异常的次数", ["plugin", "func"]
+)
+FUNC_DENIED = metrics.counter(
+    "ncatbot_func_denied_total", "因权限不足未执行的功能调用数", ["plugin", "func"]
+)
+API_REQUESTS = metrics.counter(
+    "ncatbot_api_requests_total",
+    "API 请求数, result 为 ok/failed/timeout/cancelled/error",
+    ["action", "result"],
+)
+API_SECONDS = metrics.histogram(
+    "ncatbot_api_request_seconds", "API 请求从发出到收到响应的耗时", ["action"]
+)
+PERMISSION_CHECKS = metrics.counter(
+    "ncatbot_permission_checks_total", "权限检查次数", ["result"]
+)
+PERMISSION_CHECK_SECONDS = metrics.histogram(
+    "ncatbot_permission_check_seconds",
+    "单次权限检查的耗时",
+    buckets=(1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2),
+)
+
+
+async def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = metrics
+) -> asyncio.AbstractServer:
+    """
+    在当前事件循环中启动只读的 HTTP 服务, ``GET /metrics`` 返回 Prometheus 文本格式的指标
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            # 读完请求头
+            while (await asyncio.wait_for(reader.readline(), 5)).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] in ("GET", "HEAD"):
+                path = parts[1].split("?")[0]
+            else:
+                path = None
+            if path in ("/", "/metrics"):
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = registry.render().encode("utf-8")
+            else:
+                status, content_type = "404 Not Found", "text/plain; charset=utf-8"
+                body = b"not found\n"
+            head = (
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1"))
+            if path is None or parts[0] != "HEAD":
+                writer.write(body)
+            await writer.drain()
+        except Exception as e:
+            _log.debug(f"处理指标请求时出错: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    port = server.sockets[0].getsockname()[1] if server.sockets else port
+    _log.info(f"指标服务已启动: http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,64 @@
+import pytest
+
+from ncatbot.plugin.event.access_controller import PluginAccessController
+from ncatbot.plugin.event.event import EventSource
+from ncatbot.utils import PermissionGroup, config
+
+USER = PermissionGroup.USER.value
+ADMIN = PermissionGroup.ADMIN.value
+
+
+@pytest.fixture
+def lazy(tmp_path, monkeypatch):
+    # 权限文件保存在当前目录的 data 下
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "access_store_backend", "journal")
+    monkeypatch.setattr(config, "access_lazy_principals", True)
+    return PluginAccessController()
+
+
+def test_permission_check_does_not_create_records(lazy):
+    lazy.create_permission_path("plugin.func")
+    lazy.create_permission_path("plugin.other")
+    lazy.add_white_list_to_role(USER, "plugin.func")
+    source = EventSource(10001, 20001)
+
+    assert lazy.with_permission("plugin.func", source)
+    assert not lazy.with_permission("plugin.other", source)
+    assert lazy.user_has_role("10001", USER)
+    assert not lazy.user_has_role("10001", ADMIN)
+    assert not lazy.user_exist("10001")
+    assert not lazy.group_exist("20001")
+
+
+def test_explicit_assignment_creates_record(lazy):
+    lazy.create_permission_path("plugin.admin")
+    lazy.add_white_list_to_role(ADMIN, "plugin.admin")
+    assert not lazy.with_user_permission("plugin.admin", "10001")
+
+    lazy.assign_role_to_user("10001", ADMIN)
+    assert lazy.user_exist("10001")
+    assert lazy.with_user_permission("plugin.admin", "10001")
+    # 其他用户仍按默认角色计算
+    assert not lazy.with_user_permission("plugin.admin", "10002")
+    assert not lazy.user_exist("10002")
+
+
+def test_default_records_are_pruned_on_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "access_store_backend", "journal")
+    monkeypatch.setattr(config, "access_lazy_principals", False)
+    eager = PluginAccessController()
+    eager.create_permission_path("plugin.func")
+    eager.add_white_list_to_role(USER, "plugin.func")
+    eager.with_permission("plugin.func", EventSource(10001, 20001))
+    eager.assign_role_to_user("10002", ADMIN)
+    assert eager.user_exist("10001") and eager.group_exist("20001")
+    eager._save_access()
+
+    monkeypatch.setattr(config, "access_lazy_principals", True)
+    lazy = PluginAccessController()
+    assert not lazy.user_exist("10001")
+    assert not lazy.group_exist("20001")
+    assert lazy.user_exist("10002")
+    assert lazy.user_exist(config.root)
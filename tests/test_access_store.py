@@ -0,0 +1,100 @@
+import json
+
+from ncatbot.plugin.event.access_store import JournalAccessStore, create_access_store
+
+
+def _changes(users=None, roles=None, trie=None):
+    return {"users": users or {}, "roles": roles or {}, "trie": trie}
+
+
+def _base():
+    return {"users": {}, "roles": {}, "role_inheritance": {}}
+
+
+def test_journal_replays_onto_empty_base(tmp_path):
+    store = JournalAccessStore(str(tmp_path))
+    store.append(
+        store.journal_lines(
+            "U",
+            _changes(
+                users={"10001": {"lists": {"white": ["a.b"]}}},
+                roles={"admin": {"lists": {}, "inherits": ["user"]}},
+                trie={"a": {"b": {}}},
+            ),
+        )
+    )
+    store.append(store.journal_lines("U", _changes(users={"10002": {"lists": {}}})))
+
+    data = JournalAccessStore(str(tmp_path)).load({"U": _base(), "P": _base()})
+    assert data["P"] is None
+    assert set(data["U"]["users"]) == {"10001", "10002"}
+    assert data["U"]["roles"] == {"admin": {"lists": {}}}
+    assert data["U"]["role_inheritance"] == {"admin": ["user"]}
+    assert data["U"]["permissions_trie_paths"] == {"a": {"b": {}}}
+
+
+def test_deleting_role_removes_inheritance(tmp_path):
+    store = JournalAccessStore(str(tmp_path))
+    store.append(
+        store.journal_lines(
+            "U",
+            _changes(
+                roles={
+                    "user": {"lists": {}},
+                    "admin": {"lists": {}, "inherits": ["user"]},
+                }
+            ),
+        )
+    )
+    store.append(store.journal_lines("U", _changes(roles={"user": None})))
+
+    data = JournalAccessStore(str(tmp_path)).load({"U": _base()})["U"]
+    assert data["roles"] == {"admin": {"lists": {}}}
+    assert data["role_inheritance"] == {"admin": []}
+
+
+def test_snapshot_skips_records_it_already_contains(tmp_path):
+    store = JournalAccessStore(str(tmp_path))
+    store.append(store.journal_lines("U", _changes(users={"1": {"v": "old"}})))
+    store.append(store.journal_lines("U", _changes(users={"1": {"v": "new"}})))
+    # 写完快照但在删除日志前崩溃: 日志中的记录都已包含在快照里
+    journal = (tmp_path / "access.journal").read_text(encoding="utf-8")
+    snapshot = dict(_base(), users={"1": {"v": "snapshot"}})
+    store.save_snapshot({"U": store.snapshot(snapshot)})
+    (tmp_path / "access.journal").write_text(journal, encoding="utf-8")
+
+    reloaded = JournalAccessStore(str(tmp_path))
+    data = reloaded.load({"U": _base()})["U"]
+    assert data["users"] == {"1": {"v": "snapshot"}}
+    # 新记录的序号接在已有记录之后
+    line = reloaded.journal_lines("U", _changes(users={"2": {}}))[0]
+    assert json.loads(line)["s"] == 3
+
+
+def test_journal_after_snapshot_is_replayed(tmp_path):
+    store = JournalAccessStore(str(tmp_path))
+    store.append(store.journal_lines("U", _changes(users={"1": {}})))
+    store.save_snapshot({"U": store.snapshot(dict(_base(), users={"1": {}}))})
+    assert not (tmp_path / "access.journal").exists()
+    store.append(store.journal_lines("U", _changes(users={"1": None, "2": {}})))
+
+    data = JournalAccessStore(str(tmp_path)).load({"U": _base()})["U"]
+    assert data["users"] == {"2": {}}
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    store = JournalAccessStore(str(tmp_path))
+    store.append(store.journal_lines("U", _changes(users={"1": {}})))
+    with open(tmp_path / "access.journal", "a", encoding="utf-8") as f:
+        f.write('{"s": 2, "m": "U", "t": "us')
+
+    data = JournalAccessStore(str(tmp_path)).load({"U": _base()})["U"]
+    assert data["users"] == {"1": {}}
+
+
+def test_append_reports_compaction(tmp_path):
+    store = create_access_store("journal", str(tmp_path), compact_threshold=3)
+    assert not store.append(store.journal_lines("U", _changes(users={"1": {}})))
+    assert store.append(store.journal_lines("U", _changes(users={"2": {}, "3": {}})))
+    store.save_snapshot({"U": store.snapshot(_base())})
+    assert not store.append([])
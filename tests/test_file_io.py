@@ -0,0 +1,162 @@
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from ncatbot.utils import file_io
+from ncatbot.utils.file_io import UniversalLoader
+
+
+async def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        await asyncio.sleep(0.01)
+
+
+def _count_writes(monkeypatch, fail: int = 0):
+    """统计 atomic_write 的调用, 前 ``fail`` 次写入失败"""
+    writes = []
+    original = file_io.atomic_write
+
+    def atomic_write(path, content, encoding="utf-8"):
+        writes.append(path)
+        if len(writes) <= fail:
+            raise OSError("磁盘已满")
+        original(path, content, encoding)
+
+    monkeypatch.setattr(file_io, "atomic_write", atomic_write)
+    return writes
+
+
+def test_write_behind_coalesces_changes(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+
+    async def main():
+        loader = UniversalLoader(
+            path, realtime_save=True, write_behind=True, save_delay=0.05
+        )
+        writes = _count_writes(monkeypatch)
+        for i in range(10):
+            loader.update(n=i)
+        # 修改只做标记, 不会立即写入
+        assert writes == []
+        await _wait_for(lambda: writes and not loader._writing)
+        await asyncio.sleep(0.1)
+        return writes
+
+    writes = asyncio.run(main())
+    assert len(writes) == 1
+    assert UniversalLoader(path)["n"] == 9
+
+
+def test_flush_writes_pending_changes(tmp_path):
+    path = tmp_path / "data.json"
+
+    async def main():
+        loader = UniversalLoader(
+            path, realtime_save=True, write_behind=True, save_delay=60
+        )
+        loader.update(key="value")
+        assert "key" not in UniversalLoader(path)
+        loader.flush()
+        assert UniversalLoader(path)["key"] == "value"
+
+    asyncio.run(main())
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+
+    async def main():
+        loader = UniversalLoader(
+            path, realtime_save=True, write_behind=True, save_delay=0.05
+        )
+        writes = _count_writes(monkeypatch, fail=1)
+        loader.update(key="value")
+        await _wait_for(lambda: len(writes) >= 2 and not loader._writing)
+
+    asyncio.run(main())
+    assert UniversalLoader(path)["key"] == "value"
+
+
+def test_external_change_does_not_discard_pending_changes(tmp_path):
+    path = tmp_path / "data.json"
+
+    async def main():
+        loader = UniversalLoader(
+            path, realtime_save=True, write_behind=True, save_delay=60
+        )
+        loader.update(key="local")
+        # 文件在外部被修改, 但内存中还有尚未写入的修改
+        loader._swap_data({"key": "external"})
+        assert loader["key"] == "local"
+        loader.flush()
+
+    asyncio.run(main())
+    assert UniversalLoader(path)["key"] == "local"
+
+
+def _loaded(path):
+    """重新读取文件, 去掉新建文件时自带的 config 项"""
+    data = dict(UniversalLoader(path))
+    data.pop("config", None)
+    return data
+
+
+SAMPLE = {
+    "int": 1,
+    "float": 1.5,
+    "bool": True,
+    "none": None,
+    "str": "a|b",
+    "nested": {"list": [1, "two", 3.0, None], 7: {"deep": False}},
+    "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+    "datetime": datetime(2024, 1, 2, 3, 4, 5),
+    "decimal": Decimal("1.10"),
+}
+
+
+@pytest.mark.parametrize("suffix", ["json", "yaml"])
+def test_codec_round_trip(tmp_path, suffix):
+    path = tmp_path / f"data.{suffix}"
+    loader = UniversalLoader(path)
+    loader.update(SAMPLE)
+    loader.save()
+    assert _loaded(path) == SAMPLE
+
+
+def test_codec_does_not_modify_data(tmp_path):
+    loader = UniversalLoader(tmp_path / "data.json")
+    nested = {"list": [1, 2], "value": 3}
+    loader.update(nested=nested)
+    loader.save()
+    assert nested == {"list": [1, 2], "value": 3}
+
+
+def test_restore_returns_unchanged_subtrees_as_is(tmp_path):
+    loader = UniversalLoader(tmp_path / "data.json")
+    plain = {"list": [1, "a", None], "dict": {"key": 1.5}}
+    assert loader._type_convert(plain, "restore") is plain
+    mixed = {"plain": plain["list"], "typed": ["int|1"]}
+    restored = loader._type_convert(mixed, "restore")
+    assert restored == {"plain": [1, "a", None], "typed": [1]}
+    assert restored["plain"] is plain["list"]
+
+
+def test_msgpack_round_trip(tmp_path):
+    msgpack = pytest.importorskip("msgpack")
+    path = tmp_path / "data.msgpack"
+    data = dict(SAMPLE, set={1, 2}, bytes=b"\x00")
+    loader = UniversalLoader(path)
+    loader.update(data)
+    loader.save()
+    document = msgpack.unpackb(
+        path.read_bytes(), raw=False, strict_map_key=False, ext_hook=lambda c, d: d
+    )
+    assert document["format"] == file_io.MSGPACK_FORMAT
+    assert document["version"] == file_io.MSGPACK_FORMAT_VERSION
+    assert _loaded(path) == data
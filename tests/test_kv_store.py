@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+
+from ncatbot.utils.file_io import LoadError
+from ncatbot.utils.kv_store import SqliteKVStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "data.db"
+
+
+def test_values_persist_with_types(path):
+    store = SqliteKVStore(path, default={"config": {}})
+    store["set"] = {1, 2}
+    store["when"] = datetime(2024, 1, 2, 3, 4, 5)
+    store["nested"] = {"list": [1, "a", None]}
+    del store["set"]
+    store.close()
+
+    reopened = SqliteKVStore(path)
+    assert dict(reopened) == {
+        "config": {},
+        "when": datetime(2024, 1, 2, 3, 4, 5),
+        "nested": {"list": [1, "a", None]},
+    }
+    with pytest.raises(TypeError):
+        reopened[1] = "键必须是字符串"
+
+
+def test_in_place_changes_are_written_on_save(path):
+    store = SqliteKVStore(path)
+    store["list"] = []
+    store["list"].append(1)
+    store.close(save=False)
+    assert SqliteKVStore(path)["list"] == []
+
+    store["list"].append(2)  # 关闭后再访问会重新连接
+    store.close()
+    assert SqliteKVStore(path)["list"] == [2]
+
+
+def test_expired_keys_are_hidden_and_purged(path):
+    store = SqliteKVStore(path)
+    store.set("gone", 1, ttl=0)
+    store.set("stale", 2, ttl=-1)
+    store.set("kept", 3, ttl=60)
+    store["forever"] = 4
+    assert "gone" not in store
+    assert sorted(store) == ["forever", "kept"]
+    assert len(store) == 2
+    assert store.purge_expired() == 1  # "gone" 已在访问时删除
+
+    store.default_ttl = 0
+    store["short"] = 5
+    with pytest.raises(KeyError):
+        store["short"]
+
+
+def test_corrupt_database_is_moved_aside(path):
+    path.write_bytes(b"not a sqlite database" * 100)
+    with pytest.raises(LoadError):
+        SqliteKVStore(path)
+
+    backup = SqliteKVStore.move_aside(path)
+    assert backup.read_bytes().startswith(b"not a sqlite database")
+    store = SqliteKVStore(path)
+    store["key"] = "value"
+    assert SqliteKVStore(path)["key"] == "value"
+
+
+def test_recover_replaces_open_database(path):
+    store = SqliteKVStore(path)
+    store["old"] = 1
+    backup = store.recover()
+    assert backup.exists() and backup != path
+    assert len(store) == 0
+    store["new"] = 2
+    assert dict(SqliteKVStore(path)) == {"new": 2}
+    # 同一秒内再次移走时不会覆盖之前的备份
+    assert store.recover() != backup
@@ -0,0 +1,66 @@
+import itertools
+import random
+
+import pytest
+
+from ncatbot.plugin.RBACManager.permission_matcher import PermissionMatcher
+from ncatbot.plugin.RBACManager.permission_path import PermissionPath
+
+
+def _matcher(*patterns):
+    return PermissionMatcher(patterns, PermissionPath)
+
+
+def _linear(patterns, target):
+    return any(PermissionPath(p).matching_path(target) for p in patterns)
+
+
+@pytest.mark.parametrize(
+    "pattern, target, expected",
+    [
+        ("a.b.c", "a.b.c", True),
+        ("a.b.c", "a.b.d", False),
+        ("a.*.c", "a.x.c", True),
+        ("a.*.c", "a.x.d", False),
+        ("a.*", "a.x", True),
+        ("a.*", "a.x.y", False),
+        ("a.**", "a.x.y.z", True),
+        ("a.**", "b.x", False),
+        ("**", "anything.at.all", True),
+        # 目标路径比模式短时, 已有的节点对得上即视为覆盖
+        ("a.b.c", "a.b", True),
+        # 节点中间的 * 和空节点退回逐个匹配
+        ("a.b*", "a.bc", _linear(["a.b*"], "a.bc")),
+        ("a..c", "a.b.c", _linear(["a..c"], "a.b.c")),
+    ],
+)
+def test_match(pattern, target, expected):
+    assert _matcher(pattern).match(PermissionPath(target)) is expected
+
+
+def test_wildcard_target_falls_back_to_patterns():
+    matcher = _matcher("plugin.func.x", "plugin.other")
+    target = "plugin.func.*"
+    assert matcher.match(PermissionPath(target)) == _linear(
+        ["plugin.func.x", "plugin.other"], target
+    )
+
+
+def test_random_patterns_match_linear_scan():
+    """编译后的前缀树与逐个调用 matching_path 的结果一致"""
+    rng = random.Random(0)
+    nodes = ["a", "b", "c"]
+    targets = [
+        ".".join(path)
+        for depth in range(1, 4)
+        for path in itertools.product(nodes, repeat=depth)
+    ]
+    for _ in range(200):
+        patterns = [
+            ".".join(rng.choice(nodes + ["*", "**"]) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        matcher = _matcher(*patterns)
+        for target in targets:
+            expected = _linear(patterns, target)
+            assert matcher.match(PermissionPath(target)) == expected, (patterns, target)
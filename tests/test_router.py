@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ncatbot.plugin.event.event import Event
+from ncatbot.plugin.event.function import Func
+from ncatbot.plugin.event.router import FuncRouter
+
+
+def _event(raw_message):
+    return Event("test", SimpleNamespace(raw_message=raw_message))
+
+
+def _func(name, **kwargs):
+    return Func(name, "test_plugin", lambda message: None, **kwargs)
+
+
+FUNCS = [
+    _func("help", prefix="/help"),
+    _func("h", prefix="/h"),
+    _func("echo", regex=r"^echo (.+)$"),
+    _func("number", regex=r"\d+$"),
+    _func("either", regex=r"(?:ping|pong)"),
+    _func("ignore_case", regex=r"(?i)hello"),
+    _func("backref", regex=r"(\w)\1"),
+    _func("custom", filter=lambda message: "!" in (message.raw_message or "")),
+    _func("prefix_or_regex", prefix="#", regex=r"[a-z]+#"),
+    _func("always"),
+]
+
+MESSAGES = [
+    "/help",
+    "/help me",
+    "/hi",
+    "/",
+    "echo hi",
+    "echo",
+    "123",
+    "abc123",
+    "ping",
+    "pong!",
+    "HELLO there",
+    "aa",
+    "#tag",
+    "tag#",
+    "",
+    None,
+]
+
+
+def _activated(funcs, event):
+    return [func.name for func in funcs if func.is_activate(event)]
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_candidates_match_linear_scan(message):
+    """路由只缩小候选范围, 最终激活的功能与逐个检查的结果相同"""
+    router = FuncRouter(FUNCS)
+    event = _event(message)
+    assert _activated(router.candidates(event), event) == _activated(FUNCS, event)
+
+
+def test_prefix_trie_skips_unrelated_funcs():
+    router = FuncRouter(FUNCS)
+    names = [func.name for func in router.candidates(_event("/help me"))]
+    assert "help" in names and "h" in names
+    # 带字面量前缀的正则同样进入前缀树
+    assert "echo" not in names
+    # 合并的预筛正则不匹配时整体跳过
+    assert "number" not in names and "either" not in names
+
+
+def test_uncombinable_regex_is_always_candidate():
+    router = FuncRouter(FUNCS)
+    names = [func.name for func in router.candidates(_event("zz"))]
+    for name in ("ignore_case", "backref", "custom", "always"):
+        assert name in names
+
+
+def test_candidates_keep_registration_order():
+    router = FuncRouter(FUNCS)
+    candidates = router.candidates(_event("/help 123 ping"))
+    indexes = [FUNCS.index(func) for func in candidates]
+    assert indexes == sorted(indexes)